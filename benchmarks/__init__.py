@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Todo In-Memory Python Console App.
+
+Each module can be run from the repository root with ``python -m benchmarks.<name>``.
+``python -m benchmarks.suite`` times the core hot paths at several store sizes
+and can compare the results with a saved baseline to catch regressions.
+"""
@@ -0,0 +1,94 @@
+"""
+Benchmark: a long-lived store with and without a memory budget that archives completed tasks.
+
+Simulates a process that keeps adding tasks and completing most of them, once
+without a budget and once with a task budget, and reports the store's memory
+(traced by tracemalloc), the time to build it, and the latency of working-set
+operations on open tasks, of reading archived tasks and of listing a page of
+the archive.
+
+Usage:
+    python -m benchmarks.bench_archive [--tasks N] [--budget B] [--done F]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Optional
+
+from src.todo_manager import TodoManager
+
+
+def build(tasks: int, done: float, budget: Optional[int]) -> tuple:
+    """
+    Add tasks one at a time, completing a share of them as they arrive.
+    
+    Args:
+        tasks: The number of tasks to add
+        done: The share of tasks completed
+        budget: The task budget (None for no budget)
+    
+    Returns:
+        The store, the seconds it took to build and the traced bytes it holds
+    """
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    manager = TodoManager(max_tasks=budget, max_bytes=None)
+    for i in range(tasks):
+        task = manager.add_task(f"Task {i} for project {rng.randrange(97)}", f"Generated description {i}")
+        if rng.random() < done:
+            manager.toggle_task_status(task.id)
+    elapsed = time.perf_counter() - start
+    manager.clear_history()
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return manager, elapsed, memory
+
+
+def per_call(function, ids: list) -> float:
+    """
+    Return the mean time of function over the given IDs, in microseconds.
+    """
+    start = time.perf_counter()
+    for task_id in ids:
+        function(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000, help="number of tasks added over the run")
+    parser.add_argument("--budget", type=int, default=50_000, help="tasks kept in memory with a budget")
+    parser.add_argument("--done", type=float, default=0.9, help="share of tasks completed")
+    options = parser.parse_args()
+    
+    print(f"Tasks: {options.tasks:,}, {options.done:.0%} completed, budget {options.budget:,} tasks")
+    print(f"{'store':<16} {'build s':>8} {'memory MB':>10} {'in memory':>10} {'archived':>9} "
+          f"{'get us':>8} {'toggle us':>10} {'update us':>10}")
+    rng = random.Random(1)
+    for label, budget in (("no budget", None), ("with budget", options.budget)):
+        manager, elapsed, memory = build(options.tasks, options.done, budget)
+        open_ids = rng.sample(sorted(manager._status_index[False]), min(2000, len(manager._status_index[False])))
+        get = per_call(manager.get_task, open_ids)
+        toggle = per_call(manager.toggle_task_status, open_ids + open_ids)
+        update = per_call(lambda task_id: manager.update_task(task_id, title=f"Renamed {task_id}"), open_ids)
+        print(f"{label:<16} {elapsed:>8.2f} {memory / 1e6:>10.1f} {len(manager):>10,} {manager.archived_count():>9,} "
+              f"{get:>8.2f} {toggle:>10.2f} {update:>10.2f}")
+        
+        if manager.archived_count():
+            archived = [task.id for task in manager.get_archived(0, None)]
+            sample = rng.sample(archived, min(2000, len(archived)))
+            cold = per_call(manager.get_task, sample)
+            start = time.perf_counter()
+            manager.get_archived(len(archived) // 2, 20)
+            page = time.perf_counter() - start
+            print(f"{'':<16} archived get_task {cold:.1f} us (random IDs, {len(sample):,} reads), "
+                  f"archive page of 20 {page * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
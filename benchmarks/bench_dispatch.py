@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: command lines per second through parse_command and dispatch.
+
+Results are produced with CommandHandler.run_command, so no rendering cost is
+included.
+
+Usage:
+    python -m benchmarks.bench_dispatch [--lines N] [--tasks N]
+"""
+import argparse
+import time
+from typing import List
+
+from src.commands import CommandHandler
+from src.todo_manager import TodoManager
+
+
+def build_lines(count: int, tasks: int) -> List[str]:
+    """
+    Build a mix of quoted and unquoted command lines touching existing tasks.
+    
+    Args:
+        count: The number of lines to build
+        tasks: The number of tasks in the store the lines refer to
+    """
+    templates = [
+        'toggle {id}',
+        'update {id} "Renamed task {id}" "with a new description"',
+        "update {id} 'Single quoted {id}'",
+        'search task {id}',
+        'delete 0',
+        'frobnicate {id}',
+    ]
+    return [templates[i % len(templates)].format(id=i % tasks + 1) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000, help="number of command lines")
+    parser.add_argument("--tasks", type=int, default=1_000, help="number of tasks in the store")
+    options = parser.parse_args()
+    
+    manager = TodoManager()
+    for i in range(options.tasks):
+        manager.add_task(f"Task {i}", "description")
+    handler = CommandHandler(manager)
+    lines = build_lines(options.lines, options.tasks)
+    
+    parse_command = handler.parse_command
+    start = time.perf_counter()
+    parsed = [parse_command(line) for line in lines]
+    parse_elapsed = time.perf_counter() - start
+    
+    run_command = handler.run_command
+    start = time.perf_counter()
+    for command, args in parsed:
+        run_command(command, args)
+    dispatch_elapsed = time.perf_counter() - start
+    
+    total = parse_elapsed + dispatch_elapsed
+    print(f"Lines:            {options.lines}")
+    print(f"parse_command:    {options.lines / parse_elapsed:12,.0f} lines/s")
+    print(f"dispatch:         {options.lines / dispatch_elapsed:12,.0f} lines/s")
+    print(f"parse + dispatch: {options.lines / total:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
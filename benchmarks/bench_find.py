@@ -0,0 +1,94 @@
+"""
+Benchmark: fuzzy title lookup from the trigram index versus scoring every title.
+
+Builds a store of N tasks with titles of a few words drawn from a generated
+vocabulary, then times find_tasks for exact, misspelled and short fragments
+against scoring every title per request, and reports the cost the trigram
+index adds to building the store and to each mutation.
+
+Usage:
+    python -m benchmarks.bench_find [--tasks N] [--repeat R]
+"""
+import argparse
+import heapq
+import random
+import time
+
+from src.todo_manager import FindQuery, TodoManager
+
+
+def timed(function, repeat: int) -> float:
+    """
+    Return the best wall-clock time of several calls to function.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def vocabulary(rng: random.Random, size: int) -> list:
+    """
+    Return size distinct pronounceable words of two to four syllables.
+    """
+    consonants = "bcdfghklmnprstvwz"
+    vowels = "aeiou"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def scan(manager: TodoManager, fragment: str, limit: int) -> list:
+    """
+    Score every title against the fragment and return the best matches, as find_tasks ranks them.
+    """
+    query = FindQuery(fragment)
+    return heapq.nsmallest(limit, (task for task in manager.iter_tasks() if query.score(task.title)), key=query.rank)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="number of tasks in the store")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of each lookup")
+    options = parser.parse_args()
+    
+    rng = random.Random(0)
+    words = vocabulary(rng, 5000)
+    titles = [" ".join(rng.choice(words) for _ in range(rng.randint(2, 5))) for _ in range(options.tasks)]
+    
+    start = time.perf_counter()
+    manager = TodoManager()
+    manager.add_many((title, "") for title in titles)
+    built = time.perf_counter() - start
+    
+    sample = titles[len(titles) // 2].split()
+    word = max(sample, key=len)
+    fragments = [
+        ("word", word),
+        ("two words", " ".join(sample[:2])),
+        ("misspelled", word[:2] + word[3:] + word[2]),
+        ("word prefix", word[:4]),
+        ("two letters", word[:2]),
+    ]
+    
+    print(f"Tasks: {options.tasks:,}, store built in {built:.1f} s")
+    print(f"{'fragment':<28} {'scan every title':>17} {'trigram index':>14}")
+    for label, fragment in fragments:
+        indexed = timed(lambda: manager.find_tasks(fragment), options.repeat)
+        full = timed(lambda: scan(manager, fragment, 20), 1)
+        assert [task.id for task in scan(manager, fragment, 20)] == [task.id for task in manager.find_tasks(fragment)]
+        print(f"{label + ' ' + repr(fragment):<28} {full * 1000:>14.1f} ms {indexed * 1000:>11.2f} ms  ({full / indexed:,.0f}x)")
+    
+    rounds = 2000
+    ids = rng.sample(range(1, options.tasks + 1), rounds)
+    start = time.perf_counter()
+    for task_id in ids:
+        manager.update_task(task_id, title=" ".join(rng.choice(words) for _ in range(3)))
+    print(f"\nmean title update with indexes: {(time.perf_counter() - start) / rounds * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory benchmark: bytes per task for the slotted Task versus a dict-backed dataclass.
+
+Usage:
+    python -m benchmarks.bench_memory [--tasks N]
+"""
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from src.models import Task
+from src.todo_manager import TodoManager
+
+
+@dataclass
+class DictTask:
+    """
+    The original Task layout: a plain dataclass with a per-instance __dict__.
+    """
+    id: int
+    title: str
+    description: str = ""
+    completed: bool = False
+
+
+def measure(build: Callable[[int], object], count: int) -> float:
+    """
+    Measure the memory retained by a structure built from count tasks.
+    
+    Args:
+        build: A function that builds and returns the structure
+        count: The number of tasks to build
+        
+    Returns:
+        The retained memory in bytes per task
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def build_objects(task_class: type) -> Callable[[int], object]:
+    """
+    Return a builder that creates count bare task objects of the given class.
+    
+    Titles and descriptions are shared strings so only the object layout is measured.
+    """
+    def build(count: int) -> object:
+        return [task_class(i, "title", "description") for i in range(1, count + 1)]
+    return build
+
+
+def build_store(count: int) -> object:
+    """
+    Build a TodoManager holding count tasks with distinct titles.
+    """
+    manager = TodoManager()
+    for i in range(count):
+        manager.add_task(f"Task {i}", "description")
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000, help="number of tasks to build")
+    options = parser.parse_args()
+    
+    dict_bytes = measure(build_objects(DictTask), options.tasks)
+    slot_bytes = measure(build_objects(Task), options.tasks)
+    store_bytes = measure(build_store, options.tasks)
+    
+    print(f"Tasks measured:              {options.tasks}")
+    print(f"dict-of-dataclass Task:      {dict_bytes:8.1f} bytes/task")
+    print(f"slotted Task:                {slot_bytes:8.1f} bytes/task")
+    print(f"saving:                      {100 * (1 - slot_bytes / dict_bytes):8.1f} %")
+    print(f"TodoManager incl. indexes:   {store_bytes:8.1f} bytes/task")
+
+
+if __name__ == "__main__":
+    main()
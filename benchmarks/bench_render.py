@@ -0,0 +1,78 @@
+"""
+Benchmark: repeated task listings with and without the row cache.
+
+Each round changes a share of the tasks and then renders a full 'list'
+result; the cached renderer reuses the rows of tasks that did not change
+since the previous listing.
+
+Usage:
+    python -m benchmarks.bench_render [--tasks N] [--rounds R] [--changed F]
+"""
+import argparse
+import io
+import random
+import time
+
+from src.commands import CommandHandler
+from src.renderers import TableRenderer
+from src.todo_manager import TodoManager
+
+
+def listing_time(manager: TodoManager, handler: CommandHandler, renderer: TableRenderer,
+                 rounds: int, changed: float, seed: int = 0) -> float:
+    """
+    Return the mean time of a full listing after changing a share of the tasks.
+    
+    Args:
+        manager: The store to list
+        handler: The handler that runs the list commands
+        renderer: The renderer that presents their results, writing to a StringIO
+        rounds: The number of timed listings
+        changed: The fraction of tasks toggled before each listing
+        seed: Seed for the choice of toggled tasks
+    """
+    rng = random.Random(seed)
+    ids = [task.id for task in manager.get_all_tasks()]
+    total = 0.0
+    for _ in range(rounds):
+        manager.toggle_many(rng.sample(ids, int(len(ids) * changed)))
+        renderer.stream.seek(0)
+        renderer.stream.truncate()
+        start = time.perf_counter()
+        renderer.render(handler.run_command("list", []))
+        total += time.perf_counter() - start
+    return total / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000, help="number of tasks in the store")
+    parser.add_argument("--rounds", type=int, default=5, help="number of timed listings")
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of tasks changed between listings")
+    options = parser.parse_args()
+    
+    manager = TodoManager()
+    manager.add_many((f"Task {i} for project {i % 97}", f"Generated description {i} with some words")
+                     for i in range(options.tasks))
+    
+    # The handler wires up its own renderer's cache; the plain renderer has none
+    handler = CommandHandler(manager, TableRenderer(io.StringIO()))
+    plain = TableRenderer(io.StringIO())
+    cached = handler.renderer
+    cached.render(handler.run_command("list", []))  # Warm the cache
+    
+    uncached_time = listing_time(manager, handler, plain, options.rounds, options.changed)
+    cached_time = listing_time(manager, handler, cached, options.rounds, options.changed)
+    
+    start = time.perf_counter()
+    io.StringIO().write(cached.stream.getvalue())
+    write_time = time.perf_counter() - start
+    
+    print(f"Tasks: {options.tasks:,}, {options.changed:.0%} changed between listings")
+    print(f"list without cache:   {uncached_time * 1000:>8.1f} ms")
+    print(f"list with row cache:  {cached_time * 1000:>8.1f} ms  ({uncached_time / cached_time:.1f}x)")
+    print(f"writing the output:   {write_time * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: scan throughput of ShardedTodoManager as the shard count grows.
+
+A scan is a predicate-driven bulk toggle: every shard tests every one of its
+tasks in parallel and only a count travels back to the parent. Indexed
+searches and status listings are timed as well for comparison.
+
+Usage:
+    python -m benchmarks.bench_sharding [--tasks N] [--shards 1,2,4,8]
+"""
+import argparse
+import time
+
+from src.models import Task
+from src.sharding import ShardedTodoManager
+
+
+class TitleContains:
+    """
+    A picklable predicate matching tasks whose title contains a fragment.
+    """
+    
+    def __init__(self, fragment: str):
+        """
+        Args:
+            fragment: The lowercase text to look for in titles
+        """
+        self.fragment = fragment
+    
+    def __call__(self, task: Task) -> bool:
+        """
+        Return True if the task's title contains the fragment.
+        """
+        return self.fragment in task.title.lower()
+
+
+def timed(function, repeat: int = 3) -> float:
+    """
+    Return the best wall-clock time of several calls to function.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=400_000, help="number of tasks in the store")
+    parser.add_argument("--shards", default="1,2,4,8", help="comma-separated shard counts")
+    options = parser.parse_args()
+    
+    items = [(f"Task {i} for project {i % 97}", f"Generated description {i}") for i in range(options.tasks)]
+    print(f"{'shards':>6} {'scan tasks/s':>16} {'search ms':>10} {'status ms':>10}")
+    for count in (int(shards) for shards in options.shards.split(",")):
+        with ShardedTodoManager(count) as manager:
+            for start in range(0, len(items), 50_000):
+                manager.add_many(items[start:start + 50_000])
+            
+            scan = timed(lambda: manager.toggle_many(TitleContains("project 42")))
+            search = timed(lambda: manager.search_tasks("project 42"))
+            status = timed(lambda: manager.get_tasks_by_status(True))
+            print(f"{count:>6} {options.tasks / scan:>16,.0f} {search * 1000:>10.1f} {status * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
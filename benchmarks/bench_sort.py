@@ -0,0 +1,87 @@
+"""
+Benchmark: sorted listings from the maintained indexes versus sorting per request.
+
+Times the top-k tasks and a page from the middle of the title order, read
+from the store's sorted indexes and by sorting every task per request, and
+the cost the indexes add to each mutation.
+
+Usage:
+    python -m benchmarks.bench_sort [--tasks N] [--top K] [--repeat R]
+"""
+import argparse
+import random
+import time
+
+from src.todo_manager import SORT_KEYS, SORT_TITLE, TodoManager
+
+
+def timed(function, repeat: int) -> float:
+    """
+    Return the best wall-clock time of several calls to function.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def mutation_time(manager: TodoManager, rounds: int, seed: int = 0) -> float:
+    """
+    Return the mean time of an update, a toggle, an add and a delete, the mix every index must follow.
+    
+    Args:
+        manager: The store to modify
+        rounds: The number of rounds of the four mutations
+        seed: Seed for the choice of tasks
+    """
+    rng = random.Random(seed)
+    ids = [task.id for task in manager.get_all_tasks()]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        task_id = rng.choice(ids)
+        manager.update_task(task_id, title=f"Renamed {rng.random()}")
+        manager.toggle_task_status(task_id)
+        added = manager.add_task(f"Added {rng.random()}")
+        manager.delete_task(added.id)
+    return (time.perf_counter() - start) / (rounds * 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000, help="number of tasks in the store")
+    parser.add_argument("--top", type=int, default=20, help="number of tasks in each listing")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of each listing")
+    options = parser.parse_args()
+    
+    rng = random.Random(0)
+    manager = TodoManager()
+    manager.add_many((f"Task {rng.randrange(options.tasks)} for project {i % 97}", "")
+                     for i in range(options.tasks))
+    manager.toggle_many(range(1, options.tasks + 1, 3))
+    middle = options.tasks // 2
+    key = SORT_KEYS[SORT_TITLE]
+    
+    def sort_all(start: int) -> list:
+        return sorted(manager.get_all_tasks(), key=key)[start:start + options.top]
+    
+    rows = [
+        ("top-k", timed(lambda: sort_all(0), options.repeat),
+         timed(lambda: manager.get_sorted(SORT_TITLE, False, 0, options.top), options.repeat)),
+        ("middle page", timed(lambda: sort_all(middle), options.repeat),
+         timed(lambda: manager.get_sorted(SORT_TITLE, False, middle, options.top), options.repeat)),
+        ("top-k descending", timed(lambda: sorted(manager.get_all_tasks(), key=key, reverse=True)[:options.top],
+                                   options.repeat),
+         timed(lambda: manager.get_sorted(SORT_TITLE, True, 0, options.top), options.repeat)),
+    ]
+    
+    print(f"Tasks: {options.tasks:,}, {options.top} per listing, title order")
+    print(f"{'listing':<18} {'sort per request':>17} {'sorted index':>13}")
+    for name, full, indexed in rows:
+        print(f"{name:<18} {full * 1000:>14.2f} ms {indexed * 1e6:>10.1f} us  ({full / indexed:,.0f}x)")
+    print(f"\nmean mutation with indexes: {mutation_time(manager, 2000) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
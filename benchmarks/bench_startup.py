@@ -0,0 +1,81 @@
+"""
+Benchmark: cold-start time of the console app.
+
+Imports src.main under `python -X importtime` to list the modules that cost
+the most, then times complete runs of `python -m src.main --quiet --batch -`
+that execute a single 'exit', from process spawn to exit.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--top K]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+
+# The repository root, so the child interpreters can import src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """
+    Import src.main in a fresh interpreter under -X importtime.
+    
+    Returns:
+        (module, self microseconds, cumulative microseconds) for every module imported
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.main"],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # The column header
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+
+def wall_clock(runs: int) -> List[float]:
+    """
+    Time complete quiet batch runs that only exit.
+    
+    Args:
+        runs: The number of processes to start
+    
+    Returns:
+        The wall-clock seconds of each run
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src.main", "--quiet", "--batch", "-"], cwd=ROOT,
+                       input="exit\n", stdout=subprocess.DEVNULL, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20, help="number of timed process starts")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    options = parser.parse_args()
+    
+    modules = import_times()
+    total = next((cumulative for name, _, cumulative in modules if name == "src.main"), 0)
+    print(f"import src.main: {total / 1000:.1f} ms cumulative ({len(modules)} modules)")
+    print(f"{'module':<40} {'self ms':>8} {'cumulative ms':>14}")
+    for name, own, cumulative in sorted(modules, key=lambda module: module[2], reverse=True)[:options.top]:
+        print(f"{name:<40} {own / 1000:>8.1f} {cumulative / 1000:>14.1f}")
+    
+    times = sorted(wall_clock(options.runs))
+    print(f"\nWall clock over {options.runs} runs: min {times[0] * 1000:.1f} ms, "
+          f"median {times[len(times) // 2] * 1000:.1f} ms, max {times[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
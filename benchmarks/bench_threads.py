@@ -0,0 +1,121 @@
+"""
+Multi-threaded stress test and throughput benchmark for ConcurrentTodoManager.
+
+The stress phase has writer threads add tasks while reader threads list them,
+then checks that every ID was handed out exactly once and that every listing
+was strictly ordered. The benchmark phase measures mixed-operation throughput
+for increasing thread counts. Exits with status 1 if the stress check fails.
+
+Usage:
+    python -m benchmarks.bench_threads [--tasks N] [--threads 1,2,4,8]
+"""
+import argparse
+import sys
+import threading
+import time
+from typing import List
+
+from src.threadsafe import ConcurrentTodoManager
+
+
+def stress(threads: int, tasks_per_thread: int) -> List[str]:
+    """
+    Run concurrent writers and readers and return a list of detected problems.
+    
+    Args:
+        threads: The number of writer threads (and of reader threads)
+        tasks_per_thread: The number of tasks each writer adds
+    """
+    manager = ConcurrentTodoManager()
+    problems: List[str] = []
+    ids: List[List[int]] = [[] for _ in range(threads)]
+    done = threading.Event()
+    
+    def writer(slot: int):
+        for i in range(tasks_per_thread):
+            task = manager.add_task(f"writer {slot} task {i}")
+            ids[slot].append(task.id)
+            if i % 10 == 0:
+                manager.toggle_task_status(task.id)
+    
+    def reader():
+        while not done.is_set():
+            listing = [task.id for task in manager.get_all_tasks()]
+            if any(a >= b for a, b in zip(listing, listing[1:])):
+                problems.append("a listing was not strictly ordered by ID")
+                return
+            manager.get_tasks_by_status(True)
+    
+    writers = [threading.Thread(target=writer, args=(slot,)) for slot in range(threads)]
+    readers = [threading.Thread(target=reader) for _ in range(threads)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+    
+    handed_out = [task_id for slot in ids for task_id in slot]
+    expected = threads * tasks_per_thread
+    if len(set(handed_out)) != expected:
+        problems.append(f"{expected - len(set(handed_out))} duplicate IDs were handed out")
+    if len(manager) != expected:
+        problems.append(f"store holds {len(manager)} tasks, expected {expected}")
+    if manager._next_id != expected + 1:
+        problems.append(f"next ID is {manager._next_id}, expected {expected + 1}")
+    return problems
+
+
+def throughput(threads: int, operations_per_thread: int) -> float:
+    """
+    Measure mixed add/toggle/get/list operations per second for a thread count.
+    
+    Args:
+        threads: The number of worker threads
+        operations_per_thread: The number of operations each worker performs
+    """
+    manager = ConcurrentTodoManager()
+    manager.add_many([(f"seed task {i}",) for i in range(1_000)])
+    
+    def worker(slot: int):
+        for i in range(operations_per_thread):
+            step = i % 10
+            if step < 3:
+                manager.add_task(f"worker {slot} task {i}")
+            elif step < 5:
+                manager.toggle_task_status(i % 1_000 + 1)
+            elif step < 9:
+                manager.get_task(i % 1_000 + 1)
+            else:
+                manager.get_page(1, 50)
+    
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * operations_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000, help="tasks or operations per thread")
+    parser.add_argument("--threads", default="1,2,4,8", help="comma-separated thread counts")
+    options = parser.parse_args()
+    counts = [int(count) for count in options.threads.split(",")]
+    
+    problems = stress(max(counts), options.tasks)
+    if problems:
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1)
+    print(f"Stress test passed: {max(counts)} writers x {options.tasks} tasks, all IDs unique")
+    
+    for count in counts:
+        print(f"{count:2d} threads: {throughput(count, options.tasks):12,.0f} operations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: bulk export and import throughput for each file format.
+
+Every format exports the same store and imports the file back into an empty
+manager; a share of the rows can be made invalid to include the cost of
+rejecting and reporting them. Each format is also imported into a store
+with a journal, on top of a task already there, and the store is restored
+from the journal and compared with the one it was imported into. Exits with
+status 1 if a restored store differs.
+
+Usage:
+    python -m benchmarks.bench_transfer [--tasks N] [--bad-every K] [--chunk-size C]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from src.config import TRANSFER_CHUNK_SIZE
+from src.models import Task
+from src.persistence import Journal
+from src.todo_manager import TodoManager
+from src.transfer import FORMATS, write_tasks
+
+
+def make_tasks(count: int, bad_every: int) -> list:
+    """
+    Build count tasks; every bad_every-th one gets a title that is too long.
+    
+    Tasks are validated when constructed, so invalid titles are set afterwards.
+    """
+    tasks = [Task(i, f"Task {i} for project {i % 97}", f"Generated description {i}", i % 3 == 0)
+             for i in range(1, count + 1)]
+    if bad_every:
+        for task in tasks[bad_every - 1::bad_every]:
+            task.title = "x" * 201
+    return tasks
+
+
+def restores(path: str, fmt: str, chunk_size: int) -> bool:
+    """
+    Import a file into a journaled store and check that restoring the journal gives the same tasks.
+    
+    Args:
+        path: The file to import
+        fmt: Its format
+        chunk_size: Rows per import chunk
+    
+    Returns:
+        True if the restored store holds the same tasks
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(directory)
+        manager = TodoManager(journal)
+        manager.add_task("Already there")
+        manager.import_tasks(path, fmt, chunk_size)
+        journal.close()
+        
+        journal = Journal(directory)
+        restored = TodoManager(journal)
+        journal.close()
+        fields = lambda tasks: [(task.id, task.title, task.description, task.completed) for task in tasks]
+        return fields(restored.get_all_tasks()) == fields(manager.get_all_tasks())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500_000, help="number of tasks to transfer")
+    parser.add_argument("--bad-every", type=int, default=0, help="make every K-th row invalid (0 for none)")
+    parser.add_argument("--chunk-size", type=int, default=TRANSFER_CHUNK_SIZE, help="rows per import chunk")
+    options = parser.parse_args()
+    
+    tasks = make_tasks(options.tasks, options.bad_every)
+    print(f"{'format':>6} {'file MB':>8} {'export rows/s':>14} {'import rows/s':>14} {'rejected':>9} {'restore':>8}")
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in FORMATS:
+            path = os.path.join(directory, f"tasks.{fmt}")
+            
+            start = time.perf_counter()
+            write_tasks(path, tasks, fmt)
+            export_time = time.perf_counter() - start
+            
+            manager = TodoManager()
+            start = time.perf_counter()
+            report = manager.import_tasks(path, fmt, options.chunk_size)
+            import_time = time.perf_counter() - start
+            
+            # A few chunks are enough to cross snapshots, which journaling every row would make slow
+            check_path = os.path.join(directory, f"check.{fmt}")
+            write_tasks(check_path, tasks[:3 * options.chunk_size], fmt)
+            restored = restores(check_path, fmt, options.chunk_size)
+            failed = failed or not restored
+            
+            size = os.path.getsize(path) / (1 << 20)
+            print(f"{fmt:>6} {size:>8.1f} {options.tasks / export_time:>14,.0f} "
+                  f"{options.tasks / import_time:>14,.0f} {report.rejected:>9,} {'ok' if restored else 'FAILED':>8}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: building validated tasks in a batch versus one Task at a time.
+
+Usage:
+    python -m benchmarks.bench_validation [--tasks N] [--bad-every K]
+"""
+import argparse
+import time
+
+from src import validation
+from src.models import Task
+
+
+def timed(function, repeat: int = 3) -> float:
+    """
+    Return the best wall-clock time of several calls to function.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def one_at_a_time(titles: list, descriptions: list) -> list:
+    """
+    Construct each Task individually, collecting the errors it raises.
+    """
+    tasks = []
+    errors = []
+    for row, (title, description) in enumerate(zip(titles, descriptions)):
+        try:
+            tasks.append(Task(len(tasks) + 1, title, description))
+        except ValueError as e:
+            errors.append((row, str(e)))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500_000, help="number of rows to validate")
+    parser.add_argument("--bad-every", type=int, default=1000, help="make every K-th title blank (0 for none)")
+    options = parser.parse_args()
+
+    titles = [f"Task {i} for project {i % 97}" for i in range(options.tasks)]
+    descriptions = [f"Generated description {i}" for i in range(options.tasks)]
+    if options.bad_every:
+        titles[options.bad_every - 1::options.bad_every] = ["  "] * (options.tasks // options.bad_every)
+
+    single = timed(lambda: one_at_a_time(titles, descriptions))
+    check_only = timed(lambda: validation.validate_columns(titles, descriptions))
+    batch = timed(lambda: Task.batch(1, titles, descriptions))
+
+    backend = "numpy" if validation.load_numpy() is not None else "pure Python"
+    print(f"Rows:                      {options.tasks:,} ({backend} column checks)")
+    print(f"Task() one at a time:      {options.tasks / single:>12,.0f} rows/s")
+    print(f"validate_columns only:     {options.tasks / check_only:>12,.0f} rows/s")
+    print(f"Task.batch:                {options.tasks / batch:>12,.0f} rows/s  ({single / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Load generator for the todo network server.
+
+Opens several concurrent connections, pipelines command lines on each, and
+reports requests per second and p50/p99 request latency. Without --host/--port
+or --unix, an in-process server is started on a free port first.
+
+Usage:
+    python -m benchmarks.load_client [--connections N] [--requests N] [--depth N]
+                                     [--host HOST --port PORT | --unix PATH]
+"""
+import argparse
+import asyncio
+import time
+from collections import deque
+from typing import List, Optional
+
+from src.server import TodoServer
+from src.todo_manager import TodoManager
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Return the given percentile of a sorted list of samples.
+    """
+    index = min(len(samples) - 1, int(fraction * len(samples)))
+    return samples[index]
+
+
+async def run_connection(open_connection, requests: int, depth: int, client_id: int,
+                         latencies: List[float]) -> None:
+    """
+    Send requests on one connection, keeping up to depth of them in flight.
+    
+    Args:
+        open_connection: A coroutine function returning a (reader, writer) pair
+        requests: The number of requests to send
+        depth: The maximum number of unanswered requests
+        client_id: Distinguishes the tasks created by this connection
+        latencies: Receives the latency of every request, in seconds
+    """
+    reader, writer = await open_connection()
+    window = asyncio.Semaphore(depth)
+    sent_at = deque()
+    
+    async def receive():
+        for _ in range(requests):
+            if not await reader.readline():
+                raise ConnectionError("server closed the connection")
+            latencies.append(time.perf_counter() - sent_at.popleft())
+            window.release()
+    
+    receiver = asyncio.create_task(receive())
+    for i in range(requests):
+        await window.acquire()
+        if i % 4 == 3:
+            line = f"toggle {i // 4 + 1}\n"
+        else:
+            line = f'add "client {client_id} task {i}" "generated by the load client"\n'
+        sent_at.append(time.perf_counter())
+        writer.write(line.encode("utf-8"))
+        if window.locked():
+            await writer.drain()
+    await writer.drain()
+    await receiver
+    
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(options: argparse.Namespace) -> None:
+    """
+    Run the load test and print its results.
+    """
+    server = None
+    host, port, path = options.host, options.port, options.unix
+    if path is None and port is None:
+        server = await TodoServer(TodoManager()).start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    
+    if path is not None:
+        open_connection = lambda: asyncio.open_unix_connection(path)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+    
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(open_connection, options.requests, options.depth, client, latencies)
+                           for client in range(options.connections)))
+    elapsed = time.perf_counter() - start
+    
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    
+    latencies.sort()
+    print(f"Connections:     {options.connections}")
+    print(f"Pipeline depth:  {options.depth}")
+    print(f"Requests:        {len(latencies)}")
+    print(f"Throughput:      {len(latencies) / elapsed:12,.0f} requests/s")
+    print(f"Latency p50:     {percentile(latencies, 0.50) * 1000:12.3f} ms")
+    print(f"Latency p99:     {percentile(latencies, 0.99) * 1000:12.3f} ms")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=16, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=5_000, help="requests per connection")
+    parser.add_argument("--depth", type=int, default=32, help="pipelined requests in flight per connection")
+    parser.add_argument("--host", default="127.0.0.1", help="server host")
+    parser.add_argument("--port", type=int, help="server port (omit to start an in-process server)")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
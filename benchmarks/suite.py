@@ -0,0 +1,338 @@
+"""
+Benchmark suite: the TodoManager, CommandHandler and ui hot paths at several store sizes.
+
+For every store size the suite times each case (the best of --repeat runs), then
+runs it once more under tracemalloc to record its peak memory. Results are
+printed as a table and can be saved as JSON; --compare checks them against a
+saved baseline and exits with status 1 if any case regressed.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000,100000,1000000] [--repeat N]
+                               [--json results.json] [--compare baseline.json]
+                               [--threshold 0.10] [--no-memory]
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from src.commands import CommandHandler
+from src.renderers import TableRenderer
+from src.todo_manager import TodoManager
+from src.ui import print_task_table
+
+
+# Operations per timed run for the per-task cases, at most the store size
+OPERATIONS = 100_000
+DELETES = 2_000
+COMMAND_LINES = 20_000
+
+
+class NullSink(io.TextIOBase):
+    """
+    A text stream that discards everything written to it.
+    """
+    
+    def write(self, text: str) -> int:
+        """
+        Discard text, reporting it as written.
+        """
+        return len(text)
+
+
+class Store:
+    """
+    A synthetic store of tasks shared by the cases of one size.
+    
+    Attributes:
+        size: The number of tasks the store was built with
+        manager: The TodoManager holding them
+        ids: Randomly chosen existing IDs for per-task operations
+        deletable: IDs not yet deleted by the delete case, in random order
+    """
+    
+    def __init__(self, size: int, seed: int = 0):
+        """
+        Build the store.
+        
+        Args:
+            size: The number of tasks to add
+            seed: Seed for the random choice of IDs
+        """
+        rng = random.Random(seed)
+        self.size = size
+        self.manager = TodoManager()
+        for start in range(0, size, 50_000):
+            self.manager.add_many(synthetic_items(start, min(size, start + 50_000)))
+        self.manager.clear_history()
+        self.ids = [rng.randint(1, size) for _ in range(min(size, OPERATIONS))]
+        self.deletable = list(range(1, size + 1))
+        rng.shuffle(self.deletable)
+
+
+class Case(NamedTuple):
+    """
+    One benchmarked operation.
+    
+    Attributes:
+        name: The name results are reported under
+        run: Performs one timed run against a store and returns the number of operations
+    """
+    name: str
+    run: Callable[[Store], int]
+
+
+def synthetic_items(start: int, stop: int) -> List[tuple]:
+    """
+    Build (title, description) items for tasks numbered start to stop - 1.
+    """
+    return [(f"Task {i} for project {i % 97}", f"Generated description {i} with some words") for i in range(start, stop)]
+
+
+def case_add_task(store: Store) -> int:
+    """
+    Add as many tasks as the store holds to a new, empty manager.
+    """
+    manager = TodoManager()
+    add_task = manager.add_task
+    for title, description in synthetic_items(0, store.size):
+        add_task(title, description)
+    return store.size
+
+
+def case_get_task(store: Store) -> int:
+    """
+    Look up random existing tasks by ID.
+    """
+    get_task = store.manager.get_task
+    for task_id in store.ids:
+        get_task(task_id)
+    return len(store.ids)
+
+
+def case_get_all_tasks(store: Store) -> int:
+    """
+    List every task in ID order; one operation per task returned.
+    """
+    return len(store.manager.get_all_tasks())
+
+
+def case_update_task(store: Store) -> int:
+    """
+    Rename random existing tasks.
+    """
+    update_task = store.manager.update_task
+    for task_id in store.ids:
+        update_task(task_id, f"Renamed task {task_id}", None)
+    return len(store.ids)
+
+
+def case_toggle_task_status(store: Store) -> int:
+    """
+    Toggle random existing tasks.
+    """
+    toggle = store.manager.toggle_task_status
+    for task_id in store.ids:
+        toggle(task_id)
+    return len(store.ids)
+
+
+def case_command_lines(store: Store) -> int:
+    """
+    Parse and execute a mix of command lines, rendering tables to a null sink.
+    """
+    handler = CommandHandler(store.manager, TableRenderer(NullSink()))
+    templates = (
+        'toggle {id}',
+        'update {id} "Renamed task {id}" "with a new description"',
+        'search project {id}',
+        'list --page 1 --page-size 20',
+        'delete 0',
+        'frobnicate {id}',
+    )
+    ids = store.ids
+    for i in range(COMMAND_LINES):
+        command, args = handler.parse_command(templates[i % len(templates)].format(id=ids[i % len(ids)]))
+        handler.execute_command(command, args)
+    return COMMAND_LINES
+
+
+def case_print_task_table(store: Store) -> int:
+    """
+    Render every task with ui.print_task_table into a null sink; one operation per row.
+    """
+    tasks = store.manager.get_all_tasks()
+    with redirect_stdout(NullSink()):
+        print_task_table(tasks)
+    return len(tasks)
+
+
+def case_delete_task(store: Store) -> int:
+    """
+    Delete random tasks that have not been deleted yet.
+    
+    Each run deletes at most a tenth of the store, so repeated runs still find tasks to delete.
+    """
+    delete_task = store.manager.delete_task
+    count = min(DELETES, max(1, store.size // 10), len(store.deletable))
+    for _ in range(count):
+        delete_task(store.deletable.pop())
+    return count
+
+
+# Deleting runs last, so the other cases see the store at its full size
+CASES = [
+    Case("add_task", case_add_task),
+    Case("get_task", case_get_task),
+    Case("get_all_tasks", case_get_all_tasks),
+    Case("update_task", case_update_task),
+    Case("toggle_task_status", case_toggle_task_status),
+    Case("command_lines", case_command_lines),
+    Case("print_task_table", case_print_task_table),
+    Case("delete_task", case_delete_task),
+]
+
+
+def measure(case: Case, store: Store, repeat: int, memory: bool) -> Dict[str, object]:
+    """
+    Time a case and optionally record its peak traced memory.
+    
+    Args:
+        case: The case to run
+        store: The store to run it against
+        repeat: The number of timed runs; the one with the highest throughput is reported
+        memory: Whether to make one more run under tracemalloc
+    
+    Returns:
+        A result record for the JSON output
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operations = case.run(store)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        if best is None or operations / elapsed > best[0] / best[1]:
+            best = (operations, elapsed)
+    operations, seconds = best
+    
+    peak = None
+    if memory:
+        tracemalloc.start()
+        case.run(store)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    
+    return {
+        "case": case.name,
+        "size": store.size,
+        "operations": operations,
+        "seconds": seconds,
+        "ops_per_second": operations / seconds,
+        "peak_bytes": peak,
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    """
+    Find cases that got slower, or used more memory, than the baseline allows.
+    
+    Args:
+        results: The current result records
+        baseline: The result records of the baseline run
+        threshold: The tolerated relative change, e.g. 0.10 for 10%
+    
+    Returns:
+        One description per regression
+    """
+    previous = {(record["case"], record["size"]): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record["case"], record["size"]))
+        if old is None:
+            continue
+        label = f"{record['case']} @ {record['size']:,}"
+        if not old["ops_per_second"] or not record["ops_per_second"]:
+            continue
+        
+        slowdown = old["ops_per_second"] / record["ops_per_second"] - 1
+        if slowdown > threshold:
+            regressions.append(f"{label}: {slowdown:.0%} slower "
+                               f"({old['ops_per_second']:,.0f} -> {record['ops_per_second']:,.0f} ops/s)")
+        
+        if old.get("peak_bytes") and record.get("peak_bytes"):
+            growth = record["peak_bytes"] / old["peak_bytes"] - 1
+            if growth > threshold:
+                regressions.append(f"{label}: {growth:.0%} more peak memory "
+                                   f"({old['peak_bytes']:,} -> {record['peak_bytes']:,} bytes)")
+    return regressions
+
+
+def format_row(record: dict) -> str:
+    """
+    Format one result record as a line of the results table.
+    """
+    peak = "-" if record["peak_bytes"] is None else f"{record['peak_bytes'] / (1 << 20):.1f}"
+    return (f"{record['case']:<20} {record['size']:>10,} {record['operations']:>10,} "
+            f"{record['seconds'] * 1000:>10.1f} {record['ops_per_second']:>14,.0f} {peak:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="comma-separated store sizes")
+    parser.add_argument("--cases", help="comma-separated case names to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the fastest is reported")
+    parser.add_argument("--json", metavar="PATH", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="flag regressions against this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown or memory growth counted as a regression (default 0.10)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory runs")
+    options = parser.parse_args(argv)
+    
+    cases = CASES
+    if options.cases:
+        wanted = options.cases.split(",")
+        unknown = sorted(set(wanted) - {case.name for case in CASES})
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(unknown)}")
+        cases = [case for case in CASES if case.name in wanted]
+    
+    results = []
+    print(f"{'case':<20} {'tasks':>10} {'ops':>10} {'ms':>10} {'ops/s':>14} {'peak MB':>10}")
+    for size in (int(size) for size in options.sizes.split(",")):
+        store = Store(size)
+        for case in cases:
+            record = measure(case, store, options.repeat, not options.no_memory)
+            results.append(record)
+            print(format_row(record), flush=True)
+    
+    if options.json:
+        document = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(options.json, "w", encoding="utf-8") as output:
+            json.dump(document, output, indent=2)
+    
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {options.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {options.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""
+Archive of completed tasks for the Todo In-Memory Python Console App.
+
+A TodoManager with a memory budget moves its oldest completed tasks here in
+bulk once it goes over the budget (see TodoManager.set_budget). Each batch is
+written as segment files of up to ARCHIVE_SEGMENT_TASKS tasks, sorted by ID.
+A task is stored as a record (a fixed header plus its UTF-8 title and
+description), and every ARCHIVE_BLOCK_TASKS consecutive records are
+compressed with zlib as one block. In memory, an archived task costs its
+entries in the ID-to-segment map and in a sorted index of archived IDs, and
+its ID in the directory of its segment, which also holds where each block
+ends in the file.
+
+Reading an archived task bisects the directory of its segment, then reads
+and decompresses that one block. Taking tasks back out only forgets
+them, leaving dead records behind: a segment file is removed once none of
+its tasks remain archived, and a segment that is mostly dead is rewritten
+into the next batch.
+
+Segments belong to the process that wrote them. They live in a temporary
+directory that is removed when the archive is closed or garbage collected;
+keeping tasks across restarts is the journal's job, and its snapshots include
+archived tasks.
+"""
+import bisect
+import heapq
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from array import array
+from operator import attrgetter
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .config import ARCHIVE_BLOCK_TASKS, ARCHIVE_SEGMENT_TASKS
+from .models import Task
+from .sorted_index import SortedIndex
+
+
+# Header of each record: task ID, UTF-8 byte lengths of the title and description, completion status
+_RECORD = struct.Struct("<QII?")
+
+_task_id = attrgetter("id")
+
+
+def _encode(tasks: List[Task]) -> bytes:
+    """
+    Pack tasks into the uncompressed records of one block.
+    """
+    parts = []
+    pack = _RECORD.pack
+    for task in tasks:
+        title = task.title.encode("utf-8")
+        description = task.description.encode("utf-8")
+        parts.append(pack(task.id, len(title), len(description), task.completed))
+        parts.append(title)
+        parts.append(description)
+    return b"".join(parts)
+
+
+def _decode(data: bytes) -> List[Task]:
+    """
+    Unpack the records of one decompressed block.
+    """
+    tasks = []
+    unpack = _RECORD.unpack_from
+    header = _RECORD.size
+    new = object.__new__
+    pos = 0
+    while pos < len(data):
+        task_id, title_length, description_length, completed = unpack(data, pos)
+        start = pos + header
+        pos = start + title_length + description_length
+        task = new(Task)  # Validated before it was archived
+        task.id = task_id
+        task.title = data[start:start + title_length].decode("utf-8")
+        task.description = data[start + title_length:pos].decode("utf-8")
+        task.completed = completed
+        tasks.append(task)
+    return tasks
+
+
+class _Segment:
+    """
+    Bookkeeping for one segment file.
+    
+    Attributes:
+        ids: The IDs of the records in the file, in ascending order
+        ends: The file offset after each compressed block
+        live: The number of records whose tasks are still archived there
+    """
+    __slots__ = ("ids", "ends", "live")
+    
+    def __init__(self, ids: array, ends: array):
+        """
+        Args:
+            ids: The IDs of the records in the file, all of them live
+            ends: The file offset after each compressed block
+        """
+        self.ids = ids
+        self.ends = ends
+        self.live = len(ids)
+    
+    @property
+    def size(self) -> int:
+        """
+        The size of the file in bytes.
+        """
+        return self.ends[-1] if self.ends else 0
+    
+    def block_of(self, task_id: int) -> int:
+        """
+        Return the number of the block holding a record, which must be in the file.
+        """
+        return bisect.bisect_left(self.ids, task_id) // ARCHIVE_BLOCK_TASKS
+    
+    def read_block(self, segment: BinaryIO, block: int) -> List[Task]:
+        """
+        Read and decode every record of one block from the open segment file.
+        """
+        start = self.ends[block - 1] if block else 0
+        segment.seek(start)
+        return _decode(zlib.decompress(segment.read(self.ends[block] - start)))
+
+
+class TaskArchive:
+    """
+    Keeps tasks in compressed segment files and reads them back by ID or in ID order.
+    
+    Every method runs under the archive's own lock, so lock-free readers of a
+    concurrent store can read archived tasks while a writer archives more.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, segment_tasks: int = ARCHIVE_SEGMENT_TASKS):
+        """
+        Create an empty archive in a new temporary directory.
+        
+        Args:
+            directory: Where to create the temporary directory (defaults to the system's)
+            segment_tasks: The maximum number of tasks per segment file
+        
+        Raises:
+            OSError: If the directory cannot be created
+        """
+        self._files = tempfile.TemporaryDirectory(prefix="todo-archive-", dir=directory)
+        self._segment_tasks = max(1, segment_tasks)
+        self._lock = threading.RLock()
+        self._where: Dict[int, int] = {}  # Archived task ID -> number of the segment holding it
+        self._order = SortedIndex()  # Archived task IDs
+        self._segments: Dict[int, _Segment] = {}
+        self._next_segment = 0
+    
+    def __len__(self) -> int:
+        """
+        Return the number of archived tasks.
+        """
+        return len(self._where)
+    
+    def __contains__(self, task_id: int) -> bool:
+        """
+        Check whether a task is archived.
+        """
+        return task_id in self._where
+    
+    @property
+    def directory(self) -> str:
+        """
+        The temporary directory holding the segment files.
+        """
+        return self._files.name
+    
+    @property
+    def disk_bytes(self) -> int:
+        """
+        The total size of the segment files.
+        """
+        return sum(segment.size for segment in self._segments.values())
+    
+    def add(self, tasks: List[Task]) -> None:
+        """
+        Archive tasks in new segment files.
+        
+        Segments whose records are mostly dead are folded into the batch and
+        removed. Nothing changes unless every file is written.
+        
+        Args:
+            tasks: The tasks to archive, in any order; none may already be archived
+        
+        Raises:
+            OSError: If a segment file cannot be written
+        """
+        with self._lock:
+            batch = list(tasks)
+            new_ids = [task.id for task in batch]
+            folded = [number for number, segment in self._segments.items() if segment.live * 4 < len(segment.ids)]
+            for number in folded:
+                batch.extend(self._live_tasks(number))
+            batch.sort(key=_task_id)
+            
+            written = []
+            try:
+                for start in range(0, len(batch), self._segment_tasks):
+                    chunk = batch[start:start + self._segment_tasks]
+                    written.append((self._write(chunk), chunk))
+            except BaseException:
+                for number, _ in written:
+                    self._drop(number)
+                raise
+            
+            for number in folded:
+                self._drop(number)
+            where = self._where
+            for number, chunk in written:
+                for task in chunk:
+                    where[task.id] = number
+            self._order.update(new_ids)
+    
+    def get(self, task_id: int) -> Optional[Task]:
+        """
+        Read an archived task, leaving it archived.
+        
+        Args:
+            task_id: The ID of the task to read
+        
+        Returns:
+            The Task object if it is archived, None otherwise
+        
+        Raises:
+            OSError: If its segment file cannot be read
+        """
+        with self._lock:
+            number = self._where.get(task_id)
+            if number is None:
+                return None
+            segment = self._segments[number]
+            with open(self._path(number), "rb") as file:
+                records = segment.read_block(file, segment.block_of(task_id))
+            return next(task for task in records if task.id == task_id)
+    
+    def take(self, task_ids: Iterable[int]) -> List[Task]:
+        """
+        Read archived tasks and remove them from the archive.
+        
+        Args:
+            task_ids: Task IDs; those that are not archived are ignored
+        
+        Returns:
+            The removed tasks, in ID order
+        
+        Raises:
+            OSError: If a segment file cannot be read; nothing is removed then
+        """
+        with self._lock:
+            tasks = self._read(task_ids)
+            where = self._where
+            segments = self._segments
+            for task in tasks:
+                number = where.pop(task.id)
+                segment = segments[number]
+                segment.live -= 1
+                if not segment.live:
+                    self._drop(number)
+            self._order.remove_many(map(_task_id, tasks))
+            return tasks
+    
+    def ids_between(self, start_id: int, end_id: int) -> List[int]:
+        """
+        List the archived task IDs from start_id to end_id.
+        
+        Args:
+            start_id: The smallest ID to include (inclusive)
+            end_id: The largest ID to include (inclusive)
+        
+        Returns:
+            The IDs in ascending order
+        """
+        with self._lock:
+            order = self._order
+            return order.slice(order.bisect_left(start_id), order.bisect_left(end_id + 1))
+    
+    def slice(self, start: int, stop: int) -> List[Task]:
+        """
+        Read the archived tasks at positions start to stop of the ID order.
+        
+        Args:
+            start: The position of the first task (0 for the lowest ID)
+            stop: The position after the last task
+        
+        Returns:
+            The tasks in ID order
+        
+        Raises:
+            OSError: If a segment file cannot be read
+        """
+        with self._lock:
+            return self._read(self._order.slice(start, stop))
+    
+    def select(self, predicate: Callable[[Task], bool]) -> List[int]:
+        """
+        List the IDs of the archived tasks a predicate accepts, decoding every segment.
+        
+        Args:
+            predicate: Receives each archived task and returns True for tasks to select
+        
+        Returns:
+            The selected IDs in ascending order
+        
+        Raises:
+            OSError: If a segment file cannot be read
+        """
+        with self._lock:
+            return sorted(task.id for number in list(self._segments)
+                          for task in self._live_tasks(number) if predicate(task))
+    
+    def __iter__(self) -> Iterator[Task]:
+        """
+        Iterate over the archived tasks in ID order.
+        
+        Segments are decompressed a block at a time and merged, so only the
+        compressed files are held in memory at once. The archive must not be
+        modified while the iterator is being consumed.
+        """
+        with self._lock:
+            numbers = list(self._segments)
+        return heapq.merge(*map(self._scan, numbers), key=_task_id)
+    
+    def close(self) -> None:
+        """
+        Forget every archived task and remove the segment files.
+        """
+        with self._lock:
+            self._where.clear()
+            self._order = SortedIndex()
+            self._segments.clear()
+            self._files.cleanup()
+    
+    def _path(self, number: int) -> str:
+        """
+        Return the path of a segment file.
+        """
+        return os.path.join(self._files.name, f"segment.{number}.z")
+    
+    def _write(self, tasks: List[Task]) -> int:
+        """
+        Write tasks sorted by ID to a new segment file and return its number.
+        """
+        number = self._next_segment
+        self._next_segment += 1
+        ends = array("I")
+        with open(self._path(number), "wb") as segment:
+            for start in range(0, len(tasks), ARCHIVE_BLOCK_TASKS):
+                segment.write(zlib.compress(_encode(tasks[start:start + ARCHIVE_BLOCK_TASKS])))
+                ends.append(segment.tell())
+        self._segments[number] = _Segment(array("Q", map(_task_id, tasks)), ends)
+        return number
+    
+    def _drop(self, number: int) -> None:
+        """
+        Remove a segment whose live tasks have been taken or moved elsewhere.
+        """
+        del self._segments[number]
+        os.remove(self._path(number))
+    
+    def _live_tasks(self, number: int) -> List[Task]:
+        """
+        Return the tasks still archived in a segment, decoding all of its blocks.
+        """
+        return list(self._scan(number))
+    
+    def _read(self, task_ids: Iterable[int]) -> List[Task]:
+        """
+        Read archived tasks, decompressing only the blocks that hold them, each once.
+        
+        Args:
+            task_ids: Task IDs; those that are not archived are ignored
+        
+        Returns:
+            The tasks in ID order
+        """
+        by_segment: Dict[int, List[int]] = {}
+        where = self._where
+        for task_id in task_ids:
+            number = where.get(task_id)
+            if number is not None:
+                by_segment.setdefault(number, []).append(task_id)
+        
+        tasks = []
+        for number, ids in by_segment.items():
+            segment = self._segments[number]
+            blocks: Dict[int, set] = {}
+            for task_id in ids:
+                blocks.setdefault(segment.block_of(task_id), set()).add(task_id)
+            with open(self._path(number), "rb") as file:
+                for block, wanted in blocks.items():
+                    tasks.extend(task for task in segment.read_block(file, block) if task.id in wanted)
+        tasks.sort(key=_task_id)
+        return tasks
+    
+    def _scan(self, number: int) -> Iterator[Task]:
+        """
+        Yield the tasks still archived in a segment, in ID order, decompressing one block at a time.
+        """
+        with self._lock:
+            segment = self._segments[number]
+            with open(self._path(number), "rb") as file:
+                data = file.read()
+            ends = segment.ends
+        
+        where = self._where
+        start = 0
+        for end in ends:
+            for task in _decode(zlib.decompress(data[start:end])):
+                if where.get(task.id) == number:
+                    yield task
+            start = end
@@ -0,0 +1,136 @@
+"""
+Non-interactive batch mode for the Todo In-Memory Python Console App.
+
+Commands are streamed from a file or stdin through the CommandHandler without
+prompts. Their results are rendered into large buffered writes, or not rendered
+at all, instead of being printed line by line.
+"""
+import io
+import time
+from typing import Iterable, TextIO
+
+from .commands import CommandHandler
+from .config import BATCH_OUTPUT_BUFFER_SIZE
+from .renderers import RENDERERS
+
+
+class BatchStats:
+    """
+    Summary of a batch run.
+    
+    Attributes:
+        commands: Number of commands executed
+        failures: Number of commands that reported an error
+        elapsed: Wall-clock time spent executing them, in seconds
+    """
+    
+    def __init__(self, commands: int = 0, failures: int = 0, elapsed: float = 0.0):
+        """
+        Initialize the counters of a run.
+        """
+        self.commands = commands
+        self.failures = failures
+        self.elapsed = elapsed
+    
+    @property
+    def commands_per_second(self) -> float:
+        """
+        Throughput of the run in commands per second.
+        """
+        return self.commands / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def summary(self) -> str:
+        """
+        Describe the run in one line.
+        """
+        return (f"Processed {self.commands} commands ({self.failures} failed) in {self.elapsed:.3f}s "
+                f"({self.commands_per_second:,.0f} commands/s)")
+
+
+class _BufferedWriter(io.TextIOBase):
+    """
+    A text stream that collects output and forwards it in large chunks.
+    """
+    
+    def __init__(self, target: TextIO, buffer_size: int):
+        """
+        Initialize the writer.
+        
+        Args:
+            target: The stream that receives the collected output
+            buffer_size: Number of characters to collect before writing to target
+        """
+        self._target = target
+        self._buffer_size = buffer_size
+        self._parts = []
+        self._pending = 0
+    
+    def write(self, text: str) -> int:
+        """
+        Collect text, forwarding the buffer once it is full.
+        """
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self._buffer_size:
+            self.flush()
+        return len(text)
+    
+    def flush(self) -> None:
+        """
+        Write all collected text to the target stream in one call.
+        """
+        if self._parts:
+            self._target.write("".join(self._parts))
+            self._parts.clear()
+            self._pending = 0
+        self._target.flush()
+
+
+def run_batch(lines: Iterable[str], command_handler: CommandHandler, output: TextIO,
+              output_format: str = "table", no_output: bool = False,
+              buffer_size: int = BATCH_OUTPUT_BUFFER_SIZE) -> BatchStats:
+    """
+    Execute commands from an iterable of lines until it is exhausted or a command exits.
+    
+    Blank lines and lines starting with '#' are skipped.
+    
+    Args:
+        lines: The command lines to execute
+        command_handler: The CommandHandler to execute them with
+        output: The stream that receives the commands' output
+        output_format: The renderer to use, one of the keys of renderers.RENDERERS
+        no_output: If True, do not render the commands' results at all (--no-output)
+        buffer_size: Number of characters collected before each write to output
+    
+    Returns:
+        Statistics about the run
+    """
+    stats = BatchStats()
+    sink = _BufferedWriter(output, buffer_size)
+    render = None if no_output else RENDERERS[output_format](sink).render
+    if render is not None and command_handler.instrumentation is not None:
+        render = command_handler.instrumentation.timed("render", render)
+    parse_command = command_handler.parse_command
+    run_command = command_handler.run_command
+    
+    start = time.perf_counter()
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            
+            command, args = parse_command(line)
+            result = run_command(command, args)
+            stats.commands += 1
+            if not result.success:
+                stats.failures += 1
+            if render is not None:
+                render(result)
+            if not result.running:
+                break
+    finally:
+        stats.elapsed = time.perf_counter() - start
+        sink.flush()
+    
+    return stats
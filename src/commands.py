@@ -2,23 +2,106 @@
 Command parsing and handling for the Todo In-Memory Python Console App.
 """
 import re
-from typing import Tuple, Optional
-from .todo_manager import TodoManager
+from typing import TYPE_CHECKING, Iterable, Tuple, Optional
+from .config import TABLE_PAGE_SIZE
+from .registry import COMMAND_LOOKUP, register_command
+from .renderers import Renderer, TableRenderer
+from .ui import RowCache
+from .results import CommandResult, KIND_EVENTS, KIND_EXIT, KIND_HELP, KIND_TEXT
+from .models import Task
+from .todo_manager import SORT_ID, SORT_KEYS, TaskSelector, TodoManager
+
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+
+
+# Quoted strings or individual words; each match is a tuple of
+# (double_quoted, single_quoted, unquoted)
+_TOKEN_PATTERN = re.compile(r'"([^"]*)"|\'([^\']*)\'|(\S+)')
+
+
+def _is_task_id(text: str) -> bool:
+    """
+    Check whether text is a plain (ASCII digit) task ID.
+    
+    Args:
+        text: The text to check
+        
+    Returns:
+        True if text consists only of the digits 0-9
+    """
+    return text.isascii() and text.isdigit()
+
+
+def _is_done(task: Task) -> bool:
+    """
+    Select completed tasks for '--where done'; a module-level function, so it can be sent to shards.
+    """
+    return task.completed
+
+
+def _is_open(task: Task) -> bool:
+    """
+    Select pending tasks for '--where open'; a module-level function, so it can be sent to shards.
+    """
+    return not task.completed
+
+
+# Commands that do not touch the store, accepted while another handler has a transaction open
+_OUTSIDE_TRANSACTION_COMMANDS = frozenset(("help", "exit", "quit"))
 
 
 class CommandHandler:
     """
     Handles parsing and execution of user commands.
+    
+    Each command handler returns a CommandResult; execute_command passes it to
+    the configured renderer, while run_command returns it for callers that
+    want the structured result instead of formatted output. Handlers register
+    themselves with @register_command and are dispatched through a dict.
+    
+    A transaction opened with 'begin' belongs to the handler that opened it;
+    while it is open, other handlers sharing the store only accept commands
+    that do not touch the store, so they never see its uncommitted changes.
     """
     
-    def __init__(self, todo_manager: TodoManager):
+    def __init__(self, todo_manager: TodoManager, renderer: Optional[Renderer] = None,
+                 instrumentation: Optional["Instrumentation"] = None, disabled_commands: Iterable[str] = ()):
         """
         Initialize the command handler with a TodoManager instance.
         
         Args:
             todo_manager: The TodoManager instance to use for operations
+            renderer: The renderer used by execute_command (defaults to a TableRenderer)
+            instrumentation: Records latencies of this handler, its renderer and
+                its store (optional; without it nothing is timed)
+            disabled_commands: Names of commands this handler refuses to run (optional)
         """
         self.todo_manager = todo_manager
+        self.renderer = renderer if renderer is not None else TableRenderer()
+        self.instrumentation: Optional["Instrumentation"] = None
+        
+        # Cache table rows between listings when the store reports which tasks change
+        add_listener = getattr(todo_manager, "add_change_listener", None)
+        if add_listener is not None and isinstance(self.renderer, TableRenderer) and self.renderer.row_cache is None:
+            self.renderer.row_cache = RowCache()
+            add_listener(self.renderer.row_cache.invalidate)
+        
+        # The sequence number of the last change event reported by 'watch'
+        events = getattr(todo_manager, "events", None)
+        self.watch_seq = events.last_seq if events is not None else 0
+        
+        # Whether the store supports transactions, and whether this handler has one open
+        self._transactions = hasattr(todo_manager, "begin")
+        self.in_transaction = False
+        
+        # Bind every registered name and alias to its handler once, up front
+        self._disabled = frozenset(disabled_commands)
+        self._dispatch = {name: getattr(self, spec.handler) for name, spec in COMMAND_LOOKUP.items()
+                          if spec.name not in self._disabled}
+        
+        if instrumentation is not None:
+            instrumentation.attach(self)
     
     def parse_command(self, user_input: str) -> Tuple[str, list]:
         """
@@ -33,14 +116,13 @@ class CommandHandler:
         # Remove leading/trailing whitespace
         user_input = user_input.strip()
         
-        # Handle commands with quoted arguments
-        # This regex finds quoted strings or individual words
-        pattern = r'"([^"]*)"|\'([^\']*)\'|(\S+)'
-        matches = re.findall(pattern, user_input)
-        
-        # Each match is a tuple of (double_quoted, single_quoted, unquoted)
-        # We extract the non-empty part from each tuple
-        parts = [match[0] or match[1] or match[2] for match in matches]
+        if '"' not in user_input and "'" not in user_input:
+            # Without quotes, tokens are simply the whitespace-separated words
+            parts = user_input.split()
+        else:
+            # Handle commands with quoted arguments, taking the non-empty
+            # group of each match
+            parts = [match[0] or match[1] or match[2] for match in _TOKEN_PATTERN.findall(user_input)]
         
         if not parts:
             return "help", []
@@ -52,7 +134,7 @@ class CommandHandler:
     
     def execute_command(self, command: str, args: list) -> bool:
         """
-        Execute a command with the given arguments.
+        Execute a command with the given arguments and render its result.
         
         Args:
             command: The command to execute
@@ -61,25 +143,49 @@ class CommandHandler:
         Returns:
             True if the command should continue the app, False to exit
         """
-        if command == "add":
-            return self._handle_add(args)
-        elif command == "list":
-            return self._handle_list(args)
-        elif command == "update":
-            return self._handle_update(args)
-        elif command == "delete":
-            return self._handle_delete(args)
-        elif command == "toggle":
-            return self._handle_toggle(args)
-        elif command == "help":
-            return self._handle_help(args)
-        elif command in ["quit", "exit"]:
-            return self._handle_exit(args)
-        else:
-            print(f"✗ Unknown command: {command}. Type 'help' for available commands.")
-            return True  # Continue running
+        result = self.run_command(command, args)
+        self.renderer.render(result)
+        return result.running
+    
+    def run_command(self, command: str, args: list) -> CommandResult:
+        """
+        Execute a command with the given arguments without rendering it.
+        
+        Args:
+            command: The command to execute
+            args: The arguments for the command
+            
+        Returns:
+            The structured result of the command
+        """
+        handler = self._dispatch.get(command)
+        if handler is None:
+            spec = COMMAND_LOOKUP.get(command)
+            if spec is not None:
+                return CommandResult.error(command, f"The {spec.name} command is not available in this session")
+            return CommandResult.error(command, f"Unknown command: {command}. Type 'help' for available commands.")
+        if (self._transactions and not self.in_transaction and self.todo_manager.in_transaction
+                and command not in _OUTSIDE_TRANSACTION_COMMANDS):
+            return CommandResult.error(command, "Another session has a transaction open; "
+                                                "try again once it is committed or rolled back")
+        return handler(args)
     
-    def _handle_add(self, args: list) -> bool:
+    def discard_transaction(self) -> int:
+        """
+        Roll back the transaction this handler opened, if it still has one open.
+        
+        Called when a session ends, so uncommitted changes never outlive it.
+        
+        Returns:
+            The number of changes rolled back
+        """
+        if not self.in_transaction:
+            return 0
+        self.in_transaction = False
+        return self.todo_manager.rollback()
+    
+    @register_command("add", 'add "title" "description"', "Add a new task")
+    def _handle_add(self, args: list) -> CommandResult:
         """
         Handle the 'add' command.
         
@@ -87,38 +193,135 @@ class CommandHandler:
             args: Arguments for the add command [title, description]
         """
         if len(args) < 1:
-            print("✗ Usage: add \"title\" \"description\" (description is optional)")
-            return True
+            return CommandResult.error("add", "Usage: add \"title\" \"description\" (description is optional)")
         
         title = args[0]
         description = args[1] if len(args) > 1 else ""
         
         try:
             task = self.todo_manager.add_task(title, description)
-            print(f"✓ Task added successfully with ID {task.id}")
         except ValueError as e:
-            print(f"✗ Error adding task: {e}")
+            return CommandResult.error("add", f"Error adding task: {e}")
         
-        return True  # Continue running
+        return CommandResult.ok("add", f"Task added successfully with ID {task.id}")
     
-    def _handle_list(self, args: list) -> bool:
+    @register_command("list", "list [--open|--done]", "List all, open or completed tasks",
+                      details=(("list --page N --page-size M", "Show one page of tasks"),
+                               ("list --sort title|status|id [--desc]", "List in title, status or ID order")))
+    def _handle_list(self, args: list) -> CommandResult:
         """
         Handle the 'list' command.
         
         Args:
-            args: Arguments for the list command (none expected)
+            args: Arguments for the list command [--open|--done] [--page N] [--page-size M]
+                [--sort title|status|id] [--desc] (optional)
         """
-        if args:
-            print("✗ Usage: list (no arguments required)")
-            return True
+        usage = "Usage: list [--open|--done] [--page N] [--page-size M] [--sort title|status|id] [--desc]"
+        completed = None
+        page = None
+        page_size = TABLE_PAGE_SIZE
+        sort = SORT_ID
+        descending = False
+        
+        options = iter(args)
+        for option in options:
+            if option in ("--open", "--done") and completed is None:
+                completed = option == "--done"
+            elif option in ("--page", "--page-size"):
+                try:
+                    value = int(next(options, ""))
+                except ValueError:
+                    return CommandResult.error("list", usage)
+                if value < 1:
+                    return CommandResult.error("list", f"{option} must be at least 1")
+                if option == "--page":
+                    page = value
+                else:
+                    page_size = value
+            elif option == "--sort":
+                sort = next(options, "").lower()
+                if sort not in SORT_KEYS:
+                    return CommandResult.error("list", usage)
+            elif option == "--desc" and not descending:
+                descending = True
+            else:
+                return CommandResult.error("list", usage)
+        
+        # ID order is the order of the store itself; other orders come from its sorted indexes
+        sorted_order = sort != SORT_ID or descending
+        if sorted_order and not hasattr(self.todo_manager, "get_sorted"):
+            return CommandResult.error("list", "Sorting is not supported by this store")
+        
+        if page is None:
+            if sorted_order:
+                return CommandResult.listing("list", self.todo_manager.get_sorted(sort, descending, completed=completed))
+            if completed is None:
+                return CommandResult.listing("list", self.todo_manager.iter_tasks())
+            return CommandResult.listing("list", self.todo_manager.get_tasks_by_status(completed))
+        
+        if completed is None:
+            total = len(self.todo_manager)
+            if sorted_order:
+                tasks = self.todo_manager.get_sorted(sort, descending, (page - 1) * page_size, page_size)
+            else:
+                tasks = self.todo_manager.get_page(page, page_size)
+        elif hasattr(self.todo_manager, "count_by_status"):
+            # Read just the page from the status order rather than the whole status list
+            total = self.todo_manager.count_by_status(completed)
+            tasks = self.todo_manager.get_sorted(sort, descending, (page - 1) * page_size, page_size, completed)
+        else:
+            if sorted_order:
+                matching = self.todo_manager.get_sorted(sort, descending, completed=completed)
+            else:
+                matching = self.todo_manager.get_tasks_by_status(completed)
+            total = len(matching)
+            tasks = matching[(page - 1) * page_size:page * page_size]
+        
+        pages = max(1, -(-total // page_size))
+        if page > pages:
+            return CommandResult.error("list", f"Page {page} is out of range (there are {pages} pages)")
+        
+        result = CommandResult.listing("list", tasks)
+        result.message = f"Page {page} of {pages} ({total} tasks)"
+        return result
+    
+    @register_command("search", "search <terms>", "Find tasks containing all terms")
+    def _handle_search(self, args: list) -> CommandResult:
+        """
+        Handle the 'search' command.
+        
+        Args:
+            args: Arguments for the search command [terms...]
+        """
+        if not args:
+            return CommandResult.error("search", "Usage: search <terms>")
         
-        tasks = self.todo_manager.get_all_tasks()
-        from .ui import print_task_table
-        print_task_table(tasks)
+        tasks = self.todo_manager.search_tasks(" ".join(args))
+        if not tasks:
+            return CommandResult.error("search", f"No tasks match: {' '.join(args)}")
         
-        return True  # Continue running
+        return CommandResult.listing("search", tasks)
     
-    def _handle_update(self, args: list) -> bool:
+    @register_command("find", "find <fragment>", "Find tasks by part of their title, typos allowed")
+    def _handle_find(self, args: list) -> CommandResult:
+        """
+        Handle the 'find' command.
+        
+        Args:
+            args: Arguments for the find command [words of the fragment...]
+        """
+        if not args:
+            return CommandResult.error("find", "Usage: find <fragment>")
+        
+        fragment = " ".join(args)
+        tasks = self.todo_manager.find_tasks(fragment)
+        if not tasks:
+            return CommandResult.error("find", f"No task titles resemble: {fragment}")
+        
+        return CommandResult.listing("find", tasks)
+    
+    @register_command("update", 'update <id> "title" "desc"', "Update a task")
+    def _handle_update(self, args: list) -> CommandResult:
         """
         Handle the 'update' command.
         
@@ -126,14 +329,12 @@ class CommandHandler:
             args: Arguments for the update command [id, title, description]
         """
         if len(args) < 2:
-            print("✗ Usage: update <id> \"title\" \"description\" (title and/or description required)")
-            return True
+            return CommandResult.error("update", "Usage: update <id> \"title\" \"description\" (title and/or description required)")
         
         try:
             task_id = int(args[0])
         except ValueError:
-            print("✗ Task ID must be a number")
-            return True
+            return CommandResult.error("update", "Task ID must be a number")
         
         title = args[1] if len(args) > 1 else None
         description = args[2] if len(args) > 2 else None
@@ -144,65 +345,458 @@ class CommandHandler:
         if description is None or description == "":
             description = None
         
-        success = self.todo_manager.update_task(task_id, title, description)
+        try:
+            success = self.todo_manager.update_task(task_id, title, description)
+        except ValueError as e:
+            return CommandResult.error("update", f"Error updating task: {e}")
         if success:
-            print(f"✓ Task {task_id} updated successfully")
-        else:
-            print(f"✗ Task with ID {task_id} does not exist")
-        
-        return True  # Continue running
+            return CommandResult.ok("update", f"Task {task_id} updated successfully")
+        return CommandResult.error("update", f"Task with ID {task_id} does not exist")
     
-    def _handle_delete(self, args: list) -> bool:
+    @register_command("delete", "delete <id>", "Delete a task",
+                      details=(("delete <ids>", "Delete many, e.g. 3-900, 1,4,9 or --where done"),))
+    def _handle_delete(self, args: list) -> CommandResult:
         """
         Handle the 'delete' command.
         
         Args:
-            args: Arguments for the delete command [id]
+            args: Arguments for the delete command [id] or a bulk selection
         """
-        if len(args) != 1:
-            print("✗ Usage: delete <id>")
-            return True
+        if not args:
+            return CommandResult.error("delete", "Usage: delete <id> | <a-b> | <a,b,...> | --where done|open")
         
-        try:
+        if len(args) == 1 and _is_task_id(args[0]):
             task_id = int(args[0])
-        except ValueError:
-            print("✗ Task ID must be a number")
-            return True
+            success = self.todo_manager.delete_task(task_id)
+            if success:
+                return CommandResult.ok("delete", f"Task {task_id} deleted successfully")
+            return CommandResult.error("delete", f"Task with ID {task_id} does not exist")
+        
+        selector = self._parse_selector(args)
+        if selector is None:
+            return CommandResult.error("delete", "Task IDs must be a number, a range like 3-900, "
+                                                 "a list like 1,4,9, or --where done|open")
+        
+        count = self.todo_manager.delete_many(selector)
+        if count:
+            return CommandResult.ok("delete", f"{count} tasks deleted successfully")
+        return CommandResult.error("delete", "No matching tasks to delete")
+    
+    @register_command("toggle", "toggle <id>", "Toggle task status",
+                      details=(("toggle <ids>", "Toggle many, e.g. 3-900, 1,4,9 or --where open"),))
+    def _handle_toggle(self, args: list) -> CommandResult:
+        """
+        Handle the 'toggle' command.
         
-        success = self.todo_manager.delete_task(task_id)
-        if success:
-            print(f"✓ Task {task_id} deleted successfully")
-        else:
-            print(f"✗ Task with ID {task_id} does not exist")
+        Args:
+            args: Arguments for the toggle command [id] or a bulk selection
+        """
+        if not args:
+            return CommandResult.error("toggle", "Usage: toggle <id> | <a-b> | <a,b,...> | --where done|open")
         
-        return True  # Continue running
+        if len(args) == 1 and _is_task_id(args[0]):
+            task_id = int(args[0])
+            success = self.todo_manager.toggle_task_status(task_id)
+            if success:
+                return CommandResult.ok("toggle", f"Task {task_id} status toggled successfully")
+            return CommandResult.error("toggle", f"Task with ID {task_id} does not exist")
+        
+        selector = self._parse_selector(args)
+        if selector is None:
+            return CommandResult.error("toggle", "Task IDs must be a number, a range like 3-900, "
+                                                 "a list like 1,4,9, or --where done|open")
+        
+        count = self.todo_manager.toggle_many(selector)
+        if count:
+            return CommandResult.ok("toggle", f"{count} tasks toggled successfully")
+        return CommandResult.error("toggle", "No matching tasks to toggle")
     
-    def _handle_toggle(self, args: list) -> bool:
+    def _parse_selector(self, args: list) -> Optional[TaskSelector]:
         """
-        Handle the 'toggle' command.
+        Parse a bulk task selection.
+        
+        Accepted forms are an ID range (3-900), a comma-separated list of IDs
+        and ranges (1,4,9-12), or '--where done' / '--where open'.
         
         Args:
-            args: Arguments for the toggle command [id]
+            args: The command arguments holding the selection
+            
+        Returns:
+            A selector for the TodoManager bulk methods, or None if the selection is invalid
         """
+        if len(args) == 2 and args[0] == "--where":
+            if args[1] not in ("done", "open"):
+                return None
+            # A predicate rather than a status listing, so archived tasks are selected too
+            return _is_done if args[1] == "done" else _is_open
+        
         if len(args) != 1:
-            print("✗ Usage: toggle <id>")
-            return True
+            return None
+        
+        ranges = []
+        for part in args[0].split(","):
+            start, dash, end = part.partition("-")
+            if not _is_task_id(start) or (dash and not _is_task_id(end)):
+                return None
+            first = int(start)
+            last = int(end) if dash else first
+            if last < first:
+                return None
+            ranges.append(range(first, last + 1))
+        
+        # Ranges are resolved against the stored IDs, so IDs that are not stored are never listed
+        return ranges[0] if len(ranges) == 1 else ranges
+    
+    @register_command("import", "import <file> [--format F]", "Import tasks from .csv, .jsonl, .bin or .tmap")
+    def _handle_import(self, args: list) -> CommandResult:
+        """
+        Handle the 'import' command.
         
+        Args:
+            args: Arguments for the import command [file] [--format F]
+        """
+        options = self._parse_transfer_args(args)
+        if options is None:
+            return CommandResult.error("import", self._transfer_usage("import"))
+        
+        import_tasks = getattr(self.todo_manager, "import_tasks", None)
+        if import_tasks is None:
+            return CommandResult.error("import", "Import is not supported by this store")
+        
+        path, fmt = options
         try:
-            task_id = int(args[0])
-        except ValueError:
-            print("✗ Task ID must be a number")
-            return True
+            report = import_tasks(path, fmt)
+        except (OSError, ValueError) as e:
+            return CommandResult.error("import", f"Error importing tasks: {e}")
+        
+        lines = [f"{report.imported} tasks imported from {path}"]
+        if report.rejected:
+            lines[0] += f" ({report.rejected} rows rejected)"
+            lines.extend(f"  row {row}: {message}" for row, message in report.errors)
+            if report.rejected > len(report.errors):
+                lines.append(f"  ... and {report.rejected - len(report.errors)} more")
+        message = "\n".join(lines)
+        
+        if report.rejected and not report.imported:
+            return CommandResult.error("import", message)
+        return CommandResult.ok("import", message)
+    
+    @register_command("export", "export <file> [--format F]", "Export all tasks to .csv, .jsonl, .bin or .tmap")
+    def _handle_export(self, args: list) -> CommandResult:
+        """
+        Handle the 'export' command.
         
-        success = self.todo_manager.toggle_task_status(task_id)
-        if success:
-            print(f"✓ Task {task_id} status toggled successfully")
+        Args:
+            args: Arguments for the export command [file] [--format F]
+        """
+        options = self._parse_transfer_args(args)
+        if options is None:
+            return CommandResult.error("export", self._transfer_usage("export"))
+        
+        export_tasks = getattr(self.todo_manager, "export_tasks", None)
+        if export_tasks is None:
+            return CommandResult.error("export", "Export is not supported by this store")
+        
+        path, fmt = options
+        try:
+            count = export_tasks(path, fmt)
+        except (OSError, ValueError) as e:
+            return CommandResult.error("export", f"Error exporting tasks: {e}")
+        
+        return CommandResult.ok("export", f"{count} tasks exported to {path}")
+    
+    @staticmethod
+    def _transfer_usage(command: str) -> str:
+        """
+        Return the usage text of 'import' or 'export', listing every format transfer.py accepts.
+        """
+        from .transfer import FORMATS  # Loaded only when the usage is shown, not at startup
+        
+        return f"Usage: {command} <file> [--format {'|'.join(FORMATS)}]"
+    
+    @staticmethod
+    def _parse_transfer_args(args: list) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Parse the arguments shared by 'import' and 'export'.
+        
+        Args:
+            args: <file> optionally followed by --format F
+            
+        Returns:
+            A (path, format or None) tuple, or None if the arguments are invalid
+        """
+        if len(args) == 1:
+            return args[0], None
+        if len(args) == 3 and args[1] == "--format":
+            return args[0], args[2]
+        return None
+    
+    @register_command("archive", "archive [--page N]", "List completed tasks archived to disk",
+                      details=(("archive --page N --page-size M", "Show one page of archived tasks"),))
+    def _handle_archive(self, args: list) -> CommandResult:
+        """
+        Handle the 'archive' command.
+        
+        Archived tasks are listed in ID order and stay archived.
+        
+        Args:
+            args: Arguments for the archive command [--page N] [--page-size M] (optional)
+        """
+        usage = "Usage: archive [--page N] [--page-size M]"
+        page = None
+        page_size = TABLE_PAGE_SIZE
+        options = iter(args)
+        for option in options:
+            if option not in ("--page", "--page-size"):
+                return CommandResult.error("archive", usage)
+            try:
+                value = int(next(options, ""))
+            except ValueError:
+                return CommandResult.error("archive", usage)
+            if value < 1:
+                return CommandResult.error("archive", f"{option} must be at least 1")
+            if option == "--page":
+                page = value
+            else:
+                page_size = value
+        
+        get_archived = getattr(self.todo_manager, "get_archived", None)
+        if get_archived is None:
+            return CommandResult.error("archive", "Archiving is not supported by this store")
+        
+        try:
+            if page is None:
+                return CommandResult.listing("archive", get_archived())
+            total = self.todo_manager.archived_count()
+            pages = max(1, -(-total // page_size))
+            if page > pages:
+                return CommandResult.error("archive", f"Page {page} is out of range (there are {pages} pages)")
+            tasks = get_archived((page - 1) * page_size, page_size)
+        except OSError as e:
+            return CommandResult.error("archive", f"Error reading the archive: {e}")
+        
+        result = CommandResult.listing("archive", tasks)
+        result.message = f"Page {page} of {pages} ({total} archived tasks)"
+        return result
+    
+    @register_command("budget", "budget [--tasks N] [--memory MB]", "Show or set the in-memory budget",
+                      details=(("budget --off", "Stop archiving completed tasks past a budget"),))
+    def _handle_budget(self, args: list) -> CommandResult:
+        """
+        Handle the 'budget' command.
+        
+        Without arguments, shows the budget and how many tasks are in memory
+        and archived. With limits, replaces the budget (a limit left out is
+        removed) and archives the oldest completed tasks past it.
+        
+        Args:
+            args: Arguments for the budget command [--tasks N] [--memory MB] | [--off] (optional)
+        """
+        usage = "Usage: budget [--tasks N] [--memory MB] or budget --off"
+        set_budget = getattr(self.todo_manager, "set_budget", None)
+        if set_budget is None:
+            return CommandResult.error("budget", "Memory budgets are not supported by this store")
+        
+        if not args:
+            max_tasks, max_bytes = self.todo_manager.budget
+            limits = [f"{max_tasks:,} tasks" if max_tasks is not None else None,
+                      f"{max_bytes / (1 << 20):,.1f} MiB" if max_bytes is not None else None]
+            lines = [f"Budget: {', '.join(limit for limit in limits if limit) or 'none'}",
+                     f"{len(self.todo_manager):,} tasks in memory, {self.todo_manager.archived_count():,} archived"]
+            error = getattr(self.todo_manager, "archive_error", None)
+            if error is not None:
+                lines.append(f"Archiving stopped: {error} (set the budget again to retry)")
+            return CommandResult("budget", message="\n".join(lines), kind=KIND_TEXT)
+        
+        max_tasks = max_bytes = None
+        if args != ["--off"]:
+            options = iter(args)
+            for option in options:
+                value = next(options, "")
+                if option == "--tasks" and max_tasks is None and _is_task_id(value):
+                    max_tasks = int(value)
+                elif option == "--memory" and max_bytes is None:
+                    try:
+                        max_bytes = int(float(value) * (1 << 20))
+                    except (ValueError, OverflowError):
+                        return CommandResult.error("budget", usage)
+                else:
+                    return CommandResult.error("budget", usage)
+        
+        try:
+            archived = set_budget(max_tasks, max_bytes)
+        except ValueError as e:
+            return CommandResult.error("budget", f"Error setting the budget: {e}")
+        except OSError as e:
+            return CommandResult.error("budget", f"Error archiving tasks: {e}")
+        
+        if max_tasks is None and max_bytes is None:
+            return CommandResult.ok("budget", "Budget removed; archived tasks return to memory as they are changed")
+        return CommandResult.ok("budget", f"Budget set; {archived} tasks archived")
+    
+    @register_command("undo", "undo", "Undo the last change")
+    def _handle_undo(self, args: list) -> CommandResult:
+        """
+        Handle the 'undo' command.
+        
+        Args:
+            args: Arguments for the undo command (none expected)
+        """
+        return self._step_history("undo", args, "Undid")
+    
+    @register_command("redo", "redo", "Redo the last undone change")
+    def _handle_redo(self, args: list) -> CommandResult:
+        """
+        Handle the 'redo' command.
+        
+        Args:
+            args: Arguments for the redo command (none expected)
+        """
+        return self._step_history("redo", args, "Redid")
+    
+    def _step_history(self, command: str, args: list, verb: str) -> CommandResult:
+        """
+        Run the manager's undo or redo method and report what it reversed.
+        
+        Args:
+            command: 'undo' or 'redo', which is also the manager method to call
+            args: The command arguments (none expected)
+            verb: The past tense shown in the success message
+        """
+        if args:
+            return CommandResult.error(command, f"Usage: {command} (no arguments required)")
+        
+        step = getattr(self.todo_manager, command, None)
+        if step is None:
+            return CommandResult.error(command, f"{command.capitalize()} is not supported by this store")
+        
+        try:
+            label = step()
+        except RuntimeError as e:
+            return CommandResult.error(command, str(e))
+        if label is None:
+            return CommandResult.error(command, f"Nothing to {command}")
+        return CommandResult.ok(command, f"{verb} {label}")
+    
+    @register_command("begin", "begin", "Start a transaction; its changes apply together on commit")
+    def _handle_begin(self, args: list) -> CommandResult:
+        """
+        Handle the 'begin' command.
+        
+        Args:
+            args: Arguments for the begin command (none expected)
+        """
+        if args:
+            return CommandResult.error("begin", "Usage: begin (no arguments required)")
+        if not self._transactions:
+            return CommandResult.error("begin", "Transactions are not supported by this store")
+        
+        try:
+            self.todo_manager.begin()
+        except RuntimeError as e:
+            return CommandResult.error("begin", str(e))
+        self.in_transaction = True
+        return CommandResult.ok("begin", "Transaction started; 'commit' keeps its changes, 'rollback' discards them")
+    
+    @register_command("commit", "commit", "Keep the changes of the open transaction")
+    def _handle_commit(self, args: list) -> CommandResult:
+        """
+        Handle the 'commit' command.
+        
+        Args:
+            args: Arguments for the commit command (none expected)
+        """
+        return self._end_transaction("commit", args, "Committed")
+    
+    @register_command("rollback", "rollback", "Discard the changes of the open transaction")
+    def _handle_rollback(self, args: list) -> CommandResult:
+        """
+        Handle the 'rollback' command.
+        
+        Args:
+            args: Arguments for the rollback command (none expected)
+        """
+        return self._end_transaction("rollback", args, "Rolled back")
+    
+    def _end_transaction(self, command: str, args: list, verb: str) -> CommandResult:
+        """
+        Run the manager's commit or rollback method and report how many changes it covered.
+        
+        Args:
+            command: 'commit' or 'rollback', which is also the manager method to call
+            args: The command arguments (none expected)
+            verb: The past tense shown in the success message
+        """
+        if args:
+            return CommandResult.error(command, f"Usage: {command} (no arguments required)")
+        if not self._transactions:
+            return CommandResult.error(command, "Transactions are not supported by this store")
+        if not self.in_transaction:
+            return CommandResult.error(command, f"No transaction is open to {command}")
+        
+        changes = getattr(self.todo_manager, command)()
+        self.in_transaction = False
+        return CommandResult.ok(command, f"{verb} {changes} change{'s' if changes != 1 else ''}")
+    
+    @register_command("stats", "stats [--json] [--reset]", "Show store size, memory and command latencies")
+    def _handle_stats(self, args: list) -> CommandResult:
+        """
+        Handle the 'stats' command.
+        
+        Args:
+            args: Arguments for the stats command [--json] [--reset] (optional)
+        """
+        if any(arg not in ("--json", "--reset") for arg in args):
+            return CommandResult.error("stats", "Usage: stats [--json] [--reset]")
+        
+        # Imported here so sessions that never ask for stats do not load it at startup
+        from .instrumentation import collect_stats, format_stats
+        
+        stats = collect_stats(self.todo_manager, self.instrumentation)
+        if "--json" in args:
+            import json
+            report = json.dumps(stats, indent=2)
         else:
-            print(f"✗ Task with ID {task_id} does not exist")
+            report = format_stats(stats)
+        
+        if "--reset" in args and self.instrumentation is not None:
+            self.instrumentation.reset()
+        return CommandResult("stats", message=report, kind=KIND_TEXT)
+    
+    @register_command("watch", "watch [--since N]", "Show changes since the last watch, or since event N")
+    def _handle_watch(self, args: list) -> CommandResult:
+        """
+        Handle the 'watch' command.
+        
+        Reports the change events published since this handler's previous
+        watch (or since it was created), or since event N when given. Over
+        the network server, events keep streaming after the report.
+        
+        Args:
+            args: Arguments for the watch command [--since N] (optional)
+        """
+        if args and (len(args) != 2 or args[0] != "--since" or not _is_task_id(args[1])):
+            return CommandResult.error("watch", "Usage: watch [--since N]")
         
-        return True  # Continue running
+        events = getattr(self.todo_manager, "events", None)
+        if events is None:
+            return CommandResult.error("watch", "Watching is not supported by this store")
+        
+        since = int(args[1]) if args else self.watch_seq
+        try:
+            changes = events.since(since)
+        except ValueError as e:
+            return CommandResult.error("watch", str(e))
+        
+        self.watch_seq = changes[-1].seq if changes else since
+        if changes:
+            message = f"{len(changes)} change{'s' if len(changes) != 1 else ''}, up to event #{self.watch_seq}"
+        else:
+            message = f"No changes after event #{self.watch_seq}"
+        return CommandResult("watch", message=message, kind=KIND_EVENTS, events=changes)
     
-    def _handle_help(self, args: list) -> bool:
+    @register_command("help", "help", "Show this help")
+    def _handle_help(self, args: list) -> CommandResult:
         """
         Handle the 'help' command.
         
@@ -210,14 +804,12 @@ class CommandHandler:
             args: Arguments for the help command (none expected)
         """
         if args:
-            print("✗ Usage: help (no arguments required)")
-            return True
+            return CommandResult.error("help", "Usage: help (no arguments required)")
         
-        from .ui import print_welcome_header
-        print_welcome_header()
-        return True  # Continue running
+        return CommandResult("help", kind=KIND_HELP)
     
-    def _handle_exit(self, args: list) -> bool:
+    @register_command("exit", "quit/exit", "Exit the app", aliases=("quit",))
+    def _handle_exit(self, args: list) -> CommandResult:
         """
         Handle the 'exit' or 'quit' command.
         
@@ -225,8 +817,6 @@ class CommandHandler:
             args: Arguments for the exit command (none expected)
         """
         if args:
-            print("✗ Usage: exit or quit (no arguments required)")
-            return True
+            return CommandResult.error("exit", "Usage: exit or quit (no arguments required)")
         
-        print("Goodbye!")
-        return False  # Stop running
\ No newline at end of file
+        return CommandResult("exit", message="Goodbye!", kind=KIND_EXIT)  # Stop running
\ No newline at end of file
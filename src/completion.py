@@ -0,0 +1,153 @@
+"""
+Tab completion for the interactive prompt of the Todo In-Memory Python Console App.
+
+The first word of a line completes to a command name. After 'find' or
+'search', a title prefix completes to the titles that begin with it. After
+a command that takes a task ID, a title prefix completes the same way until
+only one task begins with it, and then turns into that task's ID, so tasks
+can be picked by title instead of by number. Titles are looked up with the
+store's find_by_prefix, which reads them off the title order in
+O(log n + k) instead of scanning the store.
+"""
+from typing import Any, Dict, List, Optional
+
+from .config import FIND_DEFAULT_LIMIT
+from .registry import COMMAND_LOOKUP
+
+
+# Commands whose argument is text matched against titles
+_TITLE_COMMANDS = frozenset(("find", "search"))
+
+# Commands whose first argument is a task ID
+_ID_COMMANDS = frozenset(("update", "delete", "toggle"))
+
+
+class Completer:
+    """
+    Completes whole input lines for readline.
+    
+    Candidates are full lines (the completer is installed without word
+    delimiters), so a title with spaces completes as one unit. Every
+    candidate keeps what was typed as its prefix, as readline would otherwise
+    replace the line with the candidates' common prefix. Each candidate also
+    has a label (its title, with the task ID where one is wanted) that is
+    shown when readline lists the candidates.
+    """
+    
+    def __init__(self, todo_manager: Any, prompt: str = "> ", limit: int = FIND_DEFAULT_LIMIT):
+        """
+        Initialize the completer.
+        
+        Args:
+            todo_manager: The store whose titles are completed; it must provide find_by_prefix
+            prompt: The prompt redrawn after candidates are listed
+            limit: The maximum number of titles offered at once
+        """
+        self.todo_manager = todo_manager
+        self.prompt = prompt
+        self.limit = limit
+        self._typed = ""  # The line as it was when completion started
+        self._matches: List[str] = []
+        self._labels: Dict[str, str] = {}
+    
+    def complete(self, text: str, state: int) -> Optional[str]:
+        """
+        Return the state-th completion of text, as readline's completer protocol expects.
+        
+        Args:
+            text: The line up to the cursor
+            state: 0 for the first completion, then 1, 2, ... until None is returned
+        
+        Returns:
+            A completed line, or None when there are no more
+        """
+        if state == 0:
+            self._typed = text
+            self._matches = self.matches(text)
+        return self._matches[state] if state < len(self._matches) else None
+    
+    def matches(self, line: str) -> List[str]:
+        """
+        List the completions of a partial input line.
+        
+        Args:
+            line: The line up to the cursor
+        
+        Returns:
+            Completed lines
+        """
+        self._labels = {}
+        if " " not in line.lstrip():
+            prefix = line.strip().lower()
+            return [line + name[len(prefix):] + " " for name in sorted(COMMAND_LOOKUP) if name.startswith(prefix)]
+        
+        command, _, prefix = line.lstrip().partition(" ")
+        prefix = prefix.lstrip()
+        spec = COMMAND_LOOKUP.get(command.lower())
+        if spec is None or not prefix:
+            return []
+        if spec.name not in _TITLE_COMMANDS and (spec.name not in _ID_COMMANDS or prefix[0].isdigit()):
+            return []
+        
+        head = line[:len(line) - len(prefix)]
+        tasks = self.todo_manager.find_by_prefix(prefix, self.limit)
+        if spec.name in _ID_COMMANDS and len(tasks) == 1:
+            match = f"{head}{tasks[0].id} "
+            self._labels[match] = f"{tasks[0].id:>6}  {tasks[0].title}"
+            return [match]
+        
+        # Tasks with the same title share a candidate, listed with all their IDs
+        ids: Dict[str, List[str]] = {}
+        for task in tasks:
+            if task.title[:len(prefix)].casefold() != prefix.casefold():
+                continue  # Case-folding changed the title's length; it cannot keep the typed prefix
+            match = head + prefix + task.title[len(prefix):]
+            ids.setdefault(match, []).append(str(task.id))
+            self._labels[match] = task.title
+        if spec.name in _ID_COMMANDS:
+            for match, task_ids in ids.items():
+                self._labels[match] = f"{', '.join(task_ids):>6}  {self._labels[match]}"
+        return list(ids)
+    
+    def display(self, substitution: str, matches: List[str], longest_match_length: int) -> None:
+        """
+        List candidates under the prompt by their labels (readline's display hook).
+        
+        Args:
+            substitution: The text being completed
+            matches: The candidates
+            longest_match_length: The length of the longest candidate (unused)
+        """
+        print()
+        for match in matches:
+            print(f"  {self._labels.get(match, match)}")
+        # Readline then draws what it inserts after the line as it last showed it
+        print(self.prompt + self._typed, end="", flush=True)
+
+
+def install_completion(todo_manager: Any, prompt: str = "> ") -> bool:
+    """
+    Enable tab completion of commands and titles for input().
+    
+    Args:
+        todo_manager: The store whose titles are completed
+        prompt: The prompt input() is called with
+    
+    Returns:
+        True if completion was enabled, False where readline is not available
+    """
+    try:
+        import readline
+    except ImportError:  # Not built on every platform
+        return False
+    
+    completer = Completer(todo_manager, prompt)
+    readline.set_completer(completer.complete)
+    readline.set_completer_delims("")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+        readline.parse_and_bind("set show-all-if-ambiguous on")  # List the candidates on the first Tab
+        readline.set_completion_display_matches_hook(completer.display)
+    return True
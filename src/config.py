@@ -14,6 +14,12 @@ TABLE_MIN_WIDTHS = {
     'description': 25
 }
 
+# Maximum number of rows rendered per table page when listing tasks
+TABLE_PAGE_SIZE = 1000
+
+# Formatted task rows kept for reuse by later listings, least recently used evicted first
+ROW_CACHE_MAX_ROWS = 100000
+
 # Maximum lengths for truncation
 MAX_TITLE_LENGTH = 200
 MAX_DESCRIPTION_LENGTH = 500
@@ -44,4 +50,50 @@ COLORS = {
 STATUS_SYMBOLS = {
     'complete': '✓',
     'incomplete': '○'
-}
\ No newline at end of file
+}
+
+# Journal (write-ahead log) settings for optional persistence
+JOURNAL_FSYNC_BATCH = 64            # Records written between fsync calls
+JOURNAL_SNAPSHOT_INTERVAL = 10000   # Records logged before the log is compacted into a snapshot
+
+# Keys per chunk of the sorted indexes behind 'list --sort' (chunks split at twice this size)
+SORT_INDEX_CHUNK_SIZE = 1000
+
+# Fuzzy title lookup behind 'find' and tab completion
+FIND_DEFAULT_LIMIT = 20             # Matches returned by 'find'
+FIND_MIN_SIMILARITY = 0.4           # Share of the fragment's trigrams a title must contain
+FIND_MAX_CANDIDATES = 100000        # Candidates scored by set intersections; more are walked in ID order
+
+# Undo history caps: steps kept, and task IDs/deltas/removed tasks held across them
+UNDO_HISTORY_MAX_ENTRIES = 1000
+UNDO_HISTORY_MAX_ITEMS = 100000
+
+# Memory budget: past it, the oldest completed tasks are archived to compressed segment files
+ARCHIVE_MAX_TASKS = None            # Tasks kept in memory (None for no limit)
+ARCHIVE_MAX_BYTES = None            # Approximate bytes of tasks and indexes kept in memory (None for no limit)
+ARCHIVE_LOW_WATER = 0.9             # Share of the budget the store is archived down to, so archiving runs in batches
+ARCHIVE_MIN_BATCH = 256             # Completed tasks collected before an archive run, while they are scarce
+ARCHIVE_SEGMENT_TASKS = 4096        # Tasks per archive segment file
+ARCHIVE_BLOCK_TASKS = 64            # Tasks per separately compressed block, the unit decompressed to read one task
+ARCHIVE_DIRECTORY = None            # Where the archive's temporary directory is created (None for the system default)
+
+# Most recent change events kept so watchers can resume from a sequence number
+EVENT_BUFFER_SIZE = 100000
+
+# Bulk import/export settings
+TRANSFER_CHUNK_SIZE = 10000         # Rows parsed, validated and stored together
+TRANSFER_READ_BLOCK = 1 << 20       # Bytes read at a time from binary files
+TRANSFER_MAX_REPORTED_ERRORS = 20   # Rejected rows listed in an import report
+
+# Instrumentation and profiling settings
+STATS_MEMORY_SAMPLE = 1000          # Tasks and index entries sampled to estimate store memory
+PROFILE_TOP_ENTRIES = 25            # Functions listed in the --profile report
+
+# Batch mode settings
+BATCH_OUTPUT_BUFFER_SIZE = 1 << 20  # Characters of output collected before each write
+
+# Network server settings
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7878
+SERVER_WRITE_HIGH_WATER = 1 << 16   # Buffered response bytes before a connection waits for the client
+SERVER_DISABLED_COMMANDS = ("import", "export")  # Read and write files on the server, so not offered to clients
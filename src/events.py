@@ -0,0 +1,315 @@
+"""
+Change events published by a TodoManager.
+
+Every mutation of the store publishes one event per affected task: added,
+updated (with only the fields that changed), toggled (with the new status) or
+deleted. Events carry a sequence number that increases by one per event, and
+the most recent ones are kept in a bounded ring buffer, so a consumer that
+remembers the last sequence it saw can resume and receive only what it missed.
+
+Subscribers are called synchronously after each mutation with the events it
+published, or receive them one at a time through an asyncio.Queue. While a
+transaction is open, the feed holds its events back and publishes them
+together on commit, or drops them on rollback. Events are
+stored as plain tuples and only turned into ChangeEvent objects when someone
+reads them, so publishing stays cheap while nobody is watching.
+"""
+from collections import deque
+from contextlib import nullcontext
+from itertools import count, islice, repeat
+from typing import TYPE_CHECKING, Callable, ContextManager, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .config import EVENT_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+# Event kinds
+EVENT_ADDED = "added"
+EVENT_UPDATED = "updated"
+EVENT_TOGGLED = "toggled"
+EVENT_DELETED = "deleted"
+
+
+class ChangeEvent(NamedTuple):
+    """
+    One change to one task.
+    
+    Attributes:
+        seq: The event's sequence number, starting at 1
+        kind: One of the EVENT_* constants
+        task_id: The ID of the task that changed
+        title: The new title, for added events and updates that changed it
+        description: The new description, for added events and updates that changed it
+        completed: The new status, for added and toggled events
+    """
+    seq: int
+    kind: str
+    task_id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+    
+    def fields(self) -> Dict[str, object]:
+        """
+        Return the task fields the event carries, leaving out those that did not change.
+        """
+        values = {"title": self.title, "description": self.description, "completed": self.completed}
+        return {name: value for name, value in values.items() if value is not None}
+    
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Return the event as a JSON-serializable dict.
+        """
+        return {"seq": self.seq, "kind": self.kind, "id": self.task_id, "fields": self.fields()}
+
+
+# A buffered event: the fields of a ChangeEvent as a plain tuple
+_Record = Tuple[int, str, int, Optional[str], Optional[str], Optional[bool]]
+
+_event = ChangeEvent._make
+
+
+class ChangeFeed:
+    """
+    Numbers, buffers and delivers the change events of one store.
+    
+    Publishing takes no lock of its own: the store publishes while it is
+    being modified, so its publishers are already serialized. A store that is
+    shared between threads passes the lock its writers hold, and reading and
+    subscribing take it too, so a subscriber that asks for a backlog neither
+    misses nor repeats an event.
+    """
+    
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE, lock: Optional[ContextManager] = None):
+        """
+        Initialize an empty feed.
+        
+        Args:
+            capacity: The number of most recent events kept for consumers that resume
+            lock: The lock held by the store's writers (optional, for stores shared
+                between threads; it must be reentrant if subscribers modify the store)
+        """
+        self._buffer: Deque[_Record] = deque(maxlen=capacity)
+        self._seq = 0
+        self._lock = lock if lock is not None else nullcontext()
+        # Replaced rather than modified, so publish can iterate without copying
+        self._subscribers: Tuple[Callable[[List[ChangeEvent]], None], ...] = ()
+        self._queues: Dict[int, Callable[[List[ChangeEvent]], None]] = {}
+        # Events held back by an open transaction, without sequence numbers yet
+        self._held: Optional[List[tuple]] = None
+    
+    @property
+    def last_seq(self) -> int:
+        """
+        The sequence number of the latest event, or 0 before the first one.
+        """
+        return self._seq
+    
+    def publish(self, kind: str, task_id: int, title: Optional[str] = None,
+                description: Optional[str] = None, completed: Optional[bool] = None) -> None:
+        """
+        Publish one event.
+        
+        Args:
+            kind: One of the EVENT_* constants
+            task_id: The ID of the task that changed
+            title: The new title (optional)
+            description: The new description (optional)
+            completed: The new status (optional)
+        """
+        if self._held is not None:
+            self._held.append((kind, task_id, title, description, completed))
+            return
+        
+        self._seq = seq = self._seq + 1
+        record = (seq, kind, task_id, title, description, completed)
+        self._buffer.append(record)
+        
+        if self._subscribers:
+            events = [_event(record)]
+            for subscriber in self._subscribers:
+                subscriber(events)
+    
+    def publish_many(self, kind: str, task_ids: Sequence[int], titles: Optional[Iterable[str]] = None,
+                     descriptions: Optional[Iterable[str]] = None,
+                     completed: Optional[Iterable[bool]] = None) -> None:
+        """
+        Publish one event of the same kind for each of several tasks.
+        
+        Args:
+            kind: One of the EVENT_* constants
+            task_ids: The IDs of the tasks that changed
+            titles: The new titles, aligned with task_ids (optional)
+            descriptions: The new descriptions, aligned with task_ids (optional)
+            completed: The new statuses, aligned with task_ids (optional)
+        """
+        if not task_ids:
+            return
+        columns = (task_ids,
+                   repeat(None) if titles is None else titles,
+                   repeat(None) if descriptions is None else descriptions,
+                   repeat(None) if completed is None else completed)
+        if self._held is not None:
+            self._held.extend(zip(repeat(kind), *columns))  # Consumed now, while the fields have these values
+            return
+        
+        first = self._seq + 1
+        self._seq += len(task_ids)
+        records = zip(count(first), repeat(kind), *columns)
+        if not self._subscribers:
+            self._buffer.extend(records)
+            return
+        
+        records = list(records)
+        self._buffer.extend(records)
+        events = list(map(_event, records))
+        for subscriber in self._subscribers:
+            subscriber(events)
+    
+    def hold(self) -> None:
+        """
+        Hold back published events until release or discard is called.
+        """
+        self._held = []
+    
+    def release(self) -> None:
+        """
+        Number, buffer and deliver the held events; subscribers get them in one call.
+        """
+        held, self._held = self._held, None
+        if not held:
+            return
+        first = self._seq + 1
+        self._seq += len(held)
+        records = list(map(tuple.__add__, zip(count(first)), held))
+        self._buffer.extend(records)
+        if self._subscribers:
+            events = list(map(_event, records))
+            for subscriber in self._subscribers:
+                subscriber(events)
+    
+    def discard(self) -> None:
+        """
+        Drop the held events and publish normally again.
+        """
+        self._held = None
+    
+    def since(self, seq: int) -> List[ChangeEvent]:
+        """
+        Return the buffered events that came after a sequence number.
+        
+        Args:
+            seq: The last sequence number the consumer has seen (0 for all events)
+        
+        Returns:
+            The events numbered above seq, oldest first
+        
+        Raises:
+            ValueError: If seq is ahead of the latest event, or events after it
+                have already been dropped from the buffer
+        """
+        with self._lock:
+            return self._since(seq)
+    
+    def subscribe(self, subscriber: Callable[[List[ChangeEvent]], None], since: Optional[int] = None) -> None:
+        """
+        Call subscriber with the events of every later mutation, in order.
+        
+        Args:
+            subscriber: Called after each mutation with the list of events it published
+            since: If given, subscriber is first called with the buffered events
+                after this sequence number (if there are any)
+        
+        Raises:
+            ValueError: If since is not a sequence number events can be resumed from
+        """
+        with self._lock:
+            backlog = self._since(since) if since is not None else []
+            self._subscribers += (subscriber,)
+            # Delivered under the lock, so no event published meanwhile can overtake the backlog
+            if backlog:
+                subscriber(backlog)
+    
+    def unsubscribe(self, subscriber: Callable[[List[ChangeEvent]], None]) -> None:
+        """
+        Stop calling a subscriber.
+        
+        Args:
+            subscriber: A callback passed to subscribe
+        
+        Raises:
+            ValueError: If the callback is not subscribed
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+            subscribers.remove(subscriber)
+            self._subscribers = tuple(subscribers)
+    
+    def subscribe_queue(self, since: Optional[int] = None) -> "asyncio.Queue":
+        """
+        Deliver later events, one at a time, to a new queue of the running event loop.
+        
+        Mutations made on the loop's thread put events directly; mutations made
+        on other threads hand them to the loop thread-safely.
+        
+        Args:
+            since: If given, the queue first receives the buffered events after
+                this sequence number
+        
+        Returns:
+            An unbounded asyncio.Queue of ChangeEvent objects; pass it to
+            unsubscribe_queue when done
+        
+        Raises:
+            RuntimeError: If no event loop is running in this thread
+            ValueError: If since is not a sequence number events can be resumed from
+        """
+        import asyncio
+        from threading import get_ident
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        loop_thread = get_ident()
+        
+        def put_all(events: List[ChangeEvent]) -> None:
+            for event in events:
+                queue.put_nowait(event)
+        
+        def deliver(events: List[ChangeEvent]) -> None:
+            if get_ident() == loop_thread:
+                put_all(events)
+            else:
+                loop.call_soon_threadsafe(put_all, events)
+        
+        self.subscribe(deliver, since)
+        self._queues[id(queue)] = deliver
+        return queue
+    
+    def unsubscribe_queue(self, queue: "asyncio.Queue") -> None:
+        """
+        Stop delivering events to a queue created by subscribe_queue.
+        
+        Args:
+            queue: The queue to detach
+        
+        Raises:
+            KeyError: If the queue is not subscribed
+        """
+        self.unsubscribe(self._queues.pop(id(queue)))
+    
+    def _since(self, seq: int) -> List[ChangeEvent]:
+        """
+        Return the events after seq; the caller must hold the lock.
+        """
+        if seq > self._seq or seq < 0:
+            raise ValueError(f"Event #{seq} does not exist; the latest event is #{self._seq}")
+        missed = self._seq - seq
+        if missed > len(self._buffer):
+            raise ValueError(f"Events after #{seq} are no longer buffered; "
+                             f"the oldest buffered event is #{self._seq - len(self._buffer) + 1}")
+        # The wanted events are at the end of the buffer, so walk it from the right
+        records = list(islice(reversed(self._buffer), missed))
+        records.reverse()
+        return list(map(_event, records))
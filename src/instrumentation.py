@@ -0,0 +1,369 @@
+"""
+Opt-in instrumentation for the Todo In-Memory Python Console App.
+
+An Instrumentation object attaches to a CommandHandler by replacing a few
+bound methods on the handler, its renderer and its TodoManager with timing
+wrappers. Every wrapper records calls and latencies in a histogram:
+
+    parse               CommandHandler.parse_command (tokenizing a line)
+    command.<name>      CommandHandler.run_command, per registered command
+    render              Renderer.render (formatting output)
+    store.<method>      The public TodoManager methods
+
+Nothing is wrapped unless instrumentation is enabled, so a session without it
+runs exactly the same code as before and pays no overhead.
+
+profile_session wraps a whole session in cProfile and tracemalloc.
+"""
+import cProfile
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+from .config import PROFILE_TOP_ENTRIES, STATS_MEMORY_SAMPLE
+from .registry import COMMAND_LOOKUP
+
+if TYPE_CHECKING:
+    from .commands import CommandHandler
+
+
+# TodoManager methods timed as store.<method>, where the store provides them
+STORE_METHODS = (
+    "add_task", "add_many", "get_task", "get_all_tasks", "iter_tasks", "get_tasks_in_range",
+    "get_page", "get_tasks_by_status", "get_sorted", "search_tasks", "find_tasks", "find_by_prefix", "update_task", "delete_task",
+    "toggle_task_status", "delete_many", "toggle_many", "undo", "redo", "begin", "commit", "rollback", "import_tasks", "export_tasks",
+    "set_budget", "get_archived", "count_by_status",
+)
+
+# Latencies are bucketed by powers of two nanoseconds: bucket i holds values below 2**i
+_BUCKETS = 48
+
+
+class LatencyHistogram:
+    """
+    Call count and latency distribution of one instrumented operation.
+    
+    Recording is O(1): latencies fall into power-of-two buckets, so
+    percentiles are approximate (within a factor of two).
+    """
+    
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+    
+    def __init__(self):
+        """
+        Initialize an empty histogram.
+        """
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+    
+    def record(self, elapsed_ns: int) -> None:
+        """
+        Add one latency sample.
+        
+        Args:
+            elapsed_ns: The latency in nanoseconds
+        """
+        if not self.count or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), _BUCKETS - 1)] += 1
+    
+    def percentile(self, fraction: float) -> int:
+        """
+        Return an upper bound for the given percentile of the recorded latencies.
+        
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.99
+        
+        Returns:
+            The upper edge of the bucket holding the percentile, in nanoseconds,
+            capped at the largest recorded latency
+        """
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min(1 << index, self.max_ns)
+        return self.max_ns
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram for JSON output; latencies are in microseconds.
+        """
+        return {
+            "calls": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "min_us": self.min_ns / 1e3,
+            "p50_us": self.percentile(0.5) / 1e3,
+            "p90_us": self.percentile(0.9) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "buckets_ns": {f"<{1 << index}": bucket for index, bucket in enumerate(self.buckets) if bucket},
+        }
+
+
+class Instrumentation:
+    """
+    Collects latency histograms and counters for one CommandHandler session.
+    """
+    
+    def __init__(self):
+        """
+        Initialize empty histograms and counters.
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+    
+    def attach(self, command_handler: "CommandHandler") -> None:
+        """
+        Start timing a command handler, its renderer and its store.
+        
+        Args:
+            command_handler: The handler to instrument; it keeps a reference to
+                this object as its instrumentation attribute
+        """
+        command_handler.instrumentation = self
+        command_handler.parse_command = self.timed("parse", command_handler.parse_command)
+        command_handler.run_command = self._timed_commands(command_handler.run_command)
+        command_handler.renderer.render = self.timed("render", command_handler.renderer.render)
+        
+        manager = command_handler.todo_manager
+        for name in STORE_METHODS:
+            method = getattr(manager, name, None)
+            if method is not None:
+                setattr(manager, name, self.timed(f"store.{name}", method))
+    
+    def timed(self, name: str, function: Callable) -> Callable:
+        """
+        Wrap a function so each call is recorded in the histogram called name.
+        
+        Args:
+            name: The histogram to record into
+            function: The function to time
+        
+        Returns:
+            The wrapped function
+        """
+        histogram = self.histogram(name)
+        clock = time.perf_counter_ns
+        
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+        return wrapper
+    
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Return the histogram called name, creating it if needed.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+    
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Increase the counter called name.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def reset(self) -> None:
+        """
+        Clear all recorded latencies and counters; wrappers keep recording.
+        """
+        for histogram in self.histograms.values():
+            histogram.__init__()
+        self.counters.clear()
+        self.started = time.time()
+    
+    def _timed_commands(self, run_command: Callable) -> Callable:
+        """
+        Wrap CommandHandler.run_command to time each registered command separately.
+        """
+        clock = time.perf_counter_ns
+        histogram = self.histogram
+        count = self.count
+        
+        @wraps(run_command)
+        def wrapper(command: str, args: list):
+            start = clock()
+            result = run_command(command, args)
+            spec = COMMAND_LOOKUP.get(command)
+            histogram(f"command.{spec.name if spec else 'unknown'}").record(clock() - start)
+            if not result.success:
+                count("commands.failed")
+            return result
+        return wrapper
+
+
+def collect_stats(todo_manager: Any, instrumentation: Optional[Instrumentation]) -> Dict[str, Any]:
+    """
+    Gather the store size, memory use and, if enabled, instrumentation data.
+    
+    Args:
+        todo_manager: The store to describe
+        instrumentation: The session's instrumentation, or None if it is disabled
+    
+    Returns:
+        A JSON-serializable dictionary
+    """
+    stats: Dict[str, Any] = {
+        "tasks": len(todo_manager),
+        "approx_store_bytes": estimate_store_bytes(todo_manager),
+        "instrumentation": instrumentation is not None,
+    }
+    archived_count = getattr(todo_manager, "archived_count", None)
+    if archived_count is not None:
+        stats["archived_tasks"] = archived_count()
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats["traced_bytes"] = {"current": current, "peak": peak}
+    if instrumentation is not None:
+        stats["uptime_s"] = round(time.time() - instrumentation.started, 3)
+        stats["counters"] = dict(instrumentation.counters)
+        stats["latency"] = {name: histogram.as_dict()
+                            for name, histogram in sorted(instrumentation.histograms.items())
+                            if histogram.count}
+    return stats
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """
+    Render collected stats as a text report.
+    
+    Args:
+        stats: A dictionary returned by collect_stats
+    
+    Returns:
+        The report, without a trailing newline
+    """
+    size = stats["approx_store_bytes"]
+    lines = [f"Tasks: {stats['tasks']:,}"
+             + (f" (about {size / (1 << 20):,.1f} MiB in memory)" if size is not None else "")]
+    if stats.get("archived_tasks"):
+        lines.append(f"Archived: {stats['archived_tasks']:,} completed tasks on disk")
+    if "traced_bytes" in stats:
+        traced = stats["traced_bytes"]
+        lines.append(f"Traced memory: {traced['current'] / (1 << 20):,.1f} MiB "
+                     f"(peak {traced['peak'] / (1 << 20):,.1f} MiB)")
+    
+    if not stats["instrumentation"]:
+        lines.append("Instrumentation is off; start with --stats or --profile to record latencies")
+        return "\n".join(lines)
+    
+    lines.append(f"Uptime: {stats['uptime_s']:,.1f}s")
+    for name, value in sorted(stats["counters"].items()):
+        lines.append(f"{name}: {value:,}")
+    if stats["latency"]:
+        width = max(len(name) for name in stats["latency"])
+        lines.append(f"{'operation':<{width}} {'calls':>9} {'mean us':>9} {'p50 us':>9} "
+                     f"{'p99 us':>9} {'max us':>9} {'total ms':>10}")
+        for name, summary in stats["latency"].items():
+            lines.append(f"{name:<{width}} {summary['calls']:>9,} {summary['mean_us']:>9.1f} "
+                         f"{summary['p50_us']:>9.1f} {summary['p99_us']:>9.1f} "
+                         f"{summary['max_us']:>9.1f} {summary['total_ms']:>10.1f}")
+    return "\n".join(lines)
+
+
+def estimate_store_bytes(todo_manager: Any, sample_size: int = STATS_MEMORY_SAMPLE) -> Optional[int]:
+    """
+    Estimate the memory held by a TodoManager's tasks and indexes.
+    
+    Tasks and search-index entries are sampled, so the cost does not grow with
+    the store. Stores that keep their tasks elsewhere (such as the sharded
+    store) are not estimated.
+    
+    Args:
+        todo_manager: The store to measure
+        sample_size: The number of tasks and index entries to sample
+    
+    Returns:
+        The approximate size in bytes, or None if it cannot be estimated
+    """
+    tasks = getattr(todo_manager, "_tasks", None)
+    if not isinstance(tasks, dict):
+        return None
+    
+    size = sys.getsizeof
+    total = size(tasks) + size(todo_manager._ids)
+    total += sum(size(ids) for ids in todo_manager._status_index.values())
+    
+    if tasks:
+        sample = random.sample(todo_manager._ids, min(sample_size, len(tasks)))
+        per_task = sum(size(tasks[task_id]) + size(task_id) + size(tasks[task_id].title)
+                       + size(tasks[task_id].description) for task_id in sample) / len(sample)
+        total += per_task * len(tasks)
+        # Each sorted index holds a two-item key per task (the title one with a
+        # case-folded copy of the title) and a reference to it in a chunk
+        title_keys = sum(size(tasks[task_id].title.casefold()) for task_id in sample) / len(sample)
+        total += (2 * (size((None, 0)) + 8) + title_keys) * len(tasks)
+    
+    for index in (todo_manager._token_index, todo_manager._gram_index):
+        total += size(index)
+        if index:
+            words = random.sample(list(index), min(sample_size, len(index))) if len(index) > sample_size else list(index)
+            per_word = sum(size(word) + size(index[word]) for word in words) / len(words)
+            total += per_word * len(index)
+    return int(total)
+
+
+@contextmanager
+def profile_session(output_path: Optional[str] = None, stream=None) -> Iterator[None]:
+    """
+    Run the enclosed code under cProfile and tracemalloc, then print a report.
+    
+    The report lists the functions with the most cumulative time, the peak
+    traced memory and the source lines that allocated the most memory.
+    
+    Args:
+        output_path: Where to save the raw cProfile data for pstats or snakeviz (optional)
+        stream: Where to print the report (defaults to sys.stderr)
+    """
+    stream = stream or sys.stderr
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        allocations = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        print(f"\n=== Profile: top {PROFILE_TOP_ENTRIES} functions by cumulative time ===", file=stream)
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP_ENTRIES)
+        print(f"=== Memory: peak {peak / (1 << 20):,.1f} MiB traced; top allocation sites ===", file=stream)
+        for statistic in _top_allocations(allocations):
+            print(f"  {statistic}", file=stream)
+        if output_path:
+            profiler.dump_stats(output_path)
+            print(f"Profile data saved to {output_path}", file=stream)
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot) -> List[tracemalloc.Statistic]:
+    """
+    Return the source lines holding the most traced memory, excluding tracemalloc itself.
+    """
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    return snapshot.statistics("lineno")[:PROFILE_TOP_ENTRIES // 2]
@@ -0,0 +1,13 @@
+"""
+Record types of the journal's write-ahead log.
+
+They live apart from persistence.py so that TodoManager can write records
+without importing the journal itself (and json and mmap with it) when the
+store has no journal.
+"""
+
+OP_ADD = "a"
+OP_UPDATE = "u"
+OP_DELETE = "d"
+OP_TOGGLE = "t"
+OP_TRANSACTION = "x"
@@ -1,20 +1,177 @@
 """
 Main entry point for the Todo In-Memory Python Console App.
+
+Modules that only some sessions need (batch mode, persistence, sharding,
+mapped stores, instrumentation and tab completion) are imported where they are used, to keep startup fast.
 """
+import argparse
+import sys
+from typing import List, Optional
+from .config import ARCHIVE_MAX_BYTES, ARCHIVE_MAX_TASKS
 from .todo_manager import TodoManager
 from .commands import CommandHandler
+from .renderers import RENDERERS
 from .ui import print_welcome_header
 
 
-def main():
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command-line options of the application.
+    
+    Args:
+        argv: The arguments to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        The parsed options
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.main",
+                                     description="Todo In-Memory Python Console App")
+    parser.add_argument("--data-dir", metavar="DIR",
+                        help="persist tasks in DIR with a journal and restore them on startup")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run the commands in FILE ('-' for stdin) without prompts, then exit")
+    parser.add_argument("--no-output", action="store_true",
+                        help="in batch mode, discard command output and print only the summary")
+    parser.add_argument("--quiet", action="store_true",
+                        help="skip the welcome header, and in batch mode the summary")
+    parser.add_argument("--format", choices=sorted(RENDERERS), default="table",
+                        help="how command results are rendered (default: table)")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="partition tasks across N worker processes")
+    parser.add_argument("--open", metavar="FILE",
+                        help="serve the tasks of a memory-mapped .tmap file (see 'export'); "
+                             "changes stay in memory until exported")
+    parser.add_argument("--max-tasks", type=int, metavar="N",
+                        help="keep at most N tasks in memory, archiving the oldest completed ones to disk past it")
+    parser.add_argument("--max-memory", type=float, metavar="MB",
+                        help="keep about MB megabytes of tasks in memory, archiving the oldest completed ones past it")
+    parser.add_argument("--stats", action="store_true",
+                        help="record command, rendering and store latencies for the 'stats' command")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE",
+                        help="run the session under cProfile and tracemalloc and print a report on exit; "
+                             "the raw profile is saved to FILE if given (implies --stats)")
+    options = parser.parse_args(argv)
+    if options.shards is not None and options.data_dir:
+        parser.error("--shards cannot be combined with --data-dir")
+    if options.open and (options.shards is not None or options.data_dir):
+        parser.error("--open cannot be combined with --shards or --data-dir")
+    if options.open and (options.max_tasks is not None or options.max_memory is not None):
+        parser.error("--open cannot be combined with --max-tasks or --max-memory")
+    if options.max_tasks is not None and options.max_tasks < 1:
+        parser.error("--max-tasks must be at least 1")
+    if options.max_memory is not None and not 1 <= options.max_memory * (1 << 20) < float("inf"):
+        parser.error("--max-memory must be a positive number of megabytes")
+    if options.shards is not None and options.shards < 1:
+        parser.error("--shards must be at least 1")
+    return options
+
+
+def main(argv: Optional[List[str]] = None):
     """
-    Main application loop for the Todo In-Memory Python Console App.
+    Run the Todo In-Memory Python Console App interactively or in batch mode.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
     """
-    print_welcome_header()
+    options = parse_arguments(argv)
     
     # Initialize the application components
-    todo_manager = TodoManager()
-    command_handler = CommandHandler(todo_manager)
+    max_tasks = options.max_tasks if options.max_tasks is not None else ARCHIVE_MAX_TASKS
+    max_bytes = int(options.max_memory * (1 << 20)) if options.max_memory is not None else ARCHIVE_MAX_BYTES
+    journal = None
+    if options.data_dir:
+        from .persistence import Journal
+        journal = Journal(options.data_dir)
+    if options.shards is not None:
+        from .sharding import ShardedTodoManager
+        todo_manager = ShardedTodoManager(options.shards, max_tasks, max_bytes)
+    elif options.open:
+        from .mapped_store import MappedTodoManager
+        try:
+            todo_manager = MappedTodoManager(options.open)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot open {options.open}: {e}")
+    else:
+        todo_manager = TodoManager(journal, max_tasks, max_bytes)
+    instrumentation = None
+    if options.stats or options.profile is not None:
+        from .instrumentation import Instrumentation
+        instrumentation = Instrumentation()
+    command_handler = CommandHandler(todo_manager, RENDERERS[options.format](), instrumentation)
+    
+    try:
+        if options.profile is not None:
+            from .instrumentation import profile_session
+            with profile_session(options.profile or None):
+                run_session(options, command_handler)
+        else:
+            run_session(options, command_handler)
+    finally:
+        command_handler.discard_transaction()
+        if journal is not None:
+            journal.close()
+        if options.shards is not None or options.open:
+            todo_manager.close()
+
+
+def run_session(options: argparse.Namespace, command_handler: CommandHandler):
+    """
+    Run the batch file given in the options, or the interactive prompt.
+    
+    Args:
+        options: The parsed command-line options
+        command_handler: The CommandHandler to execute the commands with
+    """
+    if options.batch:
+        run_batch_file(options.batch, command_handler, options.format,
+                       no_output=options.no_output, quiet=options.quiet)
+    else:
+        run_interactive(command_handler, options.quiet)
+
+
+def run_batch_file(path: str, command_handler: CommandHandler, output_format: str, no_output: bool = False,
+                   quiet: bool = False):
+    """
+    Execute a command file (or stdin) and report throughput on stderr.
+    
+    Args:
+        path: Path of the command file, or '-' for stdin
+        command_handler: The CommandHandler to execute the commands with
+        output_format: The renderer to use for the commands' results
+        no_output: If True, discard the commands' output (--no-output)
+        quiet: If True, do not print the throughput summary (--quiet)
+    """
+    from .batch import run_batch
+    
+    if path == "-":
+        stats = run_batch(sys.stdin, command_handler, sys.stdout, output_format, no_output=no_output)
+    else:
+        try:
+            commands = open(path, encoding="utf-8", buffering=1 << 16)
+        except OSError as e:
+            sys.exit(f"Cannot read {path}: {e}")
+        with commands:
+            stats = run_batch(commands, command_handler, sys.stdout, output_format, no_output=no_output)
+    if not quiet:
+        print(stats.summary(), file=sys.stderr)
+
+
+def run_interactive(command_handler: CommandHandler, quiet: bool = False):
+    """
+    Run the interactive prompt loop until the user exits.
+    
+    Where readline is available, Tab completes command names and task titles
+    (see completion.py).
+    
+    Args:
+        command_handler: The CommandHandler to execute the commands with
+        quiet: If True, start without the welcome header
+    """
+    if not quiet:
+        print_welcome_header()
+    
+    from .completion import install_completion
+    install_completion(command_handler.todo_manager)
     
     # Main application loop
     running = True
@@ -40,4 +197,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
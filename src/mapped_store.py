@@ -0,0 +1,701 @@
+"""
+Memory-mapped, read-only task files for the Todo In-Memory Python Console App.
+
+A .tmap file holds a whole task set in a layout that is used straight from
+the mapping, without parsing (all integers are little-endian u64):
+
+    header      The magic bytes b"TODOMAP\\x01", the task count n and the next free ID
+    ids         n task IDs, in ascending order
+    status      n bytes, 1 for a completed task and 0 for an open one,
+                followed by zero padding to a multiple of 8 bytes
+    offsets     2n + 1 heap offsets: task i's title is heap[offsets[2i]:offsets[2i + 1]]
+                and its description heap[offsets[2i + 1]:offsets[2i + 2]]
+    heap        The UTF-8 titles and descriptions, back to back
+
+Opening a file only maps it and checks the header, so it costs the same for
+a thousand tasks as for millions. A Task is built from the columns when it is
+read, and the operating system only pages in the parts of the file that are
+actually touched.
+
+MappedTodoManager serves such a file as a store, keeping every change in an
+in-memory overlay on top of the unmodified file.
+"""
+import bisect
+import heapq
+import mmap
+import re
+import struct
+import sys
+from array import array
+from itertools import chain, compress, filterfalse, islice
+from operator import attrgetter
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set
+
+from .models import Task
+from .sorted_index import SortedIndex
+from .config import FIND_DEFAULT_LIMIT
+from .todo_manager import SORT_ID, SORT_STATUS, SORT_TITLE, FindQuery, TaskSelector, TodoManager, check_sort_window, id_ranges
+from .utils import tokenize
+
+
+MAGIC = b"TODOMAP\x01"
+_HEADER = struct.Struct("<8sQQ")  # magic, task count, next ID
+
+# Swaps 0 and 1 bytes, turning the completed column into an open column
+_INVERT_STATUS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+_task_id = attrgetter("id")
+
+
+def write_store(stream: BinaryIO, tasks: Iterable[Task], next_id: Optional[int] = None) -> int:
+    """
+    Write tasks as a mapped task file.
+    
+    Args:
+        stream: A binary stream positioned at the start of the file
+        tasks: The tasks to write, in ascending ID order
+        next_id: The ID the store hands out next (defaults to one past the largest ID)
+    
+    Returns:
+        The number of tasks written
+    
+    Raises:
+        ValueError: If the tasks are not in ascending ID order
+    """
+    ids = array("Q")
+    status = bytearray()
+    offsets = array("Q", [0])
+    heap = []
+    size = 0
+    last_id = 0
+    for task in tasks:
+        if task.id <= last_id:
+            raise ValueError("Tasks must be written in ascending ID order")
+        last_id = task.id
+        title = task.title.encode("utf-8")
+        description = task.description.encode("utf-8")
+        ids.append(task.id)
+        status.append(task.completed)
+        size += len(title)
+        offsets.append(size)
+        size += len(description)
+        offsets.append(size)
+        heap.append(title)
+        heap.append(description)
+    
+    if sys.byteorder == "big":
+        ids.byteswap()
+        offsets.byteswap()
+    status += bytes(-len(status) % 8)
+    stream.write(_HEADER.pack(MAGIC, len(ids), max(next_id or 0, last_id + 1)))
+    stream.write(ids.tobytes())
+    stream.write(status)
+    stream.write(offsets.tobytes())
+    stream.write(b"".join(heap))
+    return len(ids)
+
+
+class MappedTasks:
+    """
+    The columns of a mapped task file, read in place.
+    
+    Positions run from 0 to len - 1 in ID order. The mapping stays valid
+    until close is called, and the file must not be modified meanwhile.
+    """
+    
+    def __init__(self, stream: BinaryIO):
+        """
+        Map a task file.
+        
+        Args:
+            stream: The file, opened for binary reading; it may be closed once mapped
+        
+        Raises:
+            ValueError: If the file is not a mapped task file
+        """
+        if sys.byteorder == "big":
+            raise ValueError("Mapped task files can only be read on little-endian machines")
+        try:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # An empty file cannot be mapped
+            raise ValueError("Not a mapped task file (the file is empty)")
+        
+        view = memoryview(self._map)
+        if len(view) < _HEADER.size:
+            view.release()
+            self._map.close()
+            raise ValueError("Not a mapped task file (the file is too short)")
+        magic, count, self.next_id = _HEADER.unpack_from(view)
+        status_start = _HEADER.size + 8 * count
+        offsets_start = status_start + count + (-count % 8)
+        heap_start = offsets_start + 8 * (2 * count + 1)
+        if magic != MAGIC or len(view) < heap_start:
+            view.release()
+            self._map.close()
+            raise ValueError("Not a mapped task file (bad magic bytes or truncated columns)")
+        
+        self._view = view
+        self.ids = view[_HEADER.size:status_start].cast("Q")
+        self.status = view[status_start:status_start + count]
+        self.offsets = view[offsets_start:heap_start].cast("Q")
+        self.heap = view[heap_start:]
+    
+    def __len__(self) -> int:
+        """
+        Return the number of tasks in the file.
+        """
+        return len(self.ids)
+    
+    def close(self) -> None:
+        """
+        Release the mapping; Tasks already built stay usable.
+        """
+        for view in (self.ids, self.status, self.offsets, self.heap, self._view):
+            view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Slices still in use keep the mapping alive until they are freed
+    
+    def position(self, task_id: int) -> Optional[int]:
+        """
+        Find the position of a task ID.
+        
+        Returns:
+            The position, or None if the file has no task with that ID
+        """
+        ids = self.ids
+        pos = bisect.bisect_left(ids, task_id)
+        if pos < len(ids) and ids[pos] == task_id:
+            return pos
+        return None
+    
+    def position_of_offset(self, offset: int) -> int:
+        """
+        Return the position of the task whose title or description holds a heap offset.
+        """
+        return (bisect.bisect_right(self.offsets, offset) - 1) // 2
+    
+    def task_at(self, pos: int) -> Task:
+        """
+        Build the Task stored at a position.
+        """
+        offsets = self.offsets
+        heap = self.heap
+        task = object.__new__(Task)  # Validated when the file was written
+        task.id = self.ids[pos]
+        task.title = str(heap[offsets[2 * pos]:offsets[2 * pos + 1]], "utf-8")
+        task.description = str(heap[offsets[2 * pos + 1]:offsets[2 * pos + 2]], "utf-8")
+        task.completed = bool(self.status[pos])
+        return task
+    
+    def titles(self) -> Iterator[str]:
+        """
+        Decode every title, in position order.
+        """
+        offsets = self.offsets
+        heap = self.heap
+        for pos in range(len(self.ids)):
+            yield str(heap[offsets[2 * pos]:offsets[2 * pos + 1]], "utf-8")
+
+
+class MappedTodoManager(TodoManager):
+    """
+    A TodoManager whose tasks start out in a memory-mapped task file.
+    
+    The file is never modified. The storage inherited from TodoManager serves
+    as an in-memory overlay: new tasks are added to it, and a mapped task is
+    copied into it the first time it is updated, toggled or deleted, after
+    which its ID is hidden in the mapped base. Reads merge the visible base
+    tasks with the overlay in ID order, building Tasks for the base only as
+    they are returned.
+    
+    ID-ordered reads locate a page by counting the base, hidden and overlay IDs
+    below a bisected ID, so get_task, get_page and sorted windows in ID order
+    cost O(log^2 n) plus the tasks returned, however large the file. Status
+    filters, searches and title order scan the mapped columns instead (title
+    order decodes every mapped title into an index the first time it is used).
+    
+    The store has no journal; export it to keep its changes. It has no memory
+    budget either, as its file already keeps the tasks out of memory.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a mapped task file.
+        
+        Args:
+            path: The .tmap file to serve
+        
+        Raises:
+            ValueError: If the file is not a mapped task file
+            OSError: If the file cannot be opened
+        """
+        super().__init__(max_tasks=None, max_bytes=None)
+        with open(path, "rb") as stream:
+            self._base = MappedTasks(stream)
+        self._hidden: Set[int] = set()  # Base IDs that were faulted into the overlay
+        self._hidden_ids: List[int] = []  # The same IDs in ascending order, for counting
+        self._base_titles: Optional[SortedIndex] = None  # (case-folded title, ID) of every base task
+        self._next_id = max(self._next_id, self._base.next_id)
+    
+    def __len__(self) -> int:
+        """
+        Return the number of tasks currently stored.
+        """
+        return len(self._base) - len(self._hidden) + len(self._tasks)
+    
+    def close(self) -> None:
+        """
+        Release the mapped file; the store must not be used afterwards.
+        """
+        self._base.close()
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Retrieve a task by its ID.
+        
+        Args:
+            task_id: The ID of the task to retrieve
+        
+        Returns:
+            The Task object if found, None otherwise; a task from the file is
+            built anew on every call
+        """
+        task = self._tasks.get(task_id)
+        if task is not None or task_id in self._hidden:
+            return task
+        pos = self._base.position(task_id)
+        return None if pos is None else self._base.task_at(pos)
+    
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Retrieve all tasks.
+        
+        Returns:
+            A list of all Task objects, sorted by ID
+        """
+        return list(self.iter_tasks())
+    
+    def iter_tasks(self, start_id: Optional[int] = None, end_id: Optional[int] = None) -> Iterator[Task]:
+        """
+        Lazily iterate over tasks in ID order, optionally limited to an ID range.
+        
+        The store must not be modified while the iterator is being consumed.
+        
+        Args:
+            start_id: The smallest task ID to include (optional, inclusive)
+            end_id: The largest task ID to include (optional, inclusive)
+        
+        Returns:
+            An iterator of Task objects, sorted by ID
+        """
+        return map(self.get_task, self._merged_ids(start_id, end_id))
+    
+    def get_tasks_in_range(self, start_id: int, end_id: int) -> List[Task]:
+        """
+        Retrieve all tasks whose IDs fall between start_id and end_id.
+        
+        Args:
+            start_id: The smallest task ID to include (inclusive)
+            end_id: The largest task ID to include (inclusive)
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return list(self.iter_tasks(start_id, end_id))
+    
+    def get_page(self, page: int, page_size: int) -> List[Task]:
+        """
+        Retrieve one page of tasks in ID order.
+        
+        Args:
+            page: The page number, starting from 1
+            page_size: The number of tasks per page
+        
+        Returns:
+            A list of up to page_size Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If page or page_size is less than 1
+        """
+        if page < 1:
+            raise ValueError("Page number must be at least 1")
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        return list(map(self.get_task, self._ids_from((page - 1) * page_size, page_size)))
+    
+    def get_tasks_by_status(self, completed: bool) -> List[Task]:
+        """
+        Retrieve all tasks with the given completion status.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return list(map(self.get_task, self._status_ids(completed)))
+    
+    def count_by_status(self, completed: bool) -> int:
+        """
+        Count the tasks with the given completion status, counting the base's column in one pass.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+        
+        Returns:
+            The number of matching tasks
+        """
+        base = self._base
+        done = (base.status.tobytes().count(1) - sum(base.status[base.position(task_id)] for task_id in self._hidden)
+                + len(self._status_index[True]))
+        return done if completed else len(self) - done
+    
+    def get_sorted(self, sort: str = SORT_ID, descending: bool = False, start: int = 0,
+                   count: Optional[int] = None, completed: Optional[bool] = None) -> List[Task]:
+        """
+        Retrieve tasks in ID, title or status order, optionally only those with one status.
+        
+        Args:
+            sort: One of SORT_KEYS
+            descending: True to list the order from its end
+            start: The number of tasks to skip (0 to start at the first)
+            count: The maximum number of tasks to return (None for all)
+            completed: True for completed tasks only, False for open tasks only
+                (None for all tasks)
+        
+        Returns:
+            A list of Task objects in the requested order
+        
+        Raises:
+            ValueError: If sort is not a known order, or start or count is negative
+        """
+        return list(map(self.get_task, self._sorted_ids(sort, descending, start, count, completed)))
+    
+    def search_tasks(self, query: str) -> List[Task]:
+        """
+        Find tasks whose title or description contains every word of the query.
+        
+        Mapped tasks have no word index. The heap is scanned for the longest
+        ASCII word of the query (case-insensitively, at C speed), and only the
+        tasks it occurs in are built and checked word by word; a query of
+        non-ASCII words checks every mapped task.
+        
+        Args:
+            query: One or more words to search for
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        
+        base = self._base
+        probe = max((term for term in terms if term.isascii()), key=len, default=None)
+        if probe is None:
+            positions = range(len(base))
+        else:
+            pattern = re.compile(re.escape(probe.encode("ascii")), re.IGNORECASE)
+            positions = sorted({base.position_of_offset(match.start()) for match in pattern.finditer(base.heap)})
+        
+        matches = []
+        for pos in positions:
+            if base.ids[pos] in self._hidden:
+                continue
+            task = base.task_at(pos)
+            if terms <= self._task_tokens(task):
+                matches.append(task)
+        return list(heapq.merge(matches, super().search_tasks(query), key=_task_id))
+    
+    def find_tasks(self, fragment: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles best match a fragment, tolerating typos.
+        
+        Mapped tasks have no trigram index. Every match contains one of any
+        len(grams) - required + 1 of the fragment's trigrams, so the heap is
+        scanned for those (ASCII case-insensitively, at C speed) and only the
+        titles they occur in are scored (so a mapped title whose case folding
+        turns other characters into ASCII, like 'ß' into 'ss', can be missed);
+        trigrams outside ASCII score every mapped title. Fragments too short
+        for trigrams are looked up in the mapped titles' sorted index (see
+        find_by_prefix).
+        
+        Args:
+            fragment: Part of a title, possibly misspelled
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, best match first (see FindQuery)
+        """
+        query = FindQuery(fragment)
+        if not query.needle or limit <= 0:
+            return []
+        if not query.grams:
+            return self.find_by_prefix(query.needle, limit)
+        overlay = super().find_tasks(fragment, limit)
+        base = self._base
+        
+        probes = sorted(query.grams)[:len(query.grams) - query.required + 1]
+        if all(probe.isascii() for probe in probes):
+            # A lookahead finds overlapping occurrences too; only those inside a title count
+            pattern = re.compile(b"(?=" + b"|".join(re.escape(probe.encode("ascii")) for probe in probes) + b")",
+                                 re.IGNORECASE)
+            offsets = base.offsets
+            slots = (bisect.bisect_right(offsets, match.start()) - 1 for match in pattern.finditer(base.heap))
+            positions = sorted({slot // 2 for slot in slots if slot % 2 == 0})
+        else:
+            positions = range(len(base))
+        
+        matches = []
+        for pos in positions:
+            if base.ids[pos] in self._hidden:
+                continue
+            task = base.task_at(pos)
+            if query.score(task.title):
+                matches.append(task)
+        return heapq.nsmallest(limit, chain(matches, overlay), key=query.rank)
+    
+    def find_by_prefix(self, prefix: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles begin with a prefix, ignoring case.
+        
+        Mapped titles are looked up in a sorted index of every mapped title,
+        which is built the first time it is needed.
+        
+        Args:
+            prefix: The beginning of a title
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, in title order
+        """
+        folded = prefix.casefold()
+        titles = self._base_title_index()
+        start = titles.bisect_left((folded,))
+        matches = []
+        for key in titles.slice(start, start + limit + len(self._hidden)):
+            if not key[0].startswith(folded):
+                break
+            if key[1] not in self._hidden:
+                matches.append(key)
+        overlay = ((task.title.casefold(), task.id) for task in super().find_by_prefix(prefix, limit))
+        return [self.get_task(task_id) for _, task_id in islice(heapq.merge(matches, overlay), limit)]
+    
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
+        """
+        Update the title and/or description of a task by its ID, copying it into the overlay first.
+        
+        Args:
+            task_id: The ID of the task to update
+            title: New title for the task (optional)
+            description: New description for the task (optional)
+        
+        Returns:
+            True if the task was found and updated, False otherwise
+        
+        Raises:
+            ValueError: If the new title is empty or exceeds length limits
+        """
+        self._fault_in([task_id])
+        return super().update_task(task_id, title, description)
+    
+    def delete_task(self, task_id: int) -> bool:
+        """
+        Delete a task by its ID, hiding it in the mapped file.
+        
+        Args:
+            task_id: The ID of the task to delete
+        
+        Returns:
+            True if the task was found and deleted, False otherwise
+        """
+        self._fault_in([task_id])
+        return super().delete_task(task_id)
+    
+    def toggle_task_status(self, task_id: int) -> bool:
+        """
+        Toggle the completion status of a task by its ID, copying it into the overlay first.
+        
+        Args:
+            task_id: The ID of the task to toggle
+        
+        Returns:
+            True if the task was found and toggled, False otherwise
+        """
+        self._fault_in([task_id])
+        return super().toggle_task_status(task_id)
+    
+    def set_budget(self, max_tasks: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Refuse a memory budget: the mapped file already holds the tasks outside memory.
+        
+        Args:
+            max_tasks: Must be None
+            max_bytes: Must be None
+        
+        Returns:
+            0, as nothing is archived
+        
+        Raises:
+            ValueError: If a limit is given
+        """
+        if max_tasks is not None or max_bytes is not None:
+            raise ValueError("A mapped store keeps its tasks in its file and takes no memory budget")
+        return 0
+    
+    def _select_ids(self, selector: TaskSelector) -> List[int]:
+        """
+        Resolve a bulk selector over the base and the overlay, faulting the selected base tasks in.
+        """
+        ranges = id_ranges(selector)
+        if ranges is not None:
+            task_ids = sorted({task_id for id_range in ranges
+                               for task_id in self._merged_ids(id_range[0], id_range[-1]) if task_id in id_range})
+        elif callable(selector):
+            task_ids = [task_id for task_id in self._merged_ids(None, None) if selector(self.get_task(task_id))]
+        else:
+            task_ids = sorted({task_id for task_id in selector if self._exists(task_id)})
+        self._fault_in(task_ids)
+        return task_ids
+    
+    def _sorted_ids(self, sort: str, descending: bool, start: int, count: Optional[int],
+                    completed: Optional[bool]) -> List[int]:
+        """
+        Return the IDs of a window of tasks in a sort order, merging the base and the overlay.
+        """
+        check_sort_window(sort, start, count)
+        if sort == SORT_ID and completed is None:
+            lo, hi = self._window(len(self), start, count, descending)
+            task_ids = self._ids_from(lo, hi - lo)
+            if descending:
+                task_ids.reverse()
+            return task_ids
+        
+        if sort == SORT_TITLE:
+            ordered = self._title_ids(completed)
+        elif sort == SORT_STATUS and completed is None:
+            ordered = chain(self._status_ids(False), self._status_ids(True))
+        else:
+            # Within one status, status order is ID order
+            ordered = self._status_ids(completed)
+        
+        if not descending:
+            return list(islice(ordered, start, None if count is None else start + count))
+        task_ids = list(ordered)
+        lo, hi = self._window(len(task_ids), start, count, descending)
+        window = task_ids[lo:hi]
+        window.reverse()
+        return window
+    
+    def _merged_ids(self, start_id: Optional[int], end_id: Optional[int]) -> Iterator[int]:
+        """
+        Iterate over the visible IDs between start_id and end_id (inclusive; None for no bound) in order.
+        """
+        ids = self._base.ids
+        lo = 0 if start_id is None else bisect.bisect_left(ids, start_id)
+        hi = len(ids) if end_id is None else max(lo, bisect.bisect_right(ids, end_id))
+        base_ids = iter(ids[lo:hi])
+        if self._hidden:
+            base_ids = filterfalse(self._hidden.__contains__, base_ids)
+        
+        overlay_lo, overlay_hi = self._id_bounds(start_id, end_id)
+        if overlay_lo == overlay_hi:
+            return base_ids
+        return heapq.merge(base_ids, self._ids[overlay_lo:overlay_hi])
+    
+    def _ids_from(self, position: int, count: int) -> List[int]:
+        """
+        Return up to count visible IDs, starting at a position in ID order.
+        """
+        if count <= 0 or position >= len(self):
+            return []
+        if not self._hidden and not self._tasks:
+            return self._base.ids[position:position + count].tolist()
+        
+        # Bisect for the smallest ID with more than `position` visible IDs at or below it
+        base_ids = self._base.ids
+        lo = 1
+        hi = max(base_ids[-1] if len(base_ids) else 0, self._ids[-1] if self._ids else 0)
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self._count_up_to(middle) > position:
+                hi = middle
+            else:
+                lo = middle + 1
+        return list(islice(self._merged_ids(lo, None), count))
+    
+    def _count_up_to(self, task_id: int) -> int:
+        """
+        Count the visible tasks whose ID is at most task_id.
+        """
+        return (bisect.bisect_right(self._base.ids, task_id) - bisect.bisect_right(self._hidden_ids, task_id)
+                + bisect.bisect_right(self._ids, task_id))
+    
+    def _status_ids(self, completed: bool) -> Iterator[int]:
+        """
+        Iterate over the visible IDs of tasks with one status, in ID order.
+        """
+        base = self._base
+        mask = base.status if completed else bytes(base.status).translate(_INVERT_STATUS)
+        base_ids = compress(base.ids, mask)
+        if self._hidden:
+            base_ids = filterfalse(self._hidden.__contains__, base_ids)
+        return heapq.merge(base_ids, sorted(self._status_index[completed]))
+    
+    def _title_ids(self, completed: Optional[bool]) -> Iterator[int]:
+        """
+        Iterate over the visible IDs in title order, optionally of one status only.
+        """
+        base_keys = iter(self._base_title_index())
+        if self._hidden:
+            # Faulted-in tasks are placed by their overlay copy, which may have a new title
+            hidden = self._hidden
+            base_keys = (key for key in base_keys if key[1] not in hidden)
+        task_ids = (task_id for _, task_id in heapq.merge(base_keys, self._title_order))
+        if completed is not None:
+            wanted = set(self._status_ids(completed))
+            return filter(wanted.__contains__, task_ids)
+        return task_ids
+    
+    def _base_title_index(self) -> SortedIndex:
+        """
+        Return the (case-folded title, ID) index of every mapped task, building it on first use.
+        """
+        if self._base_titles is None:
+            self._base_titles = SortedIndex(zip(map(str.casefold, self._base.titles()), self._base.ids))
+        return self._base_titles
+    
+    def _exists(self, task_id: int) -> bool:
+        """
+        Check whether a task ID is visible, without building the task.
+        """
+        if task_id in self._tasks:
+            return True
+        return task_id not in self._hidden and self._base.position(task_id) is not None
+    
+    def _fault_in(self, task_ids: List[int]) -> None:
+        """
+        Copy the given base tasks into the overlay and hide them in the base.
+        
+        IDs that are already in the overlay, hidden or unknown are ignored.
+        
+        Args:
+            task_ids: The IDs of tasks about to be modified, in ascending order
+        """
+        base = self._base
+        tasks = []
+        for task_id in task_ids:
+            if task_id in self._tasks or task_id in self._hidden:
+                continue
+            pos = base.position(task_id)
+            if pos is not None:
+                tasks.append(base.task_at(pos))
+        if not tasks:
+            return
+        
+        faulted = [task.id for task in tasks]
+        self._hidden.update(faulted)
+        self._hidden_ids = list(heapq.merge(self._hidden_ids, faulted))
+        self._insert_tasks(tasks)
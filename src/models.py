@@ -1,32 +1,101 @@
 """
 Data models for the Todo In-Memory Python Console App.
 """
-from dataclasses import dataclass
+from itertools import compress, count, repeat
+from typing import List, Optional, Sequence, Tuple
+from .validation import validate_columns, validate_fields
 
 
-@dataclass
 class Task:
     """
     Represents a single task in the todo list.
     
+    Tasks use __slots__ instead of a per-instance __dict__, which keeps the
+    footprint of large in-memory stores down to a few pointers per task. The
+    class is written out by hand rather than with @dataclass so that starting
+    the app does not have to import the dataclasses module.
+    
     Attributes:
         id: Unique identifier for the task (auto-incrementing)
         title: Title of the task (required)
         description: Detailed description of the task (optional)
         completed: Status of the task (True for complete, False for incomplete)
     """
-    id: int
-    title: str
-    description: str = ""
-    completed: bool = False
-
-    def __post_init__(self):
+    __slots__ = ("id", "title", "description", "completed")
+    
+    def __init__(self, id: int, title: str, description: str = "", completed: bool = False):
+        """
+        Initialize and validate the task.
+        
+        Raises:
+            ValueError: If the title is empty or either field exceeds length limits
+        """
+        error = validate_fields(title, description)
+        if error is not None:
+            raise ValueError(error)
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+    
+    def __repr__(self) -> str:
+        """
+        Show the task's fields, e.g. Task(id=1, title='Buy milk', description='', completed=False).
+        """
+        return (f"Task(id={self.id!r}, title={self.title!r}, description={self.description!r}, "
+                f"completed={self.completed!r})")
+    
+    def __eq__(self, other) -> bool:
+        """
+        Compare two tasks field by field.
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.id, self.title, self.description, self.completed)
+                == (other.id, other.title, other.description, other.completed))
+    
+    __hash__ = None  # Tasks are mutable, so they compare by value but are not hashable
+    
+    @classmethod
+    def batch(cls, first_id: int, titles: Sequence[str], descriptions: Sequence[str],
+              completed: Optional[Sequence[bool]] = None) -> Tuple[List["Task"], List[Tuple[int, str]]]:
         """
-        Validate the task after initialization.
+        Validate columns of task fields at once and build the valid tasks.
+        
+        The columns are checked together with validate_columns, so the valid
+        rows are built without being validated a second time one by one.
+        
+        Args:
+            first_id: The ID of the first valid task; the others follow consecutively
+            titles: One title per row
+            descriptions: One description per row, aligned with titles
+            completed: One completion status per row (optional, defaults to False)
+        
+        Returns:
+            The tasks built from the valid rows, in row order, and the
+            (row index, error message) pairs of the invalid rows
         """
-        if not self.title.strip():
-            raise ValueError("Task title cannot be empty")
-        if len(self.title) > 200:
-            raise ValueError("Task title cannot exceed 200 characters")
-        if len(self.description) > 500:
-            raise ValueError("Task description cannot exceed 500 characters")
\ No newline at end of file
+        errors = validate_columns(titles, descriptions)
+        if completed is None:
+            completed = repeat(False, len(titles))
+        
+        if errors:
+            # Drop the invalid rows from every column before building anything
+            keep = bytearray(b"\x01") * len(titles)
+            for row, _ in errors:
+                keep[row] = 0
+            titles = compress(titles, keep)
+            descriptions = compress(descriptions, keep)
+            completed = compress(completed, keep)
+        
+        tasks = []
+        append = tasks.append
+        new = object.__new__
+        for task_id, title, description, done in zip(count(first_id), titles, descriptions, completed):
+            task = new(cls)
+            task.id = task_id
+            task.title = title
+            task.description = description
+            task.completed = done
+            append(task)
+        return tasks, errors
\ No newline at end of file
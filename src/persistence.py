@@ -0,0 +1,321 @@
+"""
+Optional persistence for the Todo In-Memory Python Console App.
+
+A Journal keeps a write-ahead log of every mutating TodoManager call, plus a
+snapshot that periodically compacts the log. On startup the latest snapshot is
+loaded and only the log written after it is replayed, so restore time depends
+on the size of the store rather than the length of its history.
+
+On-disk layout inside the journal directory:
+    snapshot.jsonl      Header line {"next_id": ..., "generation": ...} followed
+                        by one [id, title, description, completed] line per task
+    journal.<N>.log     One compact JSON record per mutation, for log generation N;
+                        a committed transaction or a bulk mutation is a single
+                        record holding all of its records, so it is replayed
+                        entirely or not at all
+"""
+import heapq
+import json
+import mmap
+import os
+from operator import attrgetter
+from typing import IO, TYPE_CHECKING, Iterator, List, Optional
+
+from .config import JOURNAL_FSYNC_BATCH, JOURNAL_SNAPSHOT_INTERVAL
+from .journal_records import OP_ADD, OP_DELETE, OP_TOGGLE, OP_TRANSACTION, OP_UPDATE
+from .models import Task
+
+if TYPE_CHECKING:
+    from .todo_manager import TodoManager
+
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+LOG_PREFIX = "journal."
+LOG_SUFFIX = ".log"
+
+class Journal:
+    """
+    Append-only write-ahead log with snapshotting for a TodoManager.
+    
+    Records are buffered and fsync'ed in batches of fsync_every records; after
+    snapshot_every records the whole store is written to a new snapshot and the
+    older logs are removed.
+    """
+    
+    def __init__(self, directory: str, fsync_every: int = JOURNAL_FSYNC_BATCH,
+                 snapshot_every: int = JOURNAL_SNAPSHOT_INTERVAL):
+        """
+        Initialize a journal stored in the given directory.
+        
+        Args:
+            directory: Directory holding the snapshot and log files (created if missing)
+            fsync_every: Number of records to write between fsync calls
+            snapshot_every: Number of records to log before compacting into a snapshot
+        """
+        self.directory = directory
+        self.fsync_every = max(1, fsync_every)
+        self.snapshot_every = max(1, snapshot_every)
+        self._manager: Optional["TodoManager"] = None
+        self._log: Optional[IO[str]] = None
+        self._generation = 0
+        self._unsynced = 0
+        self._since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    def restore(self, manager: "TodoManager") -> None:
+        """
+        Load the latest snapshot and replay the log tail into an empty manager.
+        
+        After restoring, the journal is bound to the manager and opens a fresh
+        log generation for new records.
+        
+        Args:
+            manager: The TodoManager to populate; it must not have a journal attached yet
+        
+        Raises:
+            ValueError: If a log record is corrupt (see _apply)
+        """
+        first_generation = self._load_snapshot(manager)
+        
+        generation = first_generation
+        for generation in self._log_generations():
+            if generation < first_generation:
+                continue
+            for record in self._read_log(generation):
+                self._since_snapshot += 1
+                self._apply(manager, record)
+                manager._enforce_budget()
+        
+        self._manager = manager
+        self._open_log(max(generation, first_generation) + 1)
+    
+    def append(self, record: list) -> None:
+        """
+        Append a mutation record to the log.
+        
+        Args:
+            record: A list whose first element is one of the OP_* record types
+        """
+        self._log.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._log.write("\n")
+        self._unsynced += 1
+        self._since_snapshot += 1
+        
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        elif self._unsynced >= self.fsync_every:
+            self.flush()
+    
+    def extend(self, records: List[list]) -> None:
+        """
+        Append the records of one mutation, which has already been applied in full.
+        
+        Several records go into one log line like a transaction's, so a
+        snapshot can never be taken between them: it would already hold the
+        whole mutation, and the records after it would be replayed on top.
+        
+        Args:
+            records: The mutation's records, in the order they were made
+        """
+        if len(records) == 1:
+            self.append(records[0])
+        elif records:
+            self.append_transaction(records)
+    
+    def append_transaction(self, records: List[list]) -> None:
+        """
+        Append the records of a committed transaction as one log line.
+        
+        A torn final line is ignored on restore, so a crash while writing it
+        loses the whole transaction rather than part of it.
+        
+        Args:
+            records: The transaction's records, in the order they were made
+        """
+        self._log.write(json.dumps([OP_TRANSACTION, records], ensure_ascii=False, separators=(",", ":")))
+        self._log.write("\n")
+        self._unsynced += len(records)
+        self._since_snapshot += len(records)
+        
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        elif self._unsynced >= self.fsync_every:
+            self.flush()
+    
+    def flush(self) -> None:
+        """
+        Flush buffered records and fsync the log to disk.
+        """
+        if self._log is None or self._unsynced == 0:
+            return
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._unsynced = 0
+    
+    def snapshot(self) -> None:
+        """
+        Write the whole store to a new snapshot and discard the logs it covers.
+        """
+        manager = self._manager
+        next_generation = self._generation + 1
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + ".tmp"
+        
+        with open(tmp_path, "w", encoding="utf-8") as snapshot:
+            header = {"next_id": manager._next_id, "generation": next_generation}
+            snapshot.write(json.dumps(header) + "\n")
+            # Archived tasks are written too; the archive itself does not outlive the process
+            for task in heapq.merge(manager.iter_tasks(), manager.iter_archived(), key=attrgetter("id")):
+                snapshot.write(json.dumps([task.id, task.title, task.description, task.completed],
+                                          ensure_ascii=False, separators=(",", ":")))
+                snapshot.write("\n")
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, path)
+        
+        # Every record so far is now in the snapshot, so older logs can go
+        self._close_log()
+        for generation in self._log_generations():
+            if generation < next_generation:
+                os.remove(self._log_path(generation))
+        self._open_log(next_generation)
+        self._since_snapshot = 0
+    
+    def close(self) -> None:
+        """
+        Flush outstanding records and close the log file.
+        """
+        self.flush()
+        self._close_log()
+    
+    def _load_snapshot(self, manager: "TodoManager") -> int:
+        """
+        Load the snapshot file, if any, into the manager.
+        
+        Args:
+            manager: The TodoManager to populate
+        
+        Returns:
+            The first log generation not covered by the snapshot
+        """
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        
+        lines = self._snapshot_lines(path)
+        header = json.loads(next(lines))
+        for line in lines:
+            task_id, title, description, completed = json.loads(line)
+            manager._insert_task(Task(id=task_id, title=title, description=description,
+                                      completed=completed))
+            manager._enforce_budget()  # A store with a budget never loads more than it allows
+        manager._next_id = header["next_id"]
+        return header["generation"]
+    
+    @staticmethod
+    def _snapshot_lines(path: str) -> Iterator[bytes]:
+        """
+        Yield the lines of a snapshot file, memory-mapping it where possible.
+        
+        Args:
+            path: Path of the snapshot file
+        """
+        with open(path, "rb") as snapshot:
+            try:
+                mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Some platforms and filesystems cannot map files; read normally instead
+                yield from snapshot
+                return
+            with mapped:
+                for line in iter(mapped.readline, b""):
+                    yield line
+    
+    def _read_log(self, generation: int) -> Iterator[list]:
+        """
+        Yield the records of one log generation, stopping at a torn final line.
+        
+        Args:
+            generation: The log generation to read
+        """
+        with open(self._log_path(generation), encoding="utf-8") as log:
+            for line in log:
+                if not line.endswith("\n"):
+                    break  # Incomplete record from an interrupted write
+                yield json.loads(line)
+    
+    @staticmethod
+    def _apply(manager: "TodoManager", record: list) -> None:
+        """
+        Apply one log record to a manager that has no journal attached.
+        
+        Args:
+            manager: The TodoManager being restored
+            record: The record to apply
+        
+        Raises:
+            ValueError: If the record type is unknown, or an add record repeats
+                the ID of a stored task (the journal is corrupt)
+        """
+        op = record[0]
+        if op == OP_ADD:
+            # Tasks restored by undo carry their completion status as a fifth field
+            task_id, title, description = record[1:4]
+            if task_id in manager._tasks or (manager._archive is not None and task_id in manager._archive):
+                raise ValueError(f"Journal adds task {task_id}, which is already stored")
+            completed = len(record) > 4 and record[4]
+            manager._insert_task(Task(id=task_id, title=title, description=description, completed=completed))
+            manager._next_id = max(manager._next_id, task_id + 1)
+        elif op == OP_UPDATE:
+            # Replay the update as logged; records written before updates were
+            # validated must not stop the store from loading
+            _, task_id, title, description = record
+            manager._unarchive((task_id,))
+            task = manager._tasks.get(task_id)
+            if task is not None:
+                manager._set_text(task, title, description)
+        elif op == OP_DELETE:
+            manager.delete_task(record[1])
+        elif op == OP_TOGGLE:
+            manager.toggle_task_status(record[1])
+        elif op == OP_TRANSACTION:
+            for inner in record[1]:
+                Journal._apply(manager, inner)
+        else:
+            raise ValueError(f"Unknown journal record type: {op!r}")
+    
+    def _log_generations(self) -> List[int]:
+        """
+        List the generations of the log files present, in ascending order.
+        """
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith(LOG_PREFIX) and name.endswith(LOG_SUFFIX):
+                number = name[len(LOG_PREFIX):-len(LOG_SUFFIX)]
+                if number.isdigit():
+                    generations.append(int(number))
+        return sorted(generations)
+    
+    def _log_path(self, generation: int) -> str:
+        """
+        Return the path of the log file for a generation.
+        """
+        return os.path.join(self.directory, f"{LOG_PREFIX}{generation}{LOG_SUFFIX}")
+    
+    def _open_log(self, generation: int) -> None:
+        """
+        Start appending to the log file of the given generation.
+        """
+        self._generation = generation
+        self._log = open(self._log_path(generation), "a", encoding="utf-8")
+        self._unsynced = 0
+    
+    def _close_log(self) -> None:
+        """
+        Close the current log file, if open.
+        """
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
+            self._log = None
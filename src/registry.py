@@ -0,0 +1,77 @@
+"""
+Command registry for the Todo In-Memory Python Console App.
+
+Commands register their name, aliases, handler and help text here. The
+CommandHandler builds its dispatch table from the registry, and the help text
+shown by ui.format_welcome_header is generated from it.
+"""
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+
+class CommandSpec(NamedTuple):
+    """
+    Describes one command of the console app.
+    
+    Attributes:
+        name: The primary command name
+        handler: Name of the CommandHandler method that executes the command
+        syntax: How the command is written, as shown in the help text
+        summary: One-line description shown in the help text
+        aliases: Alternative names that dispatch to the same handler
+        details: Extra (syntax, summary) help rows for additional forms of the command
+    """
+    name: str
+    handler: str
+    syntax: str
+    summary: str
+    aliases: Tuple[str, ...] = ()
+    details: Tuple[Tuple[str, str], ...] = ()
+
+
+# Registered commands in help order, and every name or alias mapped to its spec
+COMMANDS: List[CommandSpec] = []
+COMMAND_LOOKUP: Dict[str, CommandSpec] = {}
+
+
+def register_command(name: str, syntax: str, summary: str, aliases: Tuple[str, ...] = (),
+                     details: Tuple[Tuple[str, str], ...] = ()) -> Callable:
+    """
+    Decorator that registers a CommandHandler method as the handler of a command.
+    
+    Args:
+        name: The primary command name
+        syntax: How the command is written, as shown in the help text
+        summary: One-line description shown in the help text
+        aliases: Alternative names for the command (optional)
+        details: Extra (syntax, summary) help rows (optional)
+    
+    Returns:
+        A decorator that records the method and returns it unchanged
+    
+    Raises:
+        ValueError: If the name or one of the aliases is already registered
+    """
+    def decorator(method: Callable) -> Callable:
+        spec = CommandSpec(name, method.__name__, syntax, summary, tuple(aliases), tuple(details))
+        for key in (name, *aliases):
+            if key in COMMAND_LOOKUP:
+                raise ValueError(f"Command '{key}' is already registered")
+        COMMANDS.append(spec)
+        for key in (name, *aliases):
+            COMMAND_LOOKUP[key] = spec
+        return method
+    return decorator
+
+
+def help_rows() -> List[Tuple[str, str]]:
+    """
+    List the (syntax, summary) rows of the help text in registration order.
+    
+    Returns:
+        One row per command, followed by its detail rows
+    """
+    rows = []
+    for spec in COMMANDS:
+        rows.append((spec.syntax, spec.summary))
+        rows.extend(spec.details)
+    return rows
@@ -0,0 +1,158 @@
+"""
+Pluggable renderers that present CommandResult objects.
+
+TableRenderer reproduces the interactive console output, JsonLinesRenderer
+emits one machine-readable JSON object per result, and NullRenderer discards
+everything so commands can be driven with no formatting cost.
+"""
+import sys
+from typing import Optional, TextIO
+from .results import CommandResult, KIND_EVENTS, KIND_EXIT, KIND_HELP, KIND_TASKS, KIND_TEXT
+from .config import TABLE_PAGE_SIZE
+from .ui import RowCache, format_events, format_welcome_header, iter_task_table
+
+
+class Renderer:
+    """
+    Base class for result renderers.
+    
+    Renderers write to the given stream, or to the current sys.stdout when no
+    stream is given, so output redirection keeps working.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize the renderer.
+        
+        Args:
+            stream: The stream to write to (defaults to sys.stdout at render time)
+        """
+        self.stream = stream
+    
+    def render(self, result: CommandResult) -> None:
+        """
+        Present a command result.
+        
+        Args:
+            result: The result to present
+        """
+        raise NotImplementedError
+    
+    def _write(self, text: str) -> None:
+        """
+        Write text to the renderer's stream.
+        """
+        (self.stream or sys.stdout).write(text)
+
+
+class TableRenderer(Renderer):
+    """
+    Renders results as console text with Unicode task tables.
+    
+    Task listings are streamed in tables of at most page_size rows, each
+    written with a single call. With a row_cache, rows formatted for earlier
+    listings are reused; whoever supplies it must invalidate the rows of
+    tasks that change (CommandHandler does this for stores that report changes).
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None, page_size: int = TABLE_PAGE_SIZE,
+                 row_cache: Optional[RowCache] = None):
+        """
+        Initialize the renderer.
+        
+        Args:
+            stream: The stream to write to (defaults to sys.stdout at render time)
+            page_size: The maximum number of rows per rendered table
+            row_cache: Reuses rows formatted by earlier listings (optional)
+        """
+        super().__init__(stream)
+        self.page_size = page_size
+        self.row_cache = row_cache
+    
+    def render(self, result: CommandResult) -> None:
+        """
+        Present a command result as console text.
+        
+        Args:
+            result: The result to present
+        """
+        if result.kind == KIND_TASKS:
+            for page in iter_task_table(result.tasks, self.page_size, self.row_cache):
+                self._write(page)
+            if result.message:
+                self._write(f"{result.message}\n")
+        elif result.kind == KIND_EVENTS:
+            self._write(format_events(result.events) + f"{result.message}\n")
+        elif result.kind == KIND_HELP:
+            self._write(format_welcome_header())
+        elif result.kind in (KIND_EXIT, KIND_TEXT):
+            self._write(f"{result.message}\n")
+        elif result.success:
+            self._write(f"✓ {result.message}\n")
+        else:
+            self._write(f"✗ {result.message}\n")
+
+
+class JsonLinesRenderer(Renderer):
+    """
+    Renders each result as a single line of JSON.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize the renderer, loading the json module only when JSON output is used.
+        
+        Args:
+            stream: The stream to write to (defaults to sys.stdout at render time)
+        """
+        super().__init__(stream)
+        import json
+        self._dumps = json.dumps
+    
+    def render(self, result: CommandResult) -> None:
+        """
+        Present a command result as one JSON object on its own line.
+        
+        Args:
+            result: The result to present
+        """
+        record = {
+            "command": result.command,
+            "success": result.success,
+            "kind": result.kind,
+            "message": result.message,
+        }
+        if result.tasks is not None:
+            record["tasks"] = [
+                {
+                    "id": task.id,
+                    "title": task.title,
+                    "description": task.description,
+                    "completed": task.completed,
+                }
+                for task in result.tasks
+            ]
+        if result.events is not None:
+            record["events"] = [event.to_dict() for event in result.events]
+        self._write(self._dumps(record, ensure_ascii=False) + "\n")
+
+
+class NullRenderer(Renderer):
+    """
+    Discards all results.
+    """
+    
+    def render(self, result: CommandResult) -> None:
+        """
+        Ignore a command result.
+        
+        Args:
+            result: The result to ignore
+        """
+
+
+RENDERERS = {
+    "table": TableRenderer,
+    "jsonl": JsonLinesRenderer,
+    "none": NullRenderer,
+}
@@ -0,0 +1,84 @@
+"""
+Structured command results for the Todo In-Memory Python Console App.
+
+Command handlers return CommandResult objects instead of printing, and a
+renderer (see renderers.py) decides how, or whether, to present them.
+"""
+from typing import TYPE_CHECKING, Iterable, List, Optional
+from .models import Task
+
+if TYPE_CHECKING:
+    from .events import ChangeEvent
+
+
+# Result kinds
+KIND_MESSAGE = "message"  # A success or error message
+KIND_TASKS = "tasks"      # A listing of tasks
+KIND_HELP = "help"        # The help text
+KIND_EXIT = "exit"        # The farewell message; the app stops
+KIND_TEXT = "text"        # A preformatted multi-line report, shown as is
+KIND_EVENTS = "events"    # Change events of the store
+
+
+class CommandResult:
+    """
+    The outcome of executing a single command.
+    
+    Attributes:
+        command: The name of the command that produced the result
+        success: True if the command succeeded, False on a usage or validation error
+        message: A human-readable message (for listings, an optional footer such as page info)
+        kind: One of the KIND_* constants describing what the result carries
+        tasks: The tasks to display, for KIND_TASKS results; may be a lazy iterable
+            that is consumed once when the result is rendered
+        events: The change events to display, for KIND_EVENTS results
+    """
+    
+    __slots__ = ("command", "success", "message", "kind", "tasks", "events")
+    
+    def __init__(self, command: str, success: bool = True, message: str = "", kind: str = KIND_MESSAGE,
+                 tasks: Optional[Iterable[Task]] = None, events: Optional[List["ChangeEvent"]] = None):
+        """
+        Initialize the result; see the class attributes for the meaning of each field.
+        """
+        self.command = command
+        self.success = success
+        self.message = message
+        self.kind = kind
+        self.tasks = tasks
+        self.events = events
+    
+    def __repr__(self) -> str:
+        """
+        Show the result's fields.
+        """
+        return (f"CommandResult(command={self.command!r}, success={self.success!r}, "
+                f"message={self.message!r}, kind={self.kind!r}, tasks={self.tasks!r}, events={self.events!r})")
+    
+    @property
+    def running(self) -> bool:
+        """
+        Whether the app should keep running after this result.
+        """
+        return self.kind != KIND_EXIT
+    
+    @classmethod
+    def ok(cls, command: str, message: str) -> "CommandResult":
+        """
+        Create a successful message result.
+        """
+        return cls(command, True, message)
+    
+    @classmethod
+    def error(cls, command: str, message: str) -> "CommandResult":
+        """
+        Create a failed message result.
+        """
+        return cls(command, False, message)
+    
+    @classmethod
+    def listing(cls, command: str, tasks: Iterable[Task]) -> "CommandResult":
+        """
+        Create a result carrying tasks to display.
+        """
+        return cls(command, True, "", KIND_TASKS, tasks)
@@ -0,0 +1,263 @@
+"""
+asyncio network front-end for the Todo In-Memory Python Console App.
+
+Many clients share one in-memory TodoManager over a simple line protocol: each
+request is one command line, exactly as typed at the interactive prompt, and
+each response is one line of JSON produced by JsonLinesRenderer. Clients may
+pipeline requests; responses come back in request order.
+
+Commands run synchronously on the event loop thread, so writes to the shared
+TodoManager are serialized without locks: no other connection can run while
+a command is executing.
+
+After a successful 'watch', the connection streams every later change event
+as a JSON line of its own ({"seq": ..., "kind": ..., "id": ..., "fields": ...})
+until the client sends another line, which ends the stream and is executed
+as the next command.
+
+Commands that read or write files on the server (SERVER_DISABLED_COMMANDS)
+are refused, and a request line longer than the stream limit is answered
+with an error and ends the connection.
+
+Usage:
+    python -m src.server [--host HOST] [--port PORT | --unix PATH] [--data-dir DIR]
+"""
+import argparse
+import asyncio
+import io
+import json
+import sys
+from typing import List, Optional
+
+from .commands import CommandHandler
+from .config import SERVER_DISABLED_COMMANDS, SERVER_HOST, SERVER_PORT, SERVER_WRITE_HIGH_WATER
+from .renderers import JsonLinesRenderer
+from .results import KIND_EVENTS, CommandResult
+from .todo_manager import TodoManager
+
+
+class TodoServer:
+    """
+    Serves the command protocol for a shared TodoManager.
+    """
+    
+    def __init__(self, todo_manager: TodoManager, high_water: int = SERVER_WRITE_HIGH_WATER):
+        """
+        Initialize the server.
+        
+        Args:
+            todo_manager: The TodoManager shared by all connections
+            high_water: Bytes of unsent responses a connection may buffer before
+                it stops reading requests until the client catches up
+        """
+        self.todo_manager = todo_manager
+        self.high_water = high_water
+        self.connections = 0
+        self.commands = 0
+    
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Execute the commands sent on one connection until it closes or exits.
+        
+        Args:
+            reader: The connection's request stream
+            writer: The connection's response stream
+        """
+        self.connections += 1
+        output = io.StringIO()
+        handler = CommandHandler(self.todo_manager, JsonLinesRenderer(output),
+                                 disabled_commands=SERVER_DISABLED_COMMANDS)
+        transport = writer.transport
+        
+        pending = None  # A request that arrived while events were streaming
+        
+        try:
+            while True:
+                try:
+                    line = pending if pending is not None else await reader.readline()
+                except ValueError:
+                    self.reject_line(handler, writer)
+                    break
+                pending = None
+                if not line:
+                    break
+                
+                user_input = line.decode("utf-8", errors="replace").strip()
+                if not user_input:
+                    continue
+                
+                command, args = handler.parse_command(user_input)
+                result = handler.run_command(command, args)
+                handler.renderer.render(result)
+                running = result.running
+                self.commands += 1
+                
+                writer.write(output.getvalue().encode("utf-8"))
+                output.seek(0)
+                output.truncate()
+                
+                # Only wait for the client when it is falling behind; pipelined
+                # requests otherwise keep flowing without a round trip each
+                if transport.get_write_buffer_size() > self.high_water:
+                    await writer.drain()
+                
+                if result.kind == KIND_EVENTS and result.success:
+                    try:
+                        pending = await self.stream_events(reader, writer, handler)
+                    except ValueError:
+                        self.reject_line(handler, writer)
+                        break
+                    if not pending:
+                        break
+                
+                if not running:
+                    break
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            handler.discard_transaction()
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    @staticmethod
+    def reject_line(handler: CommandHandler, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer a request line longer than the stream limit with an error response.
+        
+        The rest of such a line cannot be told apart from the next request, so
+        the connection is closed after the response is sent.
+        
+        Args:
+            handler: The connection's handler, whose renderer formats the response
+            writer: The connection's response stream
+        """
+        output = handler.renderer.stream
+        handler.renderer.render(CommandResult.error("", "Request line too long; closing the connection"))
+        writer.write(output.getvalue().encode("utf-8"))
+        output.seek(0)
+        output.truncate()
+    
+    async def stream_events(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            handler: CommandHandler) -> bytes:
+        """
+        Write each change event published after the handler's last watch until the client sends a line.
+        
+        Args:
+            reader: The connection's request stream
+            writer: The connection's response stream
+            handler: The connection's handler; its watch_seq follows the events sent
+            
+        Returns:
+            The line that ended the stream, or b"" if the connection closed
+        
+        Raises:
+            ValueError: If the line that ended the stream is longer than the stream limit
+        """
+        events = self.todo_manager.events
+        queue = events.subscribe_queue(handler.watch_seq)
+        request = asyncio.ensure_future(reader.readline())
+        try:
+            while True:
+                change = asyncio.ensure_future(queue.get())
+                await asyncio.wait((request, change), return_when=asyncio.FIRST_COMPLETED)
+                if not change.done():
+                    change.cancel()
+                    return request.result()
+                
+                # Send everything queued so far in one write
+                batch = [change.result()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                writer.write("".join(json.dumps(event.to_dict(), ensure_ascii=False) + "\n"
+                                     for event in batch).encode("utf-8"))
+                handler.watch_seq = batch[-1].seq
+                if writer.transport.get_write_buffer_size() > self.high_water:
+                    await writer.drain()
+        finally:
+            events.unsubscribe_queue(queue)
+            if not request.done():
+                request.cancel()
+    
+    async def start(self, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """
+        Start listening on a TCP address or, if path is given, a Unix socket.
+        
+        Args:
+            host: The TCP host to bind
+            port: The TCP port to bind (0 picks a free port)
+            path: The Unix socket path to bind instead of TCP (optional)
+            
+        Returns:
+            The started asyncio server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command-line options of the server.
+    
+    Args:
+        argv: The arguments to parse (defaults to sys.argv[1:])
+        
+    Returns:
+        The parsed options
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.server",
+                                     description="Serve the todo command protocol over the network")
+    parser.add_argument("--host", default=SERVER_HOST, help=f"TCP host to bind (default: {SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"TCP port to bind (default: {SERVER_PORT})")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket at PATH instead of TCP")
+    parser.add_argument("--data-dir", metavar="DIR",
+                        help="persist tasks in DIR with a journal and restore them on startup")
+    return parser.parse_args(argv)
+
+
+async def serve(options: argparse.Namespace, todo_manager: TodoManager) -> None:
+    """
+    Run the server until it is cancelled.
+    
+    Args:
+        options: The parsed command-line options
+        todo_manager: The TodoManager to serve
+    """
+    server = await TodoServer(todo_manager).start(options.host, options.port, options.unix)
+    address = options.unix or f"{options.host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Serving todo commands on {address}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Run the network server for the Todo In-Memory Python Console App.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    options = parse_arguments(argv)
+    journal = None
+    if options.data_dir:
+        from .persistence import Journal
+        journal = Journal(options.data_dir)
+    todo_manager = TodoManager(journal)
+    
+    try:
+        asyncio.run(serve(options, todo_manager))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+"""
+Sharded TodoManager for the Todo In-Memory Python Console App.
+
+ShardedTodoManager spreads tasks over a pool of worker processes, each owning
+an ordinary TodoManager. Tasks are partitioned by hashing their ID (ID modulo
+the shard count), so every shard holds a similar slice of the store. IDs are
+still allocated centrally in the parent process and stay globally unique.
+
+Single-task operations go to the one shard that owns the ID. Scans, searches
+and filtered listings are sent to every shard at once and run in parallel; the
+per-shard results, each already in ID order, are merged in the parent.
+"""
+import heapq
+import multiprocessing
+import os
+from itertools import islice
+from multiprocessing.connection import Connection
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import ARCHIVE_MAX_BYTES, ARCHIVE_MAX_TASKS, FIND_DEFAULT_LIMIT, TRANSFER_CHUNK_SIZE
+from .models import Task
+from .todo_manager import SORT_ID, SORT_KEYS, SORT_TITLE, FindQuery, TaskSelector, TodoManager, check_sort_window, tasks_from_items
+from .transfer import ImportReport, build_tasks, read_tasks, write_tasks
+
+
+_task_id = attrgetter("id")
+
+
+class _RemoteError:
+    """
+    Carries an exception raised inside a shard back to the parent process.
+    """
+    
+    def __init__(self, error: BaseException):
+        """
+        Args:
+            error: The exception raised by the shard
+        """
+        self.error = error
+
+
+def _shard_worker(connection: Connection) -> None:
+    """
+    Serve TodoManager method calls for one shard until told to stop.
+    
+    Each request is a (method name, args) tuple; None stops the worker. The
+    extra 'insert_many' request stores tasks that already carry their IDs.
+    
+    Args:
+        connection: The worker's end of the pipe to the parent process
+    """
+    manager = TodoManager(max_tasks=None, max_bytes=None)  # The parent sends each shard its share of the budget
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        
+        name, args = request
+        try:
+            if name == "insert_many":
+                for task in args[0]:
+                    manager._insert_task(task)
+                manager._enforce_budget()
+                result = None
+            else:
+                result = getattr(manager, name)(*args)
+        except Exception as error:
+            result = _RemoteError(error)
+        connection.send(result)
+    connection.close()
+
+
+class ShardedTodoManager:
+    """
+    A TodoManager facade whose tasks live in several worker processes.
+    
+    It offers the same task operations as TodoManager. Predicate selectors for
+    the bulk methods are sent to the workers, so they must be picklable
+    (module-level functions or instances of module-level classes).
+    """
+    
+    def __init__(self, shards: Optional[int] = None, max_tasks: Optional[int] = ARCHIVE_MAX_TASKS,
+                 max_bytes: Optional[int] = ARCHIVE_MAX_BYTES):
+        """
+        Start the shard worker processes.
+        
+        Args:
+            shards: The number of shards (defaults to the number of CPUs)
+            max_tasks: The number of tasks to keep in memory across all shards (see set_budget; None for no limit)
+            max_bytes: The approximate memory to keep tasks in across all shards (see set_budget; None for no limit)
+        """
+        count = shards or os.cpu_count() or 1
+        self._connections: List[Connection] = []
+        self._processes = []
+        for _ in range(count):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_end,), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+        self._next_id: int = 1
+        self._budget: Tuple[Optional[int], Optional[int]] = (None, None)
+        if max_tasks is not None or max_bytes is not None:
+            self.set_budget(max_tasks, max_bytes)
+    
+    def __len__(self) -> int:
+        """
+        Return the number of tasks stored across all shards.
+        """
+        return sum(self._broadcast("__len__"))
+    
+    def __enter__(self) -> "ShardedTodoManager":
+        """
+        Use the manager as a context manager that stops the workers on exit.
+        """
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stop the worker processes.
+        """
+        self.close()
+    
+    @property
+    def shard_count(self) -> int:
+        """
+        The number of shards tasks are partitioned over.
+        """
+        return len(self._connections)
+    
+    def close(self) -> None:
+        """
+        Stop the worker processes. The manager cannot be used afterwards.
+        """
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+    
+    def add_task(self, title: str, description: str = "") -> Task:
+        """
+        Add a new task with the given title and description.
+        
+        Args:
+            title: The title of the task
+            description: The description of the task (optional)
+        
+        Returns:
+            The newly created Task object
+        
+        Raises:
+            ValueError: If the title is empty or exceeds length limits
+        """
+        task = Task(id=self._next_id, title=title, description=description, completed=False)
+        self._call(self._shard_of(task.id), "insert_many", [task])
+        self._next_id += 1
+        return task
+    
+    def add_many(self, items: Iterable[Sequence[str]]) -> List[Task]:
+        """
+        Add several tasks at once; either all of them are added or none are.
+        
+        Args:
+            items: (title,) or (title, description) sequences, one per task
+        
+        Returns:
+            The newly created Task objects, in ID order
+        
+        Raises:
+            ValueError: If any title is empty or any field exceeds length limits
+        """
+        tasks = tasks_from_items(self._next_id, items)
+        
+        self._store(tasks)
+        self._next_id += len(tasks)
+        return tasks
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Retrieve a task by its ID.
+        
+        Args:
+            task_id: The ID of the task to retrieve
+        
+        Returns:
+            The Task object if found, None otherwise
+        """
+        return self._call(self._shard_of(task_id), "get_task", task_id)
+    
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Retrieve all tasks.
+        
+        Returns:
+            A list of all Task objects, sorted by ID
+        """
+        return self._merge(self._broadcast("get_all_tasks"))
+    
+    def iter_tasks(self, start_id: Optional[int] = None, end_id: Optional[int] = None) -> Iterator[Task]:
+        """
+        Iterate over tasks in ID order, optionally limited to an ID range.
+        
+        Args:
+            start_id: The smallest task ID to include (optional, inclusive)
+            end_id: The largest task ID to include (optional, inclusive)
+        
+        Returns:
+            An iterator of Task objects, sorted by ID
+        """
+        low = 0 if start_id is None else start_id
+        high = self._next_id if end_id is None else end_id
+        return iter(self.get_tasks_in_range(low, high))
+    
+    def get_tasks_in_range(self, start_id: int, end_id: int) -> List[Task]:
+        """
+        Retrieve all tasks whose IDs fall between start_id and end_id.
+        
+        Args:
+            start_id: The smallest task ID to include (inclusive)
+            end_id: The largest task ID to include (inclusive)
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._merge(self._broadcast("get_tasks_in_range", start_id, end_id))
+    
+    def get_page(self, page: int, page_size: int) -> List[Task]:
+        """
+        Retrieve one page of tasks in ID order.
+        
+        Each shard returns at most the first page * page_size of its tasks,
+        which is enough to assemble the requested page.
+        
+        Args:
+            page: The page number, starting from 1
+            page_size: The number of tasks per page
+        
+        Returns:
+            A list of up to page_size Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If page or page_size is less than 1
+        """
+        if page < 1:
+            raise ValueError("Page number must be at least 1")
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        
+        heads = self._broadcast("get_page", 1, page * page_size)
+        merged = heapq.merge(*heads, key=_task_id)
+        return list(islice(merged, (page - 1) * page_size, page * page_size))
+    
+    def get_tasks_by_status(self, completed: bool) -> List[Task]:
+        """
+        Retrieve all tasks with the given completion status.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._merge(self._broadcast("get_tasks_by_status", completed))
+    
+    def count_by_status(self, completed: bool) -> int:
+        """
+        Count the tasks with the given completion status on every shard.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+        
+        Returns:
+            The number of matching tasks
+        """
+        return sum(self._broadcast("count_by_status", completed))
+    
+    def get_sorted(self, sort: str = SORT_ID, descending: bool = False, start: int = 0,
+                   count: Optional[int] = None, completed: Optional[bool] = None) -> List[Task]:
+        """
+        Retrieve tasks in ID, title or status order, optionally only those with one status.
+        
+        Each shard returns at most the first start + count tasks of its own
+        order, which is enough to assemble the requested window.
+        
+        Args:
+            sort: One of SORT_KEYS
+            descending: True to list the order from its end
+            start: The number of tasks to skip (0 to start at the first)
+            count: The maximum number of tasks to return (None for all)
+            completed: True for completed tasks only, False for open tasks only
+                (None for all tasks)
+        
+        Returns:
+            A list of Task objects in the requested order
+        
+        Raises:
+            ValueError: If sort is not a known order, or start or count is negative
+        """
+        check_sort_window(sort, start, count)
+        
+        stop = None if count is None else start + count
+        heads = self._broadcast("get_sorted", sort, descending, 0, stop, completed)
+        merged = heapq.merge(*heads, key=SORT_KEYS[sort], reverse=descending)
+        return list(islice(merged, start, stop))
+    
+    def search_tasks(self, query: str) -> List[Task]:
+        """
+        Find tasks whose title or description contains every word of the query.
+        
+        Args:
+            query: One or more words to search for
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._merge(self._broadcast("search_tasks", query))
+    
+    def find_tasks(self, fragment: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles best match a fragment, tolerating typos.
+        
+        Each shard returns its own best matches, which are merged by rank.
+        
+        Args:
+            fragment: Part of a title, possibly misspelled
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, best match first (see FindQuery)
+        """
+        query = FindQuery(fragment)
+        results = self._broadcast("find_tasks", fragment, limit)
+        return list(islice(heapq.merge(*results, key=query.rank), limit))
+    
+    def find_by_prefix(self, prefix: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles begin with a prefix, ignoring case.
+        
+        Args:
+            prefix: The beginning of a title
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, in title order
+        """
+        results = self._broadcast("find_by_prefix", prefix, limit)
+        return list(islice(heapq.merge(*results, key=SORT_KEYS[SORT_TITLE]), limit))
+    
+    def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
+        """
+        Update the title and/or description of a task by its ID.
+        
+        Args:
+            task_id: The ID of the task to update
+            title: The new title (optional)
+            description: The new description (optional)
+        
+        Returns:
+            True if the task was updated, False if the task ID doesn't exist
+        
+        Raises:
+            ValueError: If the new title is empty or either field exceeds length limits
+        """
+        return self._call(self._shard_of(task_id), "update_task", task_id, title, description)
+    
+    def delete_task(self, task_id: int) -> bool:
+        """
+        Delete a task by its ID.
+        
+        Args:
+            task_id: The ID of the task to delete
+        
+        Returns:
+            True if the task was deleted, False if the task ID doesn't exist
+        """
+        return self._call(self._shard_of(task_id), "delete_task", task_id)
+    
+    def toggle_task_status(self, task_id: int) -> bool:
+        """
+        Toggle the completion status of a task by its ID.
+        
+        Args:
+            task_id: The ID of the task to toggle
+        
+        Returns:
+            True if the task status was toggled, False if the task ID doesn't exist
+        """
+        return self._call(self._shard_of(task_id), "toggle_task_status", task_id)
+    
+    def delete_many(self, selector: TaskSelector) -> int:
+        """
+        Delete every task matched by a selector, on all shards in parallel.
+        
+        Args:
+            selector: A range of IDs, a list of ranges, an iterable of IDs, or a picklable predicate on tasks
+        
+        Returns:
+            The number of tasks deleted
+        """
+        return sum(self._broadcast("delete_many", self._portable(selector)))
+    
+    def toggle_many(self, selector: TaskSelector) -> int:
+        """
+        Toggle every task matched by a selector, on all shards in parallel.
+        
+        Args:
+            selector: A range of IDs, a list of ranges, an iterable of IDs, or a picklable predicate on tasks
+        
+        Returns:
+            The number of tasks toggled
+        """
+        return sum(self._broadcast("toggle_many", self._portable(selector)))
+    
+    def import_tasks(self, path: str, fmt: Optional[str] = None,
+                     chunk_size: int = TRANSFER_CHUNK_SIZE) -> ImportReport:
+        """
+        Add the tasks stored in a CSV, JSON Lines or binary file.
+        
+        Each validated chunk is partitioned and sent to the shards in parallel.
+        
+        Args:
+            path: The file to import
+            fmt: 'csv', 'jsonl' or 'bin' (optional, inferred from the file extension)
+            chunk_size: The number of rows validated and stored together
+        
+        Returns:
+            An ImportReport with the number of imported and rejected rows
+        
+        Raises:
+            ValueError: If the format is unknown or the file is not in that format
+            OSError: If the file cannot be read
+        """
+        report = ImportReport()
+        for chunk in read_tasks(path, report, fmt, chunk_size):
+            tasks = build_tasks(chunk, self._next_id, report)
+            self._store(tasks)
+            self._next_id += len(tasks)
+            report.imported += len(tasks)
+        return report
+    
+    def export_tasks(self, path: str, fmt: Optional[str] = None) -> int:
+        """
+        Write every task, in ID order, to a CSV, JSON Lines or binary file.
+        
+        Args:
+            path: The file to write; it is replaced only once the export is complete
+            fmt: 'csv', 'jsonl' or 'bin' (optional, inferred from the file extension)
+        
+        Returns:
+            The number of tasks exported
+        
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the file cannot be written
+        """
+        return write_tasks(path, heapq.merge(self.get_all_tasks(), self.get_archived(), key=_task_id), fmt)
+    
+    def set_budget(self, max_tasks: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Limit the tasks kept in memory, archiving completed tasks past the limit (see TodoManager.set_budget).
+        
+        Each shard gets an equal share of the budget.
+        
+        Args:
+            max_tasks: The number of tasks to keep in memory (None for no limit)
+            max_bytes: The approximate memory of the tasks and indexes kept in memory (None for no limit)
+        
+        Returns:
+            The number of tasks archived to get within the new budget
+        
+        Raises:
+            ValueError: If a limit is less than 1
+        """
+        for name, limit in (("max_tasks", max_tasks), ("max_bytes", max_bytes)):
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} must be at least 1")
+        
+        count = len(self._connections)
+        shares = [None if limit is None else -(-limit // count) for limit in (max_tasks, max_bytes)]
+        archived = sum(self._broadcast("set_budget", *shares))
+        self._budget = (max_tasks, max_bytes)
+        return archived
+    
+    @property
+    def budget(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        The memory budget across all shards as (max_tasks, max_bytes), None standing for no limit.
+        """
+        return self._budget
+    
+    def archived_count(self) -> int:
+        """
+        Return the number of archived tasks across all shards.
+        """
+        return sum(self._broadcast("archived_count"))
+    
+    def get_archived(self, start: int = 0, count: Optional[int] = None) -> List[Task]:
+        """
+        Retrieve archived tasks in ID order, leaving them archived.
+        
+        Each shard returns at most its first start + count archived tasks,
+        which is enough to assemble the requested window.
+        
+        Args:
+            start: The number of archived tasks to skip (0 to start at the lowest ID)
+            count: The maximum number of tasks to return (None for all)
+        
+        Returns:
+            A list of archived Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If start or count is negative
+        """
+        check_sort_window(SORT_ID, start, count)
+        stop = None if count is None else start + count
+        heads = self._broadcast("get_archived", 0, stop)
+        return list(islice(heapq.merge(*heads, key=_task_id), start, stop))
+    
+    def _store(self, tasks: List[Task]) -> None:
+        """
+        Send new tasks, which already carry their IDs, to the shards that own them.
+        """
+        batches: Dict[int, List[Task]] = {}
+        for task in tasks:
+            batches.setdefault(self._shard_of(task.id), []).append(task)
+        self._scatter({shard: ("insert_many", (batch,)) for shard, batch in batches.items()})
+    
+    def _shard_of(self, task_id: int) -> int:
+        """
+        Return the index of the shard that owns a task ID.
+        """
+        return task_id % len(self._connections)
+    
+    @staticmethod
+    def _portable(selector: TaskSelector) -> TaskSelector:
+        """
+        Turn one-shot iterables of IDs into a list so they can be sent to every shard.
+        """
+        if isinstance(selector, range) or callable(selector):
+            return selector
+        return list(selector)
+    
+    @staticmethod
+    def _merge(results: List[List[Task]]) -> List[Task]:
+        """
+        Merge per-shard task lists that are each sorted by ID.
+        """
+        return list(heapq.merge(*results, key=_task_id))
+    
+    def _call(self, shard: int, name: str, *args) -> Any:
+        """
+        Call a method on one shard and wait for its result.
+        """
+        return self._scatter({shard: (name, args)})[shard]
+    
+    def _broadcast(self, name: str, *args) -> List[Any]:
+        """
+        Call the same method on every shard in parallel and collect the results in shard order.
+        """
+        results = self._scatter({shard: (name, args) for shard in range(len(self._connections))})
+        return [results[shard] for shard in range(len(self._connections))]
+    
+    def _scatter(self, requests: Dict[int, tuple]) -> Dict[int, Any]:
+        """
+        Send requests to several shards, then gather all of their results.
+        
+        Every request is sent before any result is awaited, so the shards work
+        concurrently.
+        
+        Args:
+            requests: Maps shard index to a (method name, args) request
+        
+        Returns:
+            Maps shard index to the result of its request
+        
+        Raises:
+            Exception: The first error raised by any shard, after all results arrived
+        """
+        for shard, request in requests.items():
+            self._connections[shard].send(request)
+        
+        results = {shard: self._connections[shard].recv() for shard in requests}
+        for result in results.values():
+            if isinstance(result, _RemoteError):
+                raise result.error
+        return results
@@ -0,0 +1,231 @@
+"""
+A sorted set of keys with positional access, used for ordered listings.
+
+Keys are kept in a list of sorted chunks of bounded size, together with the
+largest key of each chunk. Adding or removing a key bisects the list of
+maxima to find its chunk and then inserts into or deletes from that chunk
+alone, so a change moves at most a chunk's worth of references instead of
+shifting a list the size of the store. Locating a position takes one C-level
+pass over the chunk sizes (n / chunk size entries) and a bisect; reading k
+keys from there slices at most a few chunks.
+"""
+import bisect
+from itertools import accumulate, chain
+from typing import Iterable, Iterator, List, Tuple
+
+from .config import SORT_INDEX_CHUNK_SIZE
+
+
+class SortedIndex:
+    """
+    Keeps keys in ascending order and reads them back by position.
+    
+    Keys must be distinct and mutually comparable; the indexes of the store
+    make them so by ending each key with the task ID. The index is not
+    thread-safe: writers must be serialized, and a read that overlaps a write
+    may see a mix of both states (it never raises for that reason, so
+    optimistic readers can validate and retry).
+    """
+    
+    def __init__(self, keys: Iterable = (), chunk_size: int = SORT_INDEX_CHUNK_SIZE):
+        """
+        Initialize the index.
+        
+        Args:
+            keys: Initial keys, in any order
+            chunk_size: The number of keys per chunk after a rebuild; chunks
+                are split once they grow to twice this size
+        """
+        self._chunk_size = chunk_size
+        self._chunks: List[list] = []
+        self._maxes: list = []  # The last (largest) key of each chunk
+        self._len = 0
+        self._rebuild(sorted(keys))
+    
+    def __len__(self) -> int:
+        """
+        Return the number of keys in the index.
+        """
+        return self._len
+    
+    def __iter__(self) -> Iterator:
+        """
+        Iterate over the keys in ascending order.
+        
+        The index must not be modified while the iterator is being consumed.
+        """
+        return chain.from_iterable(self._chunks)
+    
+    def __reversed__(self) -> Iterator:
+        """
+        Iterate over the keys in descending order.
+        
+        The index must not be modified while the iterator is being consumed.
+        """
+        return chain.from_iterable(map(reversed, reversed(self._chunks)))
+    
+    def add(self, key) -> None:
+        """
+        Insert one key.
+        
+        Args:
+            key: The key to insert; it must not already be in the index
+        """
+        maxes = self._maxes
+        if not maxes:
+            self._chunks.append([key])
+            maxes.append(key)
+        else:
+            i = bisect.bisect_right(maxes, key)
+            if i == len(maxes):
+                # Beyond every key: extend the last chunk
+                i -= 1
+                self._chunks[i].append(key)
+                maxes[i] = key
+            else:
+                bisect.insort(self._chunks[i], key)
+            if len(self._chunks[i]) >= 2 * self._chunk_size:
+                self._split(i)
+        self._len += 1
+    
+    def remove(self, key) -> None:
+        """
+        Remove one key.
+        
+        Args:
+            key: A key that is in the index
+        
+        Raises:
+            KeyError: If the key is not in the index
+        """
+        maxes = self._maxes
+        i = bisect.bisect_left(maxes, key)
+        if i < len(maxes):
+            chunk = self._chunks[i]
+            j = bisect.bisect_left(chunk, key)
+            if j < len(chunk) and chunk[j] == key:
+                del chunk[j]
+                self._len -= 1
+                if not chunk:
+                    del self._chunks[i]
+                    del maxes[i]
+                elif j == len(chunk):
+                    maxes[i] = chunk[-1]
+                return
+        raise KeyError(key)
+    
+    def update(self, keys: Iterable) -> None:
+        """
+        Insert several keys, rebuilding the chunks in one sort when there are many.
+        
+        Args:
+            keys: The keys to insert, in any order; none may already be in the index
+        """
+        keys = list(keys)
+        if len(keys) * 8 > self._len:
+            self._rebuild(sorted(chain(self, keys)))
+        else:
+            for key in keys:
+                self.add(key)
+    
+    def remove_many(self, keys: Iterable) -> None:
+        """
+        Remove several keys, rebuilding the chunks in one pass when there are many.
+        
+        Args:
+            keys: Distinct keys that are all in the index
+        
+        Raises:
+            KeyError: If a key is not in the index; with many keys the index
+                is then left unchanged
+        """
+        keys = list(keys)
+        if len(keys) * 8 <= self._len:
+            for key in keys:
+                self.remove(key)
+            return
+        
+        gone = set(keys)
+        kept = [key for key in self if key not in gone]
+        if len(kept) != self._len - len(gone):
+            raise KeyError(next(key for key in gone if not self._contains(key)))
+        self._rebuild(kept)
+    
+    def slice(self, start: int, stop: int) -> list:
+        """
+        Return the keys at positions start to stop, like list slicing with non-negative bounds.
+        
+        Args:
+            start: The position of the first key (0 for the smallest)
+            stop: The position after the last key
+        
+        Returns:
+            The keys in ascending order
+        """
+        stop = min(stop, self._len)
+        if start >= stop:
+            return []
+        if start == 0 and stop == self._len:
+            return list(self)
+        
+        i, j = self._locate(start)
+        keys = []
+        wanted = stop - start
+        for chunk in self._chunks[i:]:
+            keys.extend(chunk[j:j + wanted - len(keys)])
+            if len(keys) >= wanted:
+                break
+            j = 0
+        return keys
+    
+    def bisect_left(self, key) -> int:
+        """
+        Return the position at which key would be inserted, before any equal key.
+        
+        Args:
+            key: A key comparable with the keys of the index
+        
+        Returns:
+            The number of keys smaller than key
+        """
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return sum(map(len, self._chunks[:i])) + bisect.bisect_left(self._chunks[i], key)
+    
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """
+        Translate a position into (chunk index, index within the chunk).
+        """
+        offsets = list(accumulate(map(len, self._chunks), initial=0))
+        i = bisect.bisect_right(offsets, position) - 1
+        return i, position - offsets[i]
+    
+    def _contains(self, key) -> bool:
+        """
+        Check whether a key is in the index.
+        """
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        chunk = self._chunks[i]
+        j = bisect.bisect_left(chunk, key)
+        return j < len(chunk) and chunk[j] == key
+    
+    def _split(self, i: int) -> None:
+        """
+        Split an oversized chunk into two halves.
+        """
+        chunk = self._chunks[i]
+        half = len(chunk) // 2
+        self._chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+        self._maxes.insert(i, chunk[half - 1])
+    
+    def _rebuild(self, keys: list) -> None:
+        """
+        Replace the contents with already sorted keys, cut into full chunks.
+        """
+        size = self._chunk_size
+        self._chunks = [keys[start:start + size] for start in range(0, len(keys), size)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
@@ -0,0 +1,446 @@
+"""
+Thread-safe TodoManager for the Todo In-Memory Python Console App.
+
+ConcurrentTodoManager lets many threads share one store:
+
+- Writers are serialized by a single lock, which also makes ID allocation atomic.
+- Every write bumps a version counter to an odd value before it starts and back
+  to an even value when it finishes (a sequence lock). Readers run without the
+  lock and simply retry if the version changed underneath them, so listings and
+  searches never block writers.
+- A transaction holds the write lock from begin to commit or rollback and keeps
+  the version odd throughout, so other threads wait for it to finish instead of
+  seeing its changes half made.
+- Full listings and iteration are served from an immutable snapshot of the
+  store that is rebuilt at most once per version; ranges, pages, filters and
+  searches read just the tasks they return. Tasks are copied on write, so a
+  Task object that was read never changes afterwards.
+"""
+import bisect
+import copy
+import threading
+from functools import wraps
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from .config import ARCHIVE_MAX_BYTES, ARCHIVE_MAX_TASKS, FIND_DEFAULT_LIMIT
+from .events import ChangeFeed
+from .models import Task
+from .todo_manager import SORT_ID, TodoManager
+
+if TYPE_CHECKING:
+    from .persistence import Journal
+
+
+T = TypeVar("T")
+
+# Lock-free attempts a reader makes before falling back to the write lock
+OPTIMISTIC_READ_ATTEMPTS = 8
+
+
+class _Snapshot(NamedTuple):
+    """
+    An immutable view of the store at one version.
+    """
+    version: int
+    ids: Tuple[int, ...]
+    tasks: Tuple[Task, ...]
+
+
+def _writes(method: Callable) -> Callable:
+    """
+    Wrap a TodoManager mutator so it runs under the write lock and bumps the version.
+    
+    Args:
+        method: The unbound TodoManager method to wrap
+    
+    Returns:
+        The wrapped method
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            self._start_write()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._finish_write()
+    return wrapper
+
+
+class ConcurrentTodoManager(TodoManager):
+    """
+    A TodoManager that may be shared between threads.
+    
+    The API is the same as TodoManager. Tasks are replaced rather than modified
+    in place, so a Task returned earlier keeps the values it had when it was read;
+    call get_task again to observe later changes.
+    """
+    
+    def __init__(self, journal: Optional["Journal"] = None, max_tasks: Optional[int] = ARCHIVE_MAX_TASKS,
+                 max_bytes: Optional[int] = ARCHIVE_MAX_BYTES):
+        """
+        Initialize the manager with its lock, an empty snapshot and a change feed that shares the lock.
+        
+        Args:
+            journal: A Journal to restore from and log mutations to (optional)
+            max_tasks: The number of tasks to keep in memory (see TodoManager.set_budget; None for no limit)
+            max_bytes: The approximate memory to keep tasks in (see TodoManager.set_budget; None for no limit)
+        """
+        self._write_lock = threading.RLock()
+        self._version = 0
+        self._writes_open = 0  # Writes and transactions in progress on the lock-holding thread
+        self._snapshot: Optional[_Snapshot] = None
+        super().__init__(journal, max_tasks, max_bytes)
+    
+    add_task = _writes(TodoManager.add_task)
+    add_many = _writes(TodoManager.add_many)
+    update_task = _writes(TodoManager.update_task)
+    delete_task = _writes(TodoManager.delete_task)
+    delete_many = _writes(TodoManager.delete_many)
+    toggle_task_status = _writes(TodoManager.toggle_task_status)
+    toggle_many = _writes(TodoManager.toggle_many)
+    import_tasks = _writes(TodoManager.import_tasks)
+    undo = _writes(TodoManager.undo)
+    redo = _writes(TodoManager.redo)
+    set_history_limits = _writes(TodoManager.set_history_limits)
+    clear_history = _writes(TodoManager.clear_history)
+    set_budget = _writes(TodoManager.set_budget)
+    
+    def begin(self) -> None:
+        """
+        Open a transaction, holding the write lock until it is committed or rolled back.
+        
+        Other threads' writes, and reads that cannot complete without the lock,
+        wait until then. commit and rollback must be called on the same thread.
+        
+        Raises:
+            RuntimeError: If a transaction is already open
+        """
+        self._write_lock.acquire()
+        try:
+            TodoManager.begin(self)
+        except BaseException:
+            self._write_lock.release()
+            raise
+        self._start_write()
+    
+    def commit(self) -> int:
+        """
+        Close the open transaction, keeping its changes, and release the write lock.
+        
+        Returns:
+            The number of changes committed
+        
+        Raises:
+            RuntimeError: If no transaction is open
+        """
+        with self._write_lock:
+            changes = TodoManager.commit(self)
+            self._finish_write()
+            self._write_lock.release()
+            return changes
+    
+    def rollback(self) -> int:
+        """
+        Close the open transaction, reversing its changes, and release the write lock.
+        
+        Returns:
+            The number of changes rolled back
+        
+        Raises:
+            RuntimeError: If no transaction is open
+        """
+        with self._write_lock:
+            changes = TodoManager.rollback(self)
+            self._finish_write()
+            self._write_lock.release()
+            return changes
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """
+        Retrieve a task by its ID without blocking writers.
+        
+        Tasks in memory are read directly; a miss is retried as a consistent
+        read, as the task may be moving into or out of the archive.
+        
+        Args:
+            task_id: The ID of the task to retrieve
+        
+        Returns:
+            The Task object if found, None otherwise
+        """
+        task = self._tasks.get(task_id)
+        if task is not None or self._archive is None:
+            return task
+        return self._read(lambda: TodoManager.get_task(self, task_id))
+    
+    def get_archived(self, start: int = 0, count: Optional[int] = None) -> List[Task]:
+        """
+        Retrieve archived tasks in ID order without blocking writers.
+        
+        Args:
+            start: The number of archived tasks to skip (0 to start at the lowest ID)
+            count: The maximum number of tasks to return (None for all)
+        
+        Returns:
+            A list of archived Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If start or count is negative
+        """
+        return self._read(lambda: TodoManager.get_archived(self, start, count))
+    
+    def export_tasks(self, path: str, fmt: Optional[str] = None) -> int:
+        """
+        Write every task, in ID order, to a CSV, JSON Lines or binary file.
+        
+        The export holds the write lock, so it sees one state of both the
+        resident and the archived tasks; retrying a whole file write after
+        every conflicting write could keep it from ever finishing.
+        
+        Args:
+            path: The file to write; it is replaced only once the export is complete
+            fmt: 'csv', 'jsonl' or 'bin' (optional, inferred from the file extension)
+        
+        Returns:
+            The number of tasks exported
+        
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the file cannot be written
+        """
+        with self._write_lock:
+            return TodoManager.export_tasks(self, path, fmt)
+    
+    def get_all_tasks(self) -> List[Task]:
+        """
+        Retrieve all tasks from the current snapshot.
+        
+        Returns:
+            A list of all Task objects, sorted by ID
+        """
+        return list(self._current_snapshot().tasks)
+    
+    def iter_tasks(self, start_id: Optional[int] = None, end_id: Optional[int] = None) -> Iterator[Task]:
+        """
+        Iterate over tasks in ID order from the current snapshot.
+        
+        Unlike TodoManager.iter_tasks, the store may be modified while the
+        iterator is being consumed; the iterator keeps showing the snapshot.
+        
+        Args:
+            start_id: The smallest task ID to include (optional, inclusive)
+            end_id: The largest task ID to include (optional, inclusive)
+        
+        Returns:
+            An iterator of Task objects, sorted by ID
+        """
+        snapshot = self._current_snapshot()
+        lo, hi = self._snapshot_bounds(snapshot, start_id, end_id)
+        return islice(snapshot.tasks, lo, hi)
+    
+    def get_tasks_in_range(self, start_id: int, end_id: int) -> List[Task]:
+        """
+        Retrieve the tasks whose IDs fall between start_id and end_id without blocking writers.
+        
+        Args:
+            start_id: The smallest task ID to include (inclusive)
+            end_id: The largest task ID to include (inclusive)
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._read(lambda: TodoManager.get_tasks_in_range(self, start_id, end_id))
+    
+    def get_page(self, page: int, page_size: int) -> List[Task]:
+        """
+        Retrieve one page of tasks in ID order without blocking writers.
+        
+        Args:
+            page: The page number, starting from 1
+            page_size: The number of tasks per page
+        
+        Returns:
+            A list of up to page_size Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If page or page_size is less than 1
+        """
+        return self._read(lambda: TodoManager.get_page(self, page, page_size))
+    
+    def get_tasks_by_status(self, completed: bool) -> List[Task]:
+        """
+        Retrieve all tasks with the given completion status without blocking writers.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._read(lambda: TodoManager.get_tasks_by_status(self, completed))
+    
+    def get_sorted(self, sort: str = SORT_ID, descending: bool = False, start: int = 0,
+                   count: Optional[int] = None, completed: Optional[bool] = None) -> List[Task]:
+        """
+        Retrieve tasks in ID, title or status order without blocking writers.
+        
+        Args:
+            sort: One of SORT_KEYS
+            descending: True to list the order from its end
+            start: The number of tasks to skip (0 to start at the first)
+            count: The maximum number of tasks to return (None for all)
+            completed: True for completed tasks only, False for open tasks only
+                (None for all tasks)
+        
+        Returns:
+            A list of Task objects in the requested order
+        
+        Raises:
+            ValueError: If sort is not a known order, or start or count is negative
+        """
+        return self._read(lambda: TodoManager.get_sorted(self, sort, descending, start, count, completed))
+    
+    def search_tasks(self, query: str) -> List[Task]:
+        """
+        Find tasks containing every word of the query without blocking writers.
+        
+        Args:
+            query: One or more words to search for
+        
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        return self._read(lambda: TodoManager.search_tasks(self, query))
+    
+    def find_tasks(self, fragment: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles best match a fragment without blocking writers.
+        
+        Args:
+            fragment: Part of a title, possibly misspelled
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, best match first
+        """
+        return self._read(lambda: TodoManager.find_tasks(self, fragment, limit))
+    
+    def find_by_prefix(self, prefix: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles begin with a prefix without blocking writers.
+        
+        Args:
+            prefix: The beginning of a title
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, in title order
+        """
+        return self._read(lambda: TodoManager.find_by_prefix(self, prefix, limit))
+    
+    def _new_feed(self) -> ChangeFeed:
+        """
+        Create a change feed that shares the write lock, so events are published in write order.
+        """
+        return ChangeFeed(lock=self._write_lock)
+    
+    def _current_snapshot(self) -> _Snapshot:
+        """
+        Return the snapshot for the current version, building it if needed.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        
+        def build() -> _Snapshot:
+            version = self._version
+            ids = tuple(self._ids)
+            tasks = self._tasks
+            return _Snapshot(version, ids, tuple([tasks[task_id] for task_id in ids]))
+        
+        snapshot = self._read(build)
+        self._snapshot = snapshot
+        return snapshot
+    
+    def _read(self, read: Callable[[], T]) -> T:
+        """
+        Run a read against a consistent state of the store.
+        
+        The read is first attempted without the lock and accepted only if no
+        write started or finished meanwhile; after repeated conflicts it is
+        run under the write lock instead.
+        
+        Args:
+            read: A function that reads the store and returns a result
+        
+        Returns:
+            The result of the read
+        """
+        for _ in range(OPTIMISTIC_READ_ATTEMPTS):
+            version = self._version
+            if version % 2:
+                continue  # A write is in progress
+            try:
+                result = read()
+            except (KeyError, IndexError, RuntimeError):
+                continue  # The store changed while it was being read, e.g. a sorted index split a chunk
+            if self._version == version:
+                return result
+        
+        with self._write_lock:
+            return read()
+    
+    @staticmethod
+    def _snapshot_bounds(snapshot: _Snapshot, start_id: Optional[int], end_id: Optional[int]) -> Tuple[int, int]:
+        """
+        Translate an inclusive ID range into slice positions of a snapshot.
+        """
+        lo = 0 if start_id is None else bisect.bisect_left(snapshot.ids, start_id)
+        hi = len(snapshot.ids) if end_id is None else bisect.bisect_right(snapshot.ids, end_id)
+        return lo, max(lo, hi)
+    
+    def _start_write(self) -> None:
+        """
+        Mark a write as started; the caller must hold the write lock.
+        
+        The version becomes odd, or, inside a transaction, moves on to the next
+        odd value, so every write invalidates the snapshot.
+        """
+        self._version += 2 if self._writes_open else 1
+        self._writes_open += 1
+    
+    def _finish_write(self) -> None:
+        """
+        Mark a write as finished, making the version even once no write or transaction remains open.
+        """
+        self._writes_open -= 1
+        if not self._writes_open:
+            self._version += 1
+    
+    def _own(self, task: Task) -> Task:
+        """
+        Replace a stored task with a private copy that may be modified.
+        
+        Args:
+            task: The stored task about to be modified
+        
+        Returns:
+            The copy now held in storage
+        """
+        task = copy.copy(task)
+        self._tasks[task.id] = task
+        return task
+    
+    def _set_text(self, task: Task, title: Optional[str], description: Optional[str]) -> None:
+        """
+        Change a copy of the task so readers holding the original are unaffected.
+        """
+        super()._set_text(self._own(task), title, description)
+    
+    def _toggle(self, task: Task) -> None:
+        """
+        Toggle a copy of the task so readers holding the original are unaffected.
+        """
+        super()._toggle(self._own(task))
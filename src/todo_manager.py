@@ -1,8 +1,214 @@
 """
 Core business logic for the Todo In-Memory Python Console App.
 """
-from typing import Dict, List, Optional
+import bisect
+import heapq
+import math
+import sys
+from collections import Counter, deque
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from .config import ARCHIVE_DIRECTORY, ARCHIVE_LOW_WATER, ARCHIVE_MAX_BYTES, ARCHIVE_MAX_TASKS, ARCHIVE_MIN_BATCH, FIND_DEFAULT_LIMIT, FIND_MAX_CANDIDATES, FIND_MIN_SIMILARITY, TRANSFER_CHUNK_SIZE, UNDO_HISTORY_MAX_ENTRIES, UNDO_HISTORY_MAX_ITEMS
+from .events import EVENT_ADDED, EVENT_DELETED, EVENT_TOGGLED, EVENT_UPDATED, ChangeFeed
 from .models import Task
+from .journal_records import OP_ADD, OP_DELETE, OP_TOGGLE, OP_UPDATE
+from .sorted_index import SortedIndex
+from .utils import tokenize, trigrams
+from .validation import validate_fields
+
+if TYPE_CHECKING:
+    from .archive import TaskArchive
+    from .persistence import Journal
+    from .transfer import ImportReport
+
+
+# A bulk selector: a range of IDs, a list of such ranges, an iterable of IDs, or a predicate on tasks
+TaskSelector = Union[range, List[range], Iterable[int], Callable[[Task], bool]]
+
+# History operations: each one reverses a kind of mutation
+_HISTORY_INSERT = "insert"  # Payload (tasks,): put removed Task objects back
+_HISTORY_REMOVE = "remove"  # Payload (task_ids,): remove tasks that were added
+_HISTORY_TEXT = "text"      # Payload (task_id, title, description): restore the fields that changed
+_HISTORY_TOGGLE = "toggle"  # Payload (task_ids,): toggle the same tasks again
+_HISTORY_BATCH = "batch"    # Payload (entries,): perform each step, last one first
+
+# Field getters used to publish change events for many tasks at C speed
+_TASK_ID = attrgetter("id")
+_TASK_TITLE = attrgetter("title")
+_TASK_DESCRIPTION = attrgetter("description")
+_TASK_COMPLETED = attrgetter("completed")
+
+
+def _title_key(task: Task) -> Tuple[str, int]:
+    """
+    Return a task's position key in title order: its case-folded title, then its ID.
+    """
+    return task.title.casefold(), task.id
+
+
+def _status_key(task: Task) -> Tuple[bool, int]:
+    """
+    Return a task's position key in status order: open before completed, then its ID.
+    """
+    return task.completed, task.id
+
+
+# Orders tasks can be listed in, and the key that places a task in each;
+# every key ends with the task ID, so ties are always broken the same way
+SORT_ID = "id"
+SORT_TITLE = "title"
+SORT_STATUS = "status"
+SORT_KEYS: Dict[str, Callable[[Task], object]] = {SORT_ID: _TASK_ID, SORT_TITLE: _title_key, SORT_STATUS: _status_key}
+
+
+def id_ranges(selector: TaskSelector) -> Optional[List[range]]:
+    """
+    Return the ID ranges of a selector that is a range or a list of ranges.
+    
+    Ranges are resolved against the stored IDs rather than expanded, so a
+    huge range costs no more than the tasks it actually matches.
+    
+    Args:
+        selector: A bulk selector
+    
+    Returns:
+        The non-empty ranges, each with a positive step, or None if the
+        selector is an iterable of IDs or a predicate
+    """
+    if isinstance(selector, range):
+        ranges = [selector]
+    elif isinstance(selector, list) and selector and all(isinstance(part, range) for part in selector):
+        ranges = selector
+    else:
+        return None
+    return [part if part.step > 0 else part[::-1] for part in ranges if part]
+
+
+def check_sort_window(sort: str, start: int, count: Optional[int]) -> None:
+    """
+    Check the arguments of a get_sorted call.
+    
+    Raises:
+        ValueError: If sort is not one of SORT_KEYS, or start or count is negative
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort order: {sort} (expected one of {', '.join(SORT_KEYS)})")
+    if start < 0 or (count is not None and count < 0):
+        raise ValueError("Start and count cannot be negative")
+
+
+class FindQuery:
+    """
+    A title fragment prepared for fuzzy lookup (see TodoManager.find_tasks).
+    
+    A title matches when it contains at least FIND_MIN_SIMILARITY of the
+    fragment's trigrams. Its score is the number of those trigrams it
+    contains, plus one if it contains the whole fragment; matches rank by
+    score, then by ID. Fragments shorter than three characters have no
+    trigrams and match the titles they begin, ranked in title order.
+    
+    Attributes:
+        needle: The case-folded fragment, without surrounding whitespace
+        grams: The fragment's distinct trigrams
+        required: The number of trigrams a title must contain to match
+    """
+    
+    def __init__(self, fragment: str):
+        """
+        Prepare a fragment.
+        
+        Args:
+            fragment: Part of a title, possibly misspelled
+        """
+        self.needle = fragment.casefold().strip()
+        self.grams = trigrams(self.needle)
+        self.required = max(1, math.ceil(len(self.grams) * FIND_MIN_SIMILARITY))
+    
+    def score(self, title: str) -> int:
+        """
+        Score a title against the fragment.
+        
+        Args:
+            title: The title to score
+        
+        Returns:
+            The title's score, or 0 if it does not match
+        """
+        folded = title.casefold()
+        if not self.grams:
+            return int(folded.startswith(self.needle))
+        shared = sum(gram in folded for gram in self.grams)
+        if shared < self.required:
+            return 0
+        return shared + 1 if self.needle in folded else shared
+    
+    def rank(self, task: Task) -> tuple:
+        """
+        Return the sort key that puts a matching task in its place among the matches.
+        """
+        if not self.grams:
+            return _title_key(task)
+        return -self.score(task.title), task.id
+
+
+def tasks_from_items(first_id: int, items: Iterable[Sequence[str]]) -> List[Task]:
+    """
+    Build tasks from (title,) or (title, description) items, validating them as columns.
+    
+    Args:
+        first_id: The ID of the first task; the others follow consecutively
+        items: The task fields, one sequence per task
+        
+    Returns:
+        The new tasks, in item order
+        
+    Raises:
+        ValueError: With the error of the first invalid item, if any item is invalid
+    """
+    titles = []
+    descriptions = []
+    for item in items:
+        titles.append(item[0])
+        descriptions.append(item[1] if len(item) > 1 else "")
+    
+    tasks, errors = Task.batch(first_id, titles, descriptions)
+    if errors:
+        raise ValueError(errors[0][1])
+    return tasks
+
+
+class _HistoryEntry(NamedTuple):
+    """
+    One undoable (or redoable) step.
+    
+    Attributes:
+        label: What the original mutation was, e.g. "delete of 3 tasks"
+        op: One of the _HISTORY_* operations that performs this step
+        payload: The operation's arguments; field deltas and IDs, never task copies
+        size: Approximate number of stored items, used for the memory cap
+    """
+    label: str
+    op: str
+    payload: tuple
+    size: int
+
+
+class _Transaction(NamedTuple):
+    """
+    The state of an open transaction.
+    
+    Attributes:
+        next_id: The ID counter when the transaction began
+        journal: The journal to write the transaction to on commit, if any
+        entries: The history steps that reverse each change made so far, oldest first
+        records: The journal records of those changes, written on commit
+    """
+    next_id: int
+    journal: Optional["Journal"]
+    entries: List[_HistoryEntry]
+    records: List[list]
 
 
 class TodoManager:
@@ -10,15 +216,89 @@ class TodoManager:
     Manages the in-memory storage and operations for tasks.
     
     This class handles all CRUD operations for tasks, maintaining them in memory
-    with auto-incrementing IDs starting from 1.
+    with auto-incrementing IDs starting from 1. Alongside the ID-keyed storage it
+    keeps an ascending list of task IDs so ordered listings, ranges and pages can
+    be served without re-sorting the store. Secondary indexes on completion
+    status and on the words of each title and description are kept up to date
+    on every mutation, so filtered listings and searches cost in proportion to
+    the number of matches rather than the size of the store. Title and status
+    orders are kept in sorted indexes as well (see sorted_index.SortedIndex),
+    so sorted listings and pages are read off them instead of sorting the
+    store for every request. A trigram index over the case-folded titles
+    serves fuzzy title lookups (see find_tasks).
+    
+    With a memory budget (see set_budget), the least recently completed
+    tasks are moved in bulk to a compressed on-disk archive whenever the store
+    outgrows it. Listings, searches and lookups by title cover the tasks in
+    memory; get_task and get_archived also read archived tasks, and changing
+    an archived task brings it back into memory first.
+    
+    When a Journal is supplied, the store is restored from it on construction
+    and every mutation is appended to it so state survives restarts.
+    
+    Every mutation also records how to reverse it in a bounded undo history,
+    which keeps only IDs and changed fields (or the removed Task objects
+    themselves) and evicts its oldest entries past a configurable cap.
+    
+    Change listeners are told the IDs of tasks that were updated, toggled or
+    deleted, so caches derived from tasks can drop what went stale. Every
+    mutation also publishes numbered change events on the events feed (see
+    events.ChangeFeed) for consumers that mirror the store.
+    
+    Changes made inside a transaction (see begin and transaction) are applied
+    to the store as they are made, but their journal records, change events
+    and undo step are held back and only released on commit; a rollback
+    reverses each change from its undo step. Both cost in proportion to the
+    number of changes, not to the size of the store.
     """
     
-    def __init__(self):
+    def __init__(self, journal: Optional["Journal"] = None, max_tasks: Optional[int] = ARCHIVE_MAX_TASKS,
+                 max_bytes: Optional[int] = ARCHIVE_MAX_BYTES):
         """
         Initialize the TodoManager with an empty task storage and ID counter.
+        
+        Args:
+            journal: A Journal to restore from and log mutations to (optional)
+            max_tasks: The number of tasks to keep in memory (see set_budget; None for no limit)
+            max_bytes: The approximate memory to keep tasks in (see set_budget; None for no limit)
         """
         self._tasks: Dict[int, Task] = {}
+        self._ids: List[int] = []  # Task IDs in ascending order
+        self._status_index: Dict[bool, Set[int]] = {False: set(), True: set()}
+        self._token_index: Dict[str, Set[int]] = {}  # Word -> IDs of tasks containing it
+        self._gram_index: Dict[str, Set[int]] = {}  # Title trigram -> IDs of tasks whose title contains it
+        self._title_order = SortedIndex()  # _title_key of every task
+        self._status_order = SortedIndex()  # _status_key of every task
         self._next_id: int = 1
+        self._journal: Optional["Journal"] = None
+        self._undo: Deque[_HistoryEntry] = deque()
+        self._redo: List[_HistoryEntry] = []
+        self._history_items = 0  # Sum of the sizes of the undo entries
+        self._history_max_entries = UNDO_HISTORY_MAX_ENTRIES
+        self._history_max_items = UNDO_HISTORY_MAX_ITEMS
+        self._change_listeners: List[Callable[[List[int]], None]] = []
+        self.events = self._new_feed()  # Created before the journal is replayed into it
+        self._transaction: Optional[_Transaction] = None
+        self._archive: Optional["TaskArchive"] = None  # Created the first time tasks are archived
+        self._completion_order: Optional[Dict[int, None]] = None  # Completed task IDs, least recently completed first, while a budget is set
+        self._max_tasks: Optional[int] = None
+        self._max_bytes: Optional[int] = None
+        self._task_limit: Optional[int] = None  # The budget in tasks
+        self._estimated_tasks = 0  # The number of tasks when a byte budget was last converted to tasks
+        self.archive_error: Optional[OSError] = None  # Why archiving stopped, if it failed
+        
+        if max_tasks is not None or max_bytes is not None:
+            self.set_budget(max_tasks, max_bytes)
+        if journal is not None:
+            journal.restore(self)
+            self._journal = journal
+            self.clear_history()  # Replayed mutations are not undoable
+    
+    def __len__(self) -> int:
+        """
+        Return the number of tasks currently stored.
+        """
+        return len(self._tasks)
     
     def add_task(self, title: str, description: str = "") -> Task:
         """
@@ -38,13 +318,45 @@ class TodoManager:
         task = Task(id=self._next_id, title=title, description=description, completed=False)
         
         # Add the task to storage
-        self._tasks[self._next_id] = task
+        self._insert_task(task)
         
         # Increment the ID counter for the next task
         self._next_id += 1
         
+        self._log_added([task])
+        self._remember(f"add of task {task.id}", _HISTORY_REMOVE, [task.id], 1)
+        
         return task
     
+    def add_many(self, items: Iterable[Sequence[str]]) -> List[Task]:
+        """
+        Add several tasks at once.
+        
+        All items are validated together (see Task.batch) before any task is
+        stored, so either all of them are added or none are.
+        
+        Args:
+            items: (title,) or (title, description) sequences, one per task
+            
+        Returns:
+            The newly created Task objects, in ID order
+            
+        Raises:
+            ValueError: If any title is empty or any field exceeds length limits
+        """
+        next_id = self._next_id
+        tasks = tasks_from_items(next_id, items)
+        
+        # New IDs are above every stored ID, so the indexes are extended in one pass
+        self._append_tasks(tasks)
+        self._next_id = next_id + len(tasks)
+        
+        if tasks:
+            self._log_added(tasks)
+            self._remember(f"add of {len(tasks)} tasks", _HISTORY_REMOVE, range(next_id, self._next_id), 1)
+        
+        return tasks
+    
     def get_task(self, task_id: int) -> Optional[Task]:
         """
         Retrieve a task by its ID.
@@ -55,7 +367,10 @@ class TodoManager:
         Returns:
             The Task object if found, None otherwise
         """
-        return self._tasks.get(task_id)
+        task = self._tasks.get(task_id)
+        if task is None and self._archive is not None:
+            return self._archive.get(task_id)
+        return task
     
     def get_all_tasks(self) -> List[Task]:
         """
@@ -64,7 +379,192 @@ class TodoManager:
         Returns:
             A list of all Task objects, sorted by ID
         """
-        return sorted(self._tasks.values(), key=lambda task: task.id)
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._ids]
+    
+    def iter_tasks(self, start_id: Optional[int] = None, end_id: Optional[int] = None) -> Iterator[Task]:
+        """
+        Lazily iterate over tasks in ID order, optionally limited to an ID range.
+        
+        The store must not be modified while the iterator is being consumed.
+        
+        Args:
+            start_id: The smallest task ID to include (optional, inclusive)
+            end_id: The largest task ID to include (optional, inclusive)
+            
+        Returns:
+            An iterator of Task objects, sorted by ID
+        """
+        lo, hi = self._id_bounds(start_id, end_id)
+        tasks = self._tasks
+        return (tasks[task_id] for task_id in islice(self._ids, lo, hi))
+    
+    def get_tasks_in_range(self, start_id: int, end_id: int) -> List[Task]:
+        """
+        Retrieve all tasks whose IDs fall between start_id and end_id.
+        
+        Args:
+            start_id: The smallest task ID to include (inclusive)
+            end_id: The largest task ID to include (inclusive)
+            
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        lo, hi = self._id_bounds(start_id, end_id)
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._ids[lo:hi]]
+    
+    def get_page(self, page: int, page_size: int) -> List[Task]:
+        """
+        Retrieve one page of tasks in ID order.
+        
+        Args:
+            page: The page number, starting from 1
+            page_size: The number of tasks per page
+            
+        Returns:
+            A list of up to page_size Task objects, sorted by ID
+            
+        Raises:
+            ValueError: If page or page_size is less than 1
+        """
+        if page < 1:
+            raise ValueError("Page number must be at least 1")
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        
+        start = (page - 1) * page_size
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._ids[start:start + page_size]]
+    
+    def get_tasks_by_status(self, completed: bool) -> List[Task]:
+        """
+        Retrieve all tasks with the given completion status.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+            
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._sorted_ids(SORT_STATUS, False, 0, None, completed)]
+    
+    def count_by_status(self, completed: bool) -> int:
+        """
+        Count the tasks with the given completion status.
+        
+        Args:
+            completed: True for completed tasks, False for open tasks
+            
+        Returns:
+            The number of matching tasks
+        """
+        return len(self._status_index[completed])
+    
+    def get_sorted(self, sort: str = SORT_ID, descending: bool = False, start: int = 0,
+                   count: Optional[int] = None, completed: Optional[bool] = None) -> List[Task]:
+        """
+        Retrieve tasks in ID, title or status order, optionally only those with one status.
+        
+        Titles are compared case-insensitively. Tasks with equal titles or
+        statuses are ordered by ID, and descending reverses the whole order,
+        ties included, so every listing is repeatable. Reading a window costs
+        O(log n + count), except for titles filtered by status, which scan the
+        title order until the window is filled.
+        
+        Args:
+            sort: One of SORT_KEYS
+            descending: True to list the order from its end
+            start: The number of tasks to skip (0 to start at the first)
+            count: The maximum number of tasks to return (None for all)
+            completed: True for completed tasks only, False for open tasks only
+                (None for all tasks)
+        
+        Returns:
+            A list of Task objects in the requested order
+        
+        Raises:
+            ValueError: If sort is not a known order, or start or count is negative
+        """
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._sorted_ids(sort, descending, start, count, completed)]
+    
+    def search_tasks(self, query: str) -> List[Task]:
+        """
+        Find tasks whose title or description contains every word of the query.
+        
+        Matching is case-insensitive and works on whole words.
+        
+        Args:
+            query: One or more words to search for
+            
+        Returns:
+            A list of the matching Task objects, sorted by ID
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        
+        postings = []
+        for term in terms:
+            ids = self._token_index.get(term)
+            if not ids:
+                return []
+            postings.append(ids)
+        
+        # Intersect starting from the rarest word to keep intermediate sets small
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for ids in postings[1:]:
+            matches &= ids
+        
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in sorted(matches)]
+    
+    def find_tasks(self, fragment: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles best match a fragment, tolerating typos.
+        
+        Matching and ranking are described in FindQuery. Candidates are read
+        from the trigram index: when enough titles contain every trigram of
+        the fragment, only they are ranked; otherwise the bar is lowered one
+        trigram at a time, scoring only the titles in the rarest postings
+        that can still reach it. Up to FIND_MAX_CANDIDATES candidates are
+        scored with set intersections; more are walked in ID order until
+        enough of them have the best possible score, which is quick for
+        common fragments but may walk the whole store for one whose
+        trigrams are each common yet rarely occur together.
+        
+        Args:
+            fragment: Part of a title, possibly misspelled
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, best match first
+        """
+        query = FindQuery(fragment)
+        if not query.needle or limit <= 0:
+            return []
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._find_ids(query, limit)]
+    
+    def find_by_prefix(self, prefix: str, limit: int = FIND_DEFAULT_LIMIT) -> List[Task]:
+        """
+        Find the tasks whose titles begin with a prefix, ignoring case.
+        
+        The matches are a contiguous run of the title order, so the lookup
+        costs O(log n + limit).
+        
+        Args:
+            prefix: The beginning of a title
+            limit: The maximum number of tasks to return
+        
+        Returns:
+            Up to limit matching Task objects, in title order
+        """
+        tasks = self._tasks
+        return [tasks[task_id] for task_id in self._prefix_ids(prefix.casefold(), limit)]
     
     def update_task(self, task_id: int, title: Optional[str] = None, description: Optional[str] = None) -> bool:
         """
@@ -77,16 +577,28 @@ class TodoManager:
             
         Returns:
             True if the task was updated, False if the task ID doesn't exist
+            
+        Raises:
+            ValueError: If the new title is empty or either field exceeds length limits
         """
-        if task_id not in self._tasks:
+        if task_id not in self._tasks and not self._unarchive((task_id,)):
             return False
         
+        error = validate_fields(title, description)
+        if error is not None:
+            raise ValueError(error)
+        
         task = self._tasks[task_id]
         
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
+        # Remember only the fields that are about to change
+        previous_title = task.title if title is not None else None
+        previous_description = task.description if description is not None else None
+        
+        self._set_text(task, title, description)
+        
+        self._log_updated(task_id, title, description)
+        self._remember(f"update of task {task_id}", _HISTORY_TEXT,
+                       (task_id, previous_title, previous_description), 1)
             
         return True
     
@@ -100,10 +612,13 @@ class TodoManager:
         Returns:
             True if the task was deleted, False if the task ID doesn't exist
         """
-        if task_id not in self._tasks:
+        if task_id not in self._tasks and not self._unarchive((task_id,)):
             return False
         
-        del self._tasks[task_id]
+        task = self._remove_task(task_id)
+        
+        self._log_removed([task_id])
+        self._remember(f"delete of task {task_id}", _HISTORY_INSERT, [task], 1)
         return True
     
     def toggle_task_status(self, task_id: int) -> bool:
@@ -116,9 +631,1114 @@ class TodoManager:
         Returns:
             True if the task status was toggled, False if the task ID doesn't exist
         """
-        if task_id not in self._tasks:
+        if task_id not in self._tasks and not self._unarchive((task_id,)):
             return False
         
-        task = self._tasks[task_id]
-        task.completed = not task.completed
-        return True
\ No newline at end of file
+        self._toggle(self._tasks[task_id])
+        
+        self._log_toggled([task_id])
+        self._remember(f"toggle of task {task_id}", _HISTORY_TOGGLE, [task_id], 1)
+        return True
+    
+    def delete_many(self, selector: TaskSelector) -> int:
+        """
+        Delete every task matched by a selector in one pass.
+        
+        Args:
+            selector: A range of IDs, a list of ranges, an iterable of IDs, or a predicate that
+                receives each task and returns True for tasks to delete
+            
+        Returns:
+            The number of tasks deleted
+        """
+        task_ids = self._select_ids(selector)
+        if not task_ids:
+            return 0
+        
+        removed = self._remove_tasks(task_ids)
+        
+        self._log_removed(task_ids)
+        self._remember(f"delete of {len(removed)} tasks", _HISTORY_INSERT, removed, len(removed))
+        return len(task_ids)
+    
+    def toggle_many(self, selector: TaskSelector) -> int:
+        """
+        Toggle the completion status of every task matched by a selector.
+        
+        Args:
+            selector: A range of IDs, a list of ranges, an iterable of IDs, or a predicate that
+                receives each task and returns True for tasks to toggle
+            
+        Returns:
+            The number of tasks toggled
+        """
+        task_ids = self._select_ids(selector)
+        if not task_ids:
+            return 0
+        
+        tasks = self._tasks
+        for task_id in task_ids:
+            self._toggle(tasks[task_id])
+        
+        self._log_toggled(task_ids)
+        self._remember(f"toggle of {len(task_ids)} tasks", _HISTORY_TOGGLE, task_ids, len(task_ids))
+        return len(task_ids)
+    
+    def import_tasks(self, path: str, fmt: Optional[str] = None,
+                     chunk_size: int = TRANSFER_CHUNK_SIZE) -> "ImportReport":
+        """
+        Add the tasks stored in a CSV, JSON Lines or binary file.
+        
+        The file is streamed and stored one validated chunk at a time. Invalid
+        rows are skipped and reported; imported tasks get fresh IDs and keep
+        their completion status. The whole import is undone as one step.
+        
+        Args:
+            path: The file to import
+            fmt: 'csv', 'jsonl' or 'bin' (optional, inferred from the file extension)
+            chunk_size: The number of rows validated and stored together
+            
+        Returns:
+            An ImportReport with the number of imported and rejected rows
+            
+        Raises:
+            ValueError: If the format is unknown or the file is not in that format
+            OSError: If the file cannot be read
+        """
+        from .transfer import ImportReport, build_tasks, read_tasks  # Loaded on first use, not at startup
+        
+        report = ImportReport()
+        first_id = self._next_id
+        try:
+            for chunk in read_tasks(path, report, fmt, chunk_size):
+                tasks = build_tasks(chunk, self._next_id, report)
+                self._append_tasks(tasks)
+                self._next_id += len(tasks)
+                self._log_added(tasks)
+                report.imported += len(tasks)
+                self._enforce_budget()
+        finally:
+            # Chunks stored before a read error stay, and remain undoable
+            if self._next_id > first_id:
+                self._remember(f"import of {self._next_id - first_id} tasks", _HISTORY_REMOVE,
+                               range(first_id, self._next_id), 1)
+        return report
+    
+    def export_tasks(self, path: str, fmt: Optional[str] = None) -> int:
+        """
+        Write every task, in ID order, to a CSV, JSON Lines or binary file.
+        
+        Args:
+            path: The file to write; it is replaced only once the export is complete
+            fmt: 'csv', 'jsonl' or 'bin' (optional, inferred from the file extension)
+            
+        Returns:
+            The number of tasks exported
+            
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the file cannot be written
+        """
+        from .transfer import write_tasks
+        
+        return write_tasks(path, heapq.merge(self.iter_tasks(), self.iter_archived(), key=_TASK_ID), fmt)
+    
+    def set_budget(self, max_tasks: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Limit the tasks kept in memory, archiving completed tasks past the limit.
+        
+        Whenever a change takes the store over its budget, its least recently
+        completed tasks are moved in bulk to a compressed on-disk archive (see
+        archive.TaskArchive) until it is down to ARCHIVE_LOW_WATER of the
+        budget; open tasks are never archived. Archiving waits until enough
+        completed tasks have gathered for a batch, and until a transaction is
+        committed. A byte budget is converted to tasks with the estimate of
+        instrumentation.estimate_store_bytes, refreshed before each batch.
+        
+        Without a budget nothing more is archived; tasks that already are come
+        back into memory as they are changed.
+        
+        Args:
+            max_tasks: The number of tasks to keep in memory (None for no limit)
+            max_bytes: The approximate memory of the tasks and indexes kept in memory (None for no limit)
+        
+        Returns:
+            The number of tasks archived to get within the new budget
+        
+        Raises:
+            ValueError: If a limit is less than 1
+        """
+        for name, limit in (("max_tasks", max_tasks), ("max_bytes", max_bytes)):
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} must be at least 1")
+        
+        self._max_tasks = max_tasks
+        self._max_bytes = max_bytes
+        self.archive_error = None
+        if max_tasks is None and max_bytes is None:
+            self._task_limit = None
+            self._completion_order = None
+            return 0
+        
+        if self._completion_order is None:
+            # Tasks completed before there was a budget count as completed in ID order
+            self._completion_order = dict.fromkeys(sorted(self._status_index[True]))
+        self._task_limit = self._resident_limit()
+        return self._enforce_budget()
+    
+    @property
+    def budget(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        The memory budget as (max_tasks, max_bytes), None standing for no limit.
+        """
+        return self._max_tasks, self._max_bytes
+    
+    def archived_count(self) -> int:
+        """
+        Return the number of archived tasks.
+        """
+        return len(self._archive) if self._archive is not None else 0
+    
+    def get_archived(self, start: int = 0, count: Optional[int] = None) -> List[Task]:
+        """
+        Retrieve archived tasks in ID order, leaving them archived.
+        
+        Args:
+            start: The number of archived tasks to skip (0 to start at the lowest ID)
+            count: The maximum number of tasks to return (None for all)
+        
+        Returns:
+            A list of archived Task objects, sorted by ID
+        
+        Raises:
+            ValueError: If start or count is negative
+            OSError: If the archive cannot be read
+        """
+        check_sort_window(SORT_ID, start, count)
+        if self._archive is None:
+            return []
+        return self._archive.slice(start, len(self._archive) if count is None else start + count)
+    
+    def iter_archived(self) -> Iterator[Task]:
+        """
+        Lazily iterate over the archived tasks in ID order, leaving them archived.
+        
+        The store must not be modified while the iterator is being consumed.
+        
+        Returns:
+            An iterator of archived Task objects, sorted by ID
+        """
+        return iter(self._archive) if self._archive is not None else iter(())
+    
+    def undo(self) -> Optional[str]:
+        """
+        Reverse the most recent mutation that has not been undone yet.
+        
+        Returns:
+            A description of the undone mutation, or None if there is nothing to undo
+        
+        Raises:
+            RuntimeError: If a transaction is open
+        """
+        self._check_no_transaction("undo")
+        if not self._undo:
+            return None
+        
+        entry = self._undo.pop()
+        self._history_items -= entry.size
+        self._redo.append(self._apply_history(entry))
+        self._enforce_budget()
+        return entry.label
+    
+    def redo(self) -> Optional[str]:
+        """
+        Re-apply the most recently undone mutation.
+        
+        Returns:
+            A description of the redone mutation, or None if there is nothing to redo
+        
+        Raises:
+            RuntimeError: If a transaction is open
+        """
+        self._check_no_transaction("redo")
+        if not self._redo:
+            return None
+        
+        entry = self._redo.pop()
+        self._push_undo(self._apply_history(entry))
+        self._enforce_budget()
+        return entry.label
+    
+    def clear_history(self) -> None:
+        """
+        Forget all undo and redo history.
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._history_items = 0
+    
+    def set_history_limits(self, max_entries: int, max_items: int) -> None:
+        """
+        Change the undo history caps, evicting the oldest entries if needed.
+        
+        Args:
+            max_entries: Maximum number of undoable steps to keep
+            max_items: Maximum number of task IDs, deltas and removed tasks held
+                across all steps, which bounds the history's memory use
+        """
+        self._history_max_entries = max_entries
+        self._history_max_items = max_items
+        self._evict_history()
+    
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Whether a transaction is open.
+        """
+        return self._transaction is not None
+    
+    def begin(self) -> None:
+        """
+        Open a transaction; later changes take effect for good only on commit.
+        
+        Raises:
+            RuntimeError: If a transaction is already open
+        """
+        if self._transaction is not None:
+            raise RuntimeError("A transaction is already open")
+        
+        records: List[list] = []
+        self._transaction = _Transaction(self._next_id, self._journal, [], records)
+        if self._journal is not None:
+            self._journal = records  # Mutations log into the list until commit
+        self.events.hold()
+    
+    def commit(self) -> int:
+        """
+        Close the open transaction, keeping its changes.
+        
+        The journal receives all of the transaction's records as one atomic
+        record, subscribers receive its events together, and undo reverses the
+        whole transaction in one step.
+        
+        Returns:
+            The number of changes committed
+        
+        Raises:
+            RuntimeError: If no transaction is open
+        """
+        transaction = self._end_transaction("commit")
+        if transaction.journal is not None and transaction.records:
+            transaction.journal.append_transaction(transaction.records)
+        self.events.release()
+        
+        entries = transaction.entries
+        if entries:
+            self._redo.clear()
+            if len(entries) == 1:
+                self._push_undo(entries[0])
+            else:
+                self._push_undo(_HistoryEntry(f"transaction of {len(entries)} changes", _HISTORY_BATCH,
+                                              (entries,), sum(entry.size for entry in entries)))
+        self._enforce_budget()
+        return len(entries)
+    
+    def rollback(self) -> int:
+        """
+        Close the open transaction, reversing its changes.
+        
+        Nothing the transaction did reaches the journal, the events feed or
+        the undo history, and the ID counter is restored.
+        
+        Returns:
+            The number of changes rolled back
+        
+        Raises:
+            RuntimeError: If no transaction is open
+        """
+        transaction = self._transaction
+        if transaction is None:
+            raise RuntimeError("No transaction is open to rollback")
+        
+        # Reversed while the journal and events are still held, so they are discarded with them
+        for entry in reversed(transaction.entries):
+            self._apply_history(entry)
+        self._next_id = transaction.next_id
+        
+        self._end_transaction("rollback")
+        self.events.discard()
+        return len(transaction.entries)
+    
+    @contextmanager
+    def transaction(self) -> Iterator["TodoManager"]:
+        """
+        Run a block of changes as one transaction.
+        
+        The transaction commits when the block finishes and rolls back if it
+        raises, re-raising the exception.
+        
+        Yields:
+            This manager
+        
+        Raises:
+            RuntimeError: If a transaction is already open
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+    
+    def add_change_listener(self, listener: Callable[[List[int]], None]) -> None:
+        """
+        Register a callback for changes to existing tasks.
+        
+        Args:
+            listener: Called after each update, toggle or delete (including undo
+                and redo) with the list of affected task IDs
+        """
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[List[int]], None]) -> None:
+        """
+        Unregister a callback added with add_change_listener.
+        
+        Args:
+            listener: The callback to remove
+        
+        Raises:
+            ValueError: If the callback is not registered
+        """
+        self._change_listeners.remove(listener)
+    
+    def _new_feed(self) -> ChangeFeed:
+        """
+        Create the change feed; subclasses that guard the store with a lock share it with the feed.
+        """
+        return ChangeFeed()
+    
+    def _sorted_ids(self, sort: str, descending: bool, start: int, count: Optional[int],
+                    completed: Optional[bool]) -> List[int]:
+        """
+        Return the IDs of a window of tasks in a sort order (see get_sorted).
+        """
+        check_sort_window(sort, start, count)
+        
+        if completed is not None and sort == SORT_TITLE:
+            wanted = self._status_index[completed]
+            keys = reversed(self._title_order) if descending else iter(self._title_order)
+            matching = (task_id for _, task_id in keys if task_id in wanted)
+            return list(islice(matching, start, None if count is None else start + count))
+        
+        # Every other window is a contiguous run of positions in one order. Within
+        # one status, status order is ID order, and the open tasks come first.
+        base = 0
+        if completed is None:
+            total = len(self._ids)
+        else:
+            open_count = len(self._status_index[False])
+            base, total = (open_count, len(self._tasks) - open_count) if completed else (0, open_count)
+        
+        lo, hi = self._window(total, start, count, descending)
+        if sort == SORT_ID and completed is None:
+            ids = self._ids[lo:hi]
+        else:
+            order = self._title_order if sort == SORT_TITLE else self._status_order
+            ids = [task_id for _, task_id in order.slice(base + lo, base + hi)]
+        if descending:
+            ids.reverse()
+        return ids
+    
+    def _find_ids(self, query: FindQuery, limit: int) -> List[int]:
+        """
+        Return the IDs of the best matches of a prepared fragment (see find_tasks).
+        """
+        if not query.grams:
+            return self._prefix_ids(query.needle, limit)
+        
+        index = self._gram_index
+        present = sorted(filter(None, (index.get(gram) for gram in query.grams)), key=len)
+        if len(present) < query.required:
+            return []
+        
+        tasks = self._tasks
+        needle = query.needle
+        whole = len(query.grams)
+        if len(present) == whole and len(present[0]) <= FIND_MAX_CANDIDATES:
+            # Titles containing every trigram outrank all others, so enough of them settle the
+            # result; those containing the whole fragment come first
+            complete = present[0].intersection(*present[1:])
+            if len(complete) >= limit:
+                return [task_id for _, task_id in heapq.nsmallest(
+                    limit, [(needle not in tasks[task_id].title.casefold(), task_id) for task_id in complete])]
+        
+        # A title with at least `least` of the k trigrams found is in one of the rarest
+        # k - least + 1 postings. Lower `least` one posting at a time, scoring the
+        # titles each adds (counting their trigrams with set intersections), until
+        # `limit` titles reach it.
+        k = len(present)
+        scores: Dict[int, int] = {}
+        counts: Counter = Counter()  # Scored titles per score
+        for least in range(k, query.required - 1, -1):
+            added = present[k - least].difference(scores)
+            if len(scores) + len(added) > FIND_MAX_CANDIDATES:
+                return self._walk_ids(query, present, limit)
+            shared: Counter = Counter()
+            for ids in present:
+                shared.update(ids & added if len(ids) > len(added) else added & ids)
+            if k == whole:
+                for task_id in [task_id for task_id, count in shared.items() if count == whole]:
+                    if needle in tasks[task_id].title.casefold():
+                        shared[task_id] += 1
+            scores.update(shared)
+            counts.update(shared.values())
+            if sum(count for score, count in counts.items() if score >= least) >= limit:
+                break
+        return [task_id for _, task_id in heapq.nsmallest(limit, [(-score, task_id) for task_id, score in scores.items()
+                                                                  if score >= least])]
+    
+    def _prefix_ids(self, folded: str, limit: int) -> List[int]:
+        """
+        Return the IDs of up to limit tasks whose case-folded titles begin with folded, in title order.
+        """
+        start = self._title_order.bisect_left((folded,))
+        ids = []
+        for title, task_id in self._title_order.slice(start, start + limit):
+            if not title.startswith(folded):
+                break
+            ids.append(task_id)
+        return ids
+    
+    def _walk_ids(self, query: FindQuery, present: List[Set[int]], limit: int) -> List[int]:
+        """
+        Find the best matches among too many candidates by walking the IDs in ascending order.
+        
+        The walk keeps the first `limit` IDs of each score and stops once
+        `limit` tasks have the best score any task could have.
+        
+        Args:
+            query: The prepared fragment
+            present: The non-empty postings of the fragment's trigrams, rarest first
+            limit: The maximum number of IDs to return
+        
+        Returns:
+            The IDs of up to limit matching tasks, best match first
+        """
+        tasks = self._tasks
+        whole = len(query.grams)
+        pool = present[:len(present) - query.required + 1]  # Every match is in one of these
+        best = len(present) + 1 if len(present) == whole else len(present)
+        by_score: Dict[int, List[int]] = {}
+        for task_id in self._ids:
+            if not any(task_id in ids for ids in pool):
+                continue
+            score = sum(task_id in ids for ids in present)
+            if score < query.required:
+                continue
+            if score == whole and query.needle in tasks[task_id].title.casefold():
+                score += 1
+            ids = by_score.setdefault(score, [])
+            if len(ids) < limit:
+                ids.append(task_id)
+                if score == best and len(ids) == limit:
+                    break
+        ranked = [task_id for score in sorted(by_score, reverse=True) for task_id in by_score[score]]
+        return ranked[:limit]
+    
+    @staticmethod
+    def _window(total: int, start: int, count: Optional[int], descending: bool) -> Tuple[int, int]:
+        """
+        Translate a window of an order into ascending (start, stop) positions.
+        
+        Args:
+            total: The number of tasks in the order
+            start: The number of tasks to skip from the beginning (or, when descending, the end)
+            count: The maximum number of tasks in the window (None for all)
+            descending: True if the order is read from its end
+        
+        Returns:
+            Slice positions of the window in ascending order
+        """
+        if descending:
+            hi = max(total - start, 0)
+            return (0 if count is None else max(hi - count, 0)), hi
+        lo = min(start, total)
+        return lo, (total if count is None else min(start + count, total))
+    
+    def _select_ids(self, selector: TaskSelector) -> List[int]:
+        """
+        Resolve a bulk selector to the IDs of existing tasks.
+        
+        Args:
+            selector: A range of IDs, a list of ranges, an iterable of IDs, or a predicate on tasks
+            
+        Returns:
+            The distinct IDs of the matching tasks, in ascending order
+        """
+        ranges = id_ranges(selector)
+        archive = self._archive
+        if archive is not None and len(archive):
+            # Archived tasks match too, and are brought back into memory to be changed
+            if ranges is not None:
+                for id_range in ranges:
+                    self._unarchive([task_id for task_id in archive.ids_between(id_range[0], id_range[-1])
+                                     if task_id in id_range])
+            elif callable(selector):
+                self._unarchive(archive.select(selector))
+            else:
+                selector = list(selector)
+                self._unarchive(selector)
+        
+        if ranges is not None:
+            if len(ranges) == 1:
+                return self._range_ids(ranges[0])
+            return sorted(set().union(*map(self._range_ids, ranges)))
+        
+        tasks = self._tasks
+        if callable(selector):
+            return [task_id for task_id in self._ids if selector(tasks[task_id])]
+        return sorted({task_id for task_id in selector if task_id in tasks})
+    
+    def _end_transaction(self, action: str) -> _Transaction:
+        """
+        Detach the open transaction and give the journal back.
+        
+        Args:
+            action: What is ending it ('commit' or 'rollback'), for the error message
+        
+        Returns:
+            The transaction that was open
+        
+        Raises:
+            RuntimeError: If no transaction is open
+        """
+        transaction = self._transaction
+        if transaction is None:
+            raise RuntimeError(f"No transaction is open to {action}")
+        self._transaction = None
+        self._journal = transaction.journal
+        return transaction
+    
+    def _check_no_transaction(self, action: str) -> None:
+        """
+        Refuse an operation that cannot run inside a transaction.
+        
+        Raises:
+            RuntimeError: If a transaction is open
+        """
+        if self._transaction is not None:
+            raise RuntimeError(f"Cannot {action} while a transaction is open; commit or roll back first")
+    
+    def _remember(self, label: str, op: str, payload, size: int) -> None:
+        """
+        Record how to reverse a mutation that was just applied.
+        
+        A new mutation invalidates everything that could have been redone.
+        
+        Args:
+            label: Description of the mutation, e.g. "delete of task 3"
+            op: The _HISTORY_* operation that reverses it
+            payload: That operation's first argument (or argument tuple for text edits)
+            size: Approximate number of items held by the payload
+        """
+        if op != _HISTORY_TEXT:
+            payload = (payload,)
+        entry = _HistoryEntry(label, op, payload, size)
+        if self._transaction is not None:
+            self._transaction.entries.append(entry)
+            return
+        self._redo.clear()
+        self._push_undo(entry)
+        self._enforce_budget()
+    
+    def _push_undo(self, entry: _HistoryEntry) -> None:
+        """
+        Add an entry to the undo history and enforce the history caps.
+        """
+        self._undo.append(entry)
+        self._history_items += entry.size
+        self._evict_history()
+    
+    def _evict_history(self) -> None:
+        """
+        Drop the oldest undo entries until the history fits within its caps.
+        """
+        undo = self._undo
+        while undo and (len(undo) > self._history_max_entries or self._history_items > self._history_max_items):
+            self._history_items -= undo.popleft().size
+    
+    def _enforce_budget(self) -> int:
+        """
+        Archive the least recently completed tasks if the store is over its budget.
+        
+        Called after every change outside a transaction. If archiving fails,
+        the tasks stay in memory and archiving stops until the budget is set
+        again; the error is kept in archive_error.
+        
+        Returns:
+            The number of tasks archived
+        """
+        limit = self._task_limit
+        if limit is None or len(self._tasks) <= limit or self._transaction is not None:
+            return 0
+        
+        # A byte budget is re-estimated before each batch, and whenever the store has doubled
+        if self._max_bytes is not None and (self._archive_batch(limit)
+                                            or len(self._tasks) >= 2 * self._estimated_tasks):
+            limit = self._task_limit = self._resident_limit()
+        batch = self._archive_batch(limit)
+        if not batch:
+            return 0
+        
+        task_ids = list(islice(self._completion_order, batch))
+        tasks = self._tasks
+        try:
+            if self._archive is None:
+                from .archive import TaskArchive  # Loaded the first time tasks are archived
+                self._archive = TaskArchive(ARCHIVE_DIRECTORY)
+            self._archive.add([tasks[task_id] for task_id in task_ids])
+        except OSError as error:
+            self.archive_error = error
+            self._task_limit = None
+            return 0
+        self._remove_tasks(task_ids)
+        self._compact_postings()
+        self._notify_changed(task_ids)  # Listeners such as row caches must not keep archived tasks alive
+        return len(task_ids)
+    
+    def _archive_batch(self, limit: int) -> int:
+        """
+        Return how many tasks to archive to get down to the low-water mark of a limit.
+        
+        Returns:
+            The number of tasks, or 0 when the store is within the limit or
+            too few completed tasks have gathered yet for a batch
+        """
+        excess = len(self._tasks) - int(limit * ARCHIVE_LOW_WATER)
+        # While open tasks fill most of the budget, completed ones are still archived in full batches
+        wanted = min(excess, max(ARCHIVE_MIN_BATCH, limit - int(limit * ARCHIVE_LOW_WATER)))
+        if len(self._tasks) <= limit or len(self._completion_order) < wanted:
+            return 0
+        return excess
+    
+    def _compact_postings(self) -> None:
+        """
+        Rebuild the index sets that archiving left much larger than their contents.
+        
+        A set keeps its capacity as entries are removed, so the postings of
+        common words would otherwise hold on to the memory of archived tasks.
+        """
+        size = sys.getsizeof
+        for index in (self._status_index, self._token_index, self._gram_index):
+            for key, ids in index.items():
+                if size(ids) > 128 * len(ids) + 2048:
+                    index[key] = set(ids)
+    
+    def _resident_limit(self) -> int:
+        """
+        Return the budget as a number of tasks, estimating the memory per task for a byte budget.
+        """
+        limit = self._max_tasks
+        if self._max_bytes is not None:
+            from .instrumentation import estimate_store_bytes  # Loaded only for byte budgets
+            self._estimated_tasks = len(self._tasks)
+            size = estimate_store_bytes(self) if self._tasks else None
+            # An empty store is estimated again as soon as it holds a task
+            by_bytes = max(1, int(self._max_bytes * len(self._tasks) / size)) if size else 0
+            limit = by_bytes if limit is None else min(limit, by_bytes)
+        return limit
+    
+    def _unarchive(self, task_ids: Iterable[int]) -> int:
+        """
+        Bring archived tasks back into memory, as the most recently completed ones.
+        
+        Args:
+            task_ids: Task IDs; those that are not archived are ignored
+        
+        Returns:
+            The number of tasks brought back
+        """
+        archive = self._archive
+        if archive is None or not len(archive):
+            return 0
+        tasks = archive.take(task_ids)
+        self._insert_tasks(tasks)
+        return len(tasks)
+    
+    def _apply_history(self, entry: _HistoryEntry) -> _HistoryEntry:
+        """
+        Perform a history step and build the step that reverses it.
+        
+        Args:
+            entry: The step to perform
+        
+        Returns:
+            The opposite step, carrying the same label
+        """
+        # Steps that change existing tasks need them in memory
+        if entry.op in (_HISTORY_REMOVE, _HISTORY_TOGGLE):
+            self._unarchive(entry.payload[0])
+        elif entry.op == _HISTORY_TEXT:
+            self._unarchive(entry.payload[:1])
+        
+        if entry.op == _HISTORY_REMOVE:
+            task_ids = list(entry.payload[0])
+            removed = self._remove_tasks(task_ids)
+            self._log_removed(task_ids)
+            return _HistoryEntry(entry.label, _HISTORY_INSERT, (removed,), len(removed))
+        
+        if entry.op == _HISTORY_INSERT:
+            tasks = entry.payload[0]
+            self._insert_tasks(tasks)
+            self._log_added(tasks)
+            return _HistoryEntry(entry.label, _HISTORY_REMOVE, ([task.id for task in tasks],), len(tasks))
+        
+        if entry.op == _HISTORY_BATCH:
+            # Steps run last one first; listed in that order, their opposites will run first one first
+            opposites = [self._apply_history(step) for step in reversed(entry.payload[0])]
+            return _HistoryEntry(entry.label, _HISTORY_BATCH, (opposites,), entry.size)
+        
+        if entry.op == _HISTORY_TEXT:
+            task_id, title, description = entry.payload
+            task = self._tasks[task_id]
+            current = (task_id,
+                       task.title if title is not None else None,
+                       task.description if description is not None else None)
+            self._set_text(task, title, description)
+            self._log_updated(task_id, title, description)
+            return _HistoryEntry(entry.label, _HISTORY_TEXT, current, 1)
+        
+        task_ids = entry.payload[0]
+        tasks = self._tasks
+        for task_id in task_ids:
+            self._toggle(tasks[task_id])
+        self._log_toggled(task_ids)
+        return entry
+    
+    def _log_added(self, tasks: List[Task]) -> None:
+        """
+        Append add records for newly stored tasks to the journal, if any, and publish them.
+        """
+        if self._journal is not None:
+            records = []
+            for task in tasks:
+                record = [OP_ADD, task.id, task.title, task.description]
+                if task.completed:
+                    record.append(True)
+                records.append(record)
+            self._journal.extend(records)
+        if len(tasks) == 1:
+            task = tasks[0]
+            self.events.publish(EVENT_ADDED, task.id, task.title, task.description, task.completed)
+        else:
+            self.events.publish_many(EVENT_ADDED, list(map(_TASK_ID, tasks)), map(_TASK_TITLE, tasks),
+                                     map(_TASK_DESCRIPTION, tasks), map(_TASK_COMPLETED, tasks))
+    
+    def _log_updated(self, task_id: int, title: Optional[str], description: Optional[str]) -> None:
+        """
+        Append an update record to the journal, if any, and notify change listeners.
+        """
+        if self._journal is not None:
+            self._journal.append([OP_UPDATE, task_id, title, description])
+        self._notify_changed([task_id])
+        self.events.publish(EVENT_UPDATED, task_id, title, description)
+    
+    def _log_removed(self, task_ids: List[int]) -> None:
+        """
+        Append delete records to the journal, if any, and notify change listeners.
+        """
+        if self._journal is not None:
+            self._journal.extend([[OP_DELETE, task_id] for task_id in task_ids])
+        self._notify_changed(task_ids)
+        if len(task_ids) == 1:
+            self.events.publish(EVENT_DELETED, task_ids[0])
+        else:
+            self.events.publish_many(EVENT_DELETED, task_ids)
+    
+    def _log_toggled(self, task_ids: List[int]) -> None:
+        """
+        Append toggle records to the journal, if any, and notify change listeners.
+        """
+        if self._journal is not None:
+            self._journal.extend([[OP_TOGGLE, task_id] for task_id in task_ids])
+        self._notify_changed(task_ids)
+        if len(task_ids) == 1:
+            self.events.publish(EVENT_TOGGLED, task_ids[0], None, None, self._tasks[task_ids[0]].completed)
+        else:
+            self.events.publish_many(EVENT_TOGGLED, task_ids, None, None,
+                                     map(_TASK_COMPLETED, map(self._tasks.__getitem__, task_ids)))
+    
+    def _notify_changed(self, task_ids: List[int]) -> None:
+        """
+        Pass the IDs of updated, toggled or deleted tasks to every change listener.
+        """
+        for listener in self._change_listeners:
+            listener(task_ids)
+    
+    def _set_text(self, task: Task, title: Optional[str], description: Optional[str]) -> None:
+        """
+        Change a stored task's title and/or description and re-index it.
+        
+        Args:
+            task: The task to change
+            title: The new title, or None to keep the current one
+            description: The new description, or None to keep the current one
+        """
+        self._unindex_text(task)
+        if title is not None and title != task.title:
+            self._title_order.remove(_title_key(task))
+            old_grams = trigrams(task.title.casefold())
+            task.title = title
+            self._title_order.add(_title_key(task))
+            # Only the trigrams the edit removed or introduced change postings
+            new_grams = trigrams(task.title.casefold())
+            self._unindex_grams(task.id, old_grams - new_grams)
+            self._index_grams(task.id, new_grams - old_grams)
+        if description is not None:
+            task.description = description
+        self._index_text(task)
+    
+    def _toggle(self, task: Task) -> None:
+        """
+        Flip a stored task's completion status and move it between status indexes.
+        
+        Args:
+            task: The task to toggle
+        """
+        self._status_index[task.completed].discard(task.id)
+        self._status_order.remove((task.completed, task.id))
+        task.completed = not task.completed
+        self._status_index[task.completed].add(task.id)
+        self._status_order.add((task.completed, task.id))
+        order = self._completion_order
+        if order is not None:
+            if task.completed:
+                order[task.id] = None
+            else:
+                order.pop(task.id, None)
+    
+    def _insert_task(self, task: Task) -> None:
+        """
+        Place a task in storage and in the ordered ID index.
+        
+        Args:
+            task: The task to store; its ID must not already be in use
+        """
+        self._tasks[task.id] = task
+        ids = self._ids
+        if not ids or task.id > ids[-1]:
+            # IDs are handed out in increasing order, so this is the common case
+            ids.append(task.id)
+        else:
+            bisect.insort(ids, task.id)
+        self._status_index[task.completed].add(task.id)
+        self._title_order.add(_title_key(task))
+        self._status_order.add(_status_key(task))
+        self._index_text(task)
+        self._index_grams(task.id, trigrams(task.title.casefold()))
+        if task.completed and self._completion_order is not None:
+            self._completion_order[task.id] = None
+    
+    def _remove_task(self, task_id: int) -> Task:
+        """
+        Remove a task from storage and from the ordered ID index.
+        
+        Args:
+            task_id: The ID of a task that is currently stored
+            
+        Returns:
+            The removed Task object
+        """
+        task = self._tasks.pop(task_id)
+        ids = self._ids
+        del ids[bisect.bisect_left(ids, task_id)]
+        self._title_order.remove(_title_key(task))
+        self._status_order.remove(_status_key(task))
+        self._unindex_task(task)
+        if self._completion_order is not None:
+            self._completion_order.pop(task_id, None)
+        return task
+    
+    def _append_tasks(self, tasks: List[Task]) -> None:
+        """
+        Place new tasks whose IDs are all above every stored ID into storage.
+        
+        Args:
+            tasks: The tasks to store, in ascending ID order
+        """
+        stored = self._tasks
+        status_index = self._status_index
+        for task in tasks:
+            stored[task.id] = task
+            status_index[task.completed].add(task.id)
+            self._index_text(task)
+            self._index_grams(task.id, trigrams(task.title.casefold()))
+        self._ids.extend(task.id for task in tasks)
+        self._title_order.update(map(_title_key, tasks))
+        self._status_order.update(map(_status_key, tasks))
+        if self._completion_order is not None:
+            self._completion_order.update(dict.fromkeys(task.id for task in tasks if task.completed))
+    
+    def _insert_tasks(self, tasks: List[Task]) -> None:
+        """
+        Place several tasks in storage, merging their IDs into the ID index at once.
+        
+        Args:
+            tasks: The tasks to store; their IDs must not already be in use
+        """
+        if len(tasks) < 16:
+            for task in tasks:
+                self._insert_task(task)
+            return
+        
+        for task in tasks:
+            self._tasks[task.id] = task
+            self._status_index[task.completed].add(task.id)
+            self._index_text(task)
+            self._index_grams(task.id, trigrams(task.title.casefold()))
+        self._ids = list(heapq.merge(self._ids, sorted(task.id for task in tasks)))
+        self._title_order.update(map(_title_key, tasks))
+        self._status_order.update(map(_status_key, tasks))
+        if self._completion_order is not None:
+            self._completion_order.update(dict.fromkeys(task.id for task in tasks if task.completed))
+    
+    def _remove_tasks(self, task_ids: List[int]) -> List[Task]:
+        """
+        Remove several stored tasks, rebuilding the ID index in a single pass.
+        
+        Args:
+            task_ids: The IDs of tasks that are currently stored
+        
+        Returns:
+            The removed Task objects, in the order of task_ids
+        """
+        if len(task_ids) < 16:
+            return [self._remove_task(task_id) for task_id in task_ids]
+        
+        tasks = self._tasks
+        removed = [tasks.pop(task_id) for task_id in task_ids]
+        for task in removed:
+            self._unindex_task(task)
+        gone = set(task_ids)
+        self._ids = [task_id for task_id in self._ids if task_id not in gone]
+        self._title_order.remove_many(map(_title_key, removed))
+        self._status_order.remove_many(map(_status_key, removed))
+        order = self._completion_order
+        if order is not None:
+            for task_id in task_ids:
+                order.pop(task_id, None)
+        return removed
+    
+    def _unindex_task(self, task: Task) -> None:
+        """
+        Remove a task from the status, token and trigram indexes.
+        
+        Args:
+            task: The task being removed from storage
+        """
+        self._status_index[task.completed].discard(task.id)
+        self._unindex_text(task)
+        self._unindex_grams(task.id, trigrams(task.title.casefold()))
+    
+    def _index_text(self, task: Task) -> None:
+        """
+        Add a task's title and description words to the token index.
+        
+        Args:
+            task: The task to index
+        """
+        index = self._token_index
+        for token in self._task_tokens(task):
+            ids = index.get(token)
+            if ids is None:
+                index[token] = {task.id}
+            else:
+                ids.add(task.id)
+    
+    def _unindex_text(self, task: Task) -> None:
+        """
+        Remove a task's title and description words from the token index.
+        
+        Args:
+            task: The task to remove from the index
+        """
+        index = self._token_index
+        for token in self._task_tokens(task):
+            ids = index.get(token)
+            if ids is not None:
+                ids.discard(task.id)
+                if not ids:
+                    del index[token]
+    
+    def _index_grams(self, task_id: int, grams: Iterable[str]) -> None:
+        """
+        Add a task to the postings of some of its title trigrams.
+        
+        Args:
+            task_id: The ID of the task
+            grams: Trigrams of its case-folded title
+        """
+        index = self._gram_index
+        for gram in grams:
+            ids = index.get(gram)
+            if ids is None:
+                index[gram] = {task_id}
+            else:
+                ids.add(task_id)
+    
+    def _unindex_grams(self, task_id: int, grams: Iterable[str]) -> None:
+        """
+        Remove a task from the postings of some trigrams.
+        
+        Args:
+            task_id: The ID of the task
+            grams: Trigrams its case-folded title no longer contains
+        """
+        index = self._gram_index
+        for gram in grams:
+            ids = index.get(gram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del index[gram]
+    
+    @staticmethod
+    def _task_tokens(task: Task) -> Iterable[str]:
+        """
+        Collect the distinct words of a task's title and description.
+        
+        Args:
+            task: The task to tokenize
+            
+        Returns:
+            The set of lowercase words used to index the task
+        """
+        return tokenize(task.title) | tokenize(task.description)
+    
+    def _range_ids(self, id_range: range) -> List[int]:
+        """
+        Return the stored IDs in a non-empty range with a positive step, in ascending order.
+        """
+        lo, hi = self._id_bounds(id_range[0], id_range[-1])
+        task_ids = self._ids[lo:hi]
+        if id_range.step != 1:
+            task_ids = [task_id for task_id in task_ids if task_id in id_range]
+        return task_ids
+    
+    def _id_bounds(self, start_id: Optional[int], end_id: Optional[int]) -> Tuple[int, int]:
+        """
+        Translate an inclusive ID range into slice positions of the ID index.
+        
+        Args:
+            start_id: The smallest task ID to include (None for no lower bound)
+            end_id: The largest task ID to include (None for no upper bound)
+            
+        Returns:
+            A (start, stop) pair suitable for slicing the ID index
+        """
+        ids = self._ids
+        lo = 0 if start_id is None else bisect.bisect_left(ids, start_id)
+        hi = len(ids) if end_id is None else bisect.bisect_right(ids, end_id)
+        return lo, max(lo, hi)
\ No newline at end of file
@@ -0,0 +1,464 @@
+"""
+Bulk import and export of tasks for the Todo In-Memory Python Console App.
+
+Four file formats are supported, chosen by name or by file extension:
+
+    csv     Header row "id,title,description,completed", then one row per task
+    jsonl   One {"id", "title", "description", "completed"} object per line
+    bin     The magic bytes b"TODO\\x01", then one record per task: a fixed
+            header (id, flags, title length, description length) followed by
+            the UTF-8 title and description bytes
+    tmap    A memory-mapped store file (see mapped_store), which can also be
+            opened directly as a store with `python -m src.main --open FILE`
+
+Files are read as a stream and validated in chunks of rows (see
+validation.validate_columns), so memory use is bounded by the chunk size
+rather than the file size. Rows that cannot be
+parsed or fail validation are skipped and reported; the rest are imported.
+Imported tasks always receive fresh IDs, so the id field is informational.
+"""
+import bisect
+import csv
+import io
+import json
+import os
+import struct
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .config import TRANSFER_CHUNK_SIZE, TRANSFER_MAX_REPORTED_ERRORS, TRANSFER_READ_BLOCK
+from .models import Task
+
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_BINARY = "bin"
+FORMAT_MAPPED = "tmap"
+
+# File extensions that select a format when none is given explicitly
+EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+    ".bin": FORMAT_BINARY,
+    ".tmap": FORMAT_MAPPED,
+}
+
+CSV_HEADER = ["id", "title", "description", "completed"]
+
+BINARY_MAGIC = b"TODO\x01"
+_BINARY_RECORD = struct.Struct("<QBHH")  # id, flags, title bytes, description bytes
+_BINARY_COMPLETED = 0x01
+
+# Spellings accepted for the completed column of a CSV file
+_TRUE_FLAGS = frozenset(("1", "true", "yes", "done", "x"))
+_FALSE_FLAGS = frozenset(("", "0", "false", "no", "open"))
+
+# A parsed row: (row number, title, description, completed)
+Row = Tuple[int, str, str, bool]
+
+
+class ImportReport:
+    """
+    The outcome of an import.
+    
+    Attributes:
+        imported: The number of tasks added to the store
+        rejected: The number of rows skipped because they were malformed or invalid
+        errors: (row number, message) pairs for the lowest-numbered rejected rows, in row order
+        max_errors: How many rejected rows to keep in errors
+    """
+    
+    def __init__(self, max_errors: int = TRANSFER_MAX_REPORTED_ERRORS):
+        """
+        Initialize an empty report.
+        """
+        self.imported = 0
+        self.rejected = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.max_errors = max_errors
+    
+    def reject(self, row: int, message: str) -> None:
+        """
+        Record a row that was skipped.
+        
+        Rows may be rejected out of order (a chunk's validation errors follow
+        its parse errors), so errors stays sorted and drops its highest row
+        once it is full.
+        
+        Args:
+            row: The row number (the line number for text formats, the record number for bin)
+            message: Why the row was skipped
+        """
+        self.rejected += 1
+        errors = self.errors
+        if len(errors) < self.max_errors or (errors and (row, message) < errors[-1]):
+            bisect.insort(errors, (row, message))
+            if len(errors) > self.max_errors:
+                errors.pop()
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Determine the file format to use for a path.
+    
+    Args:
+        path: The file path
+        fmt: An explicit format name, which takes precedence (optional)
+    
+    Returns:
+        One of the FORMAT_* names
+    
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred from the extension
+    """
+    if fmt is None:
+        fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot tell the format of '{path}'; use a .csv, .jsonl, .bin or .tmap file or --format")
+    if fmt not in _READERS:
+        raise ValueError(f"Unknown format '{fmt}' (expected one of: {', '.join(_READERS)})")
+    return fmt
+
+
+def read_tasks(path: str, report: ImportReport, fmt: Optional[str] = None,
+               chunk_size: int = TRANSFER_CHUNK_SIZE) -> Iterator[List[Row]]:
+    """
+    Stream the parsed rows of a file in chunks.
+    
+    Rows that cannot be parsed are reported and left out; pass each chunk to
+    build_tasks to validate it and create its tasks.
+    
+    Args:
+        path: The file to read
+        report: Receives every rejected row
+        fmt: The file format (optional, inferred from the extension)
+        chunk_size: The number of rows read together
+    
+    Returns:
+        An iterator of lists of at most chunk_size parsed rows
+    
+    Raises:
+        ValueError: If the format is unknown or the file is not in that format
+        OSError: If the file cannot be read
+    """
+    fmt = detect_format(path, fmt)
+    with open(path, "rb") as stream:
+        rows = _READERS[fmt](stream, report)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def build_tasks(rows: List[Row], first_id: int, report: ImportReport) -> List[Task]:
+    """
+    Validate a chunk of parsed rows as columns and create tasks from the valid ones.
+    
+    Args:
+        rows: The parsed rows
+        first_id: The ID of the first created task; the others follow consecutively
+        report: Receives every row that fails validation
+    
+    Returns:
+        The new tasks, in row order
+    """
+    if not rows:
+        return []
+    
+    numbers, titles, descriptions, completed = zip(*rows)
+    tasks, errors = Task.batch(first_id, titles, descriptions, completed)
+    for index, message in errors:
+        report.reject(numbers[index], message)
+    return tasks
+
+
+def write_tasks(path: str, tasks: Iterable[Task], fmt: Optional[str] = None) -> int:
+    """
+    Write tasks to a file, replacing it only once the export is complete.
+    
+    Args:
+        path: The file to write
+        tasks: The tasks to export, in the order they should appear
+        fmt: The file format (optional, inferred from the extension)
+    
+    Returns:
+        The number of tasks written
+    
+    Raises:
+        ValueError: If the format is unknown
+        OSError: If the file cannot be written
+    """
+    fmt = detect_format(path, fmt)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as stream:
+            count = _WRITERS[fmt](stream, tasks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def _read_csv(stream: BinaryIO, report: ImportReport) -> Iterator[Row]:
+    """
+    Parse the rows of a CSV file with a header row naming its columns.
+    
+    Only the title column is required; description defaults to empty and
+    completed to false. Row numbers count the header as row 1. A row the
+    csv module cannot parse (such as one with a field longer than
+    csv.field_size_limit()) is rejected, and reading goes on with the next line.
+    
+    Raises:
+        ValueError: If the header row is missing, has no title column or cannot be parsed
+    """
+    text = _text(stream)
+    reader = csv.reader(text)
+    try:
+        header = next(reader, None)
+    except csv.Error as e:
+        raise ValueError(f"CSV header row cannot be parsed: {e}") from e
+    columns = [name.strip().lower() for name in header or ()]
+    if "title" not in columns:
+        raise ValueError("CSV file must start with a header row containing a 'title' column")
+    
+    title_at = columns.index("title")
+    description_at = columns.index("description") if "description" in columns else None
+    completed_at = columns.index("completed") if "completed" in columns else None
+    width = len(columns)
+    
+    row = 1
+    while True:
+        try:
+            fields = next(reader, None)
+        except csv.Error as e:
+            row += 1
+            report.reject(row, f"Malformed CSV row: {e}")
+            continue
+        if fields is None:
+            break
+        row += 1
+        if not fields:
+            continue
+        if len(fields) != width:
+            report.reject(row, f"Expected {width} fields, found {len(fields)}")
+            continue
+        
+        completed = False
+        if completed_at is not None:
+            flag = fields[completed_at].strip().lower()
+            if flag in _TRUE_FLAGS:
+                completed = True
+            elif flag not in _FALSE_FLAGS:
+                report.reject(row, f"Invalid completed value: {fields[completed_at]!r}")
+                continue
+        
+        description = fields[description_at] if description_at is not None else ""
+        yield row, fields[title_at], description, completed
+
+
+def _read_jsonl(stream: BinaryIO, report: ImportReport) -> Iterator[Row]:
+    """
+    Parse one JSON object per line; blank lines are skipped.
+    """
+    for row, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            report.reject(row, f"Invalid JSON: {e}")
+            continue
+        
+        if not isinstance(record, dict):
+            report.reject(row, "Expected a JSON object")
+            continue
+        title = record.get("title")
+        description = record.get("description", "")
+        completed = record.get("completed", False)
+        if not isinstance(title, str) or not isinstance(description, str) or not isinstance(completed, bool):
+            report.reject(row, "title and description must be strings and completed a boolean")
+            continue
+        yield row, title, description, completed
+
+
+def _read_binary(stream: BinaryIO, report: ImportReport) -> Iterator[Row]:
+    """
+    Parse length-prefixed binary records, reading the file in fixed-size blocks.
+    """
+    if stream.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Not a binary task file (bad magic bytes)")
+    
+    header_size = _BINARY_RECORD.size
+    unpack = _BINARY_RECORD.unpack_from
+    buffer = b""
+    row = 0
+    while True:
+        block = stream.read(TRANSFER_READ_BLOCK)
+        if not block:
+            break
+        buffer += block
+        
+        offset = 0
+        end = len(buffer)
+        while end - offset >= header_size:
+            _, flags, title_size, description_size = unpack(buffer, offset)
+            start = offset + header_size
+            split = start + title_size
+            stop = split + description_size
+            if stop > end:
+                break  # The rest of this record is in the next block
+            
+            row += 1
+            offset = stop
+            try:
+                title = buffer[start:split].decode("utf-8")
+                description = buffer[split:stop].decode("utf-8")
+            except UnicodeDecodeError:
+                report.reject(row, "Text is not valid UTF-8")
+                continue
+            yield row, title, description, bool(flags & _BINARY_COMPLETED)
+        buffer = buffer[offset:]
+    
+    if buffer:
+        report.reject(row + 1, "Truncated record at end of file")
+
+
+def _read_mapped(stream: BinaryIO, report: ImportReport) -> Iterator[Row]:
+    """
+    Read the tasks of a mapped store file in ID order, straight from the mapping.
+    """
+    from .mapped_store import MappedTasks
+    
+    tasks = MappedTasks(stream)
+    try:
+        for pos in range(len(tasks)):
+            try:
+                task = tasks.task_at(pos)
+            except UnicodeDecodeError:
+                report.reject(pos + 1, "Text is not valid UTF-8")
+                continue
+            yield pos + 1, task.title, task.description, task.completed
+    finally:
+        tasks.close()
+
+
+def _write_csv(stream: BinaryIO, tasks: Iterable[Task]) -> int:
+    """
+    Write tasks as CSV rows after a header row.
+    """
+    text = _text(stream)
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    counter = _Counter(tasks)
+    writer.writerows((task.id, task.title, task.description, "true" if task.completed else "false")
+                     for task in counter)
+    text.flush()
+    text.detach()
+    return counter.count
+
+
+def _write_jsonl(stream: BinaryIO, tasks: Iterable[Task]) -> int:
+    """
+    Write one JSON object per task, a chunk of lines at a time.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    for chunk in _chunks(tasks):
+        lines = [dumps({"id": task.id, "title": task.title, "description": task.description,
+                        "completed": task.completed})
+                 for task in chunk]
+        lines.append("")
+        stream.write("\n".join(lines).encode("utf-8"))
+        count += len(chunk)
+    return count
+
+
+def _write_binary(stream: BinaryIO, tasks: Iterable[Task]) -> int:
+    """
+    Write length-prefixed binary records, a chunk of tasks at a time.
+    """
+    pack = _BINARY_RECORD.pack
+    stream.write(BINARY_MAGIC)
+    count = 0
+    for chunk in _chunks(tasks):
+        parts = []
+        for task in chunk:
+            title = task.title.encode("utf-8")
+            description = task.description.encode("utf-8")
+            parts.append(pack(task.id, _BINARY_COMPLETED if task.completed else 0, len(title), len(description)))
+            parts.append(title)
+            parts.append(description)
+        stream.write(b"".join(parts))
+        count += len(chunk)
+    return count
+
+
+def _write_mapped(stream: BinaryIO, tasks: Iterable[Task]) -> int:
+    """
+    Write a mapped store file; its columns need every task in memory at once.
+    """
+    from .mapped_store import write_store
+    
+    return write_store(stream, tasks)
+
+
+def _text(stream: BinaryIO) -> TextIO:
+    """
+    Wrap a binary stream for CSV reading or writing as UTF-8 text.
+    """
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+def _chunks(tasks: Iterable[Task]) -> Iterator[List[Task]]:
+    """
+    Split an iterable of tasks into lists of at most TRANSFER_CHUNK_SIZE tasks.
+    """
+    tasks = iter(tasks)
+    while True:
+        chunk = list(islice(tasks, TRANSFER_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Counter:
+    """
+    Pass tasks through while counting them.
+    """
+    
+    def __init__(self, tasks: Iterable[Task]):
+        """
+        Args:
+            tasks: The tasks to pass through
+        """
+        self._tasks = tasks
+        self.count = 0
+    
+    def __iter__(self) -> Iterator[Task]:
+        """
+        Yield each task, counting as it goes.
+        """
+        for task in self._tasks:
+            self.count += 1
+            yield task
+
+
+_READERS: Dict[str, Callable[[BinaryIO, ImportReport], Iterator[Row]]] = {
+    FORMAT_CSV: _read_csv,
+    FORMAT_JSONL: _read_jsonl,
+    FORMAT_BINARY: _read_binary,
+    FORMAT_MAPPED: _read_mapped,
+}
+
+_WRITERS: Dict[str, Callable[[BinaryIO, Iterable[Task]], int]] = {
+    FORMAT_CSV: _write_csv,
+    FORMAT_JSONL: _write_jsonl,
+    FORMAT_BINARY: _write_binary,
+    FORMAT_MAPPED: _write_mapped,
+}
+
+FORMATS = tuple(_READERS)
@@ -1,29 +1,151 @@
 """
 Console presentation layer for the Todo In-Memory Python Console App.
 """
-from typing import List
+import sys
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from .events import ChangeEvent
 from .models import Task
-from .config import BOX_CHARS, COLORS, STATUS_SYMBOLS, TABLE_MIN_WIDTHS
+from .config import BOX_CHARS, COLORS, ROW_CACHE_MAX_ROWS, STATUS_SYMBOLS, TABLE_MIN_WIDTHS, TABLE_PAGE_SIZE
+from .registry import help_rows
 from .utils import truncate_string
 
 
+NO_TASKS_MESSAGE = "\nNo tasks found. Add some tasks to get started!\n"
+
+# The welcome header, built on first use; commands are all registered by then
+_welcome_header: Optional[str] = None
+
+
+class RowCache:
+    """
+    A size-bounded LRU cache of formatted task table rows.
+    
+    Rows are keyed by task ID and remember the task object and the ID column
+    width they were formatted for; the other column widths are shared by all
+    entries, and a change to them empties the cache. A row is reused only for
+    the same task object at the same widths, so stores that replace tasks on
+    change never get a stale row, while stores that modify tasks in place must
+    report every changed ID to invalidate.
+    """
+    
+    def __init__(self, max_rows: int = ROW_CACHE_MAX_ROWS):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_rows: The number of rows kept before the least recently used are evicted
+        """
+        self.max_rows = max_rows
+        self._rows: "OrderedDict[int, Tuple[Task, int, str]]" = OrderedDict()
+        self._widths: Optional[Tuple[int, ...]] = None
+    
+    def __len__(self) -> int:
+        """
+        Return the number of cached rows.
+        """
+        return len(self._rows)
+    
+    def invalidate(self, task_ids: Iterable[int]) -> None:
+        """
+        Drop the rows of tasks that changed or were deleted.
+        
+        Args:
+            task_ids: The IDs of the affected tasks
+        """
+        pop = self._rows.pop
+        for task_id in task_ids:
+            pop(task_id, None)
+    
+    def clear(self) -> None:
+        """
+        Drop every cached row.
+        """
+        self._rows.clear()
+    
+    def rows(self, tasks: List[Task], id_width: int, widths: Tuple[int, ...],
+             build: Callable[[Task], str]) -> List[str]:
+        """
+        Return the formatted rows of tasks, building and caching the missing ones.
+        
+        Args:
+            tasks: The tasks to format
+            id_width: The width of the ID column
+            widths: The widths of the remaining columns
+            build: Formats the row of one task
+        
+        Returns:
+            One row per task, in the order of tasks
+        """
+        cached = self._rows
+        if widths != self._widths:
+            cached.clear()
+            self._widths = widths
+        
+        get = cached.get
+        touch = cached.move_to_end
+        max_rows = self.max_rows
+        lines = []
+        append = lines.append
+        for task in tasks:
+            task_id = task.id
+            entry = get(task_id)
+            if entry is not None and entry[0] is task and entry[1] == id_width:
+                touch(task_id)
+                append(entry[2])
+                continue
+            
+            line = build(task)
+            cached[task_id] = (task, id_width, line)
+            if entry is not None:
+                touch(task_id)
+            elif len(cached) > max_rows:
+                cached.popitem(last=False)
+            append(line)
+        return lines
+
+
+def format_welcome_header() -> str:
+    """
+    Return the welcome header and command hints shown on startup and by 'help'.
+    
+    The text is built once and reused.
+    
+    Returns:
+        The header text, ending with a blank line
+    """
+    global _welcome_header
+    if _welcome_header is None:
+        _welcome_header = _build_welcome_header()
+    return _welcome_header
+
+
+def _build_welcome_header() -> str:
+    """
+    Build the welcome header from the config and the command registry.
+    """
+    lines = [
+        f"\n{BOX_CHARS['top_left']}{BOX_CHARS['horizontal'] * 50}{BOX_CHARS['top_right']}",
+        f"{BOX_CHARS['vertical']} {COLORS['success']}Todo In-Memory Python Console App{COLORS['reset']} {' ' * 14}{BOX_CHARS['vertical']}",
+        f"{BOX_CHARS['vertical']} Version 1.0.0 - Manage your tasks in memory      {BOX_CHARS['vertical']}",
+        f"{BOX_CHARS['bottom_left']}{BOX_CHARS['horizontal'] * 50}{BOX_CHARS['bottom_right']}",
+        "\nAvailable commands:",
+    ]
+    
+    # Command hints come from the command registry
+    rows = help_rows()
+    syntax_width = max(len(syntax) for syntax, _ in rows)
+    lines.extend(f"  {syntax:<{syntax_width}} - {summary}" for syntax, summary in rows)
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+
 def print_welcome_header():
     """
-    Print the welcome header and command hints on startup.
+    Print the welcome header and command hints on startup, in a single write.
     """
-    print(f"\n{BOX_CHARS['top_left']}{BOX_CHARS['horizontal'] * 50}{BOX_CHARS['top_right']}")
-    print(f"{BOX_CHARS['vertical']} {COLORS['success']}Todo In-Memory Python Console App{COLORS['reset']} {' ' * 14}{BOX_CHARS['vertical']}")
-    print(f"{BOX_CHARS['vertical']} Version 1.0.0 - Manage your tasks in memory      {BOX_CHARS['vertical']}")
-    print(f"{BOX_CHARS['bottom_left']}{BOX_CHARS['horizontal'] * 50}{BOX_CHARS['bottom_right']}")
-    print("\nAvailable commands:")
-    print("  add \"title\" \"description\"    - Add a new task")
-    print("  list                        - List all tasks")
-    print("  update <id> \"title\" \"desc\"  - Update a task")
-    print("  delete <id>                 - Delete a task")
-    print("  toggle <id>                 - Toggle task status")
-    print("  help                        - Show this help")
-    print("  quit/exit                   - Exit the app")
-    print()
+    sys.stdout.write(format_welcome_header())
 
 
 def print_success_message(message: str):
@@ -46,65 +168,122 @@ def print_error_message(message: str):
     print(f"✗ {message}")
 
 
-def print_task_table(tasks: List[Task]):
+def format_task_table(tasks: List[Task], row_cache: Optional[RowCache] = None) -> str:
     """
-    Print all tasks in a formatted table with Unicode box characters.
+    Format tasks as a table with Unicode box characters.
     
     Args:
         tasks: List of Task objects to display
+        row_cache: Reuses rows formatted by earlier tables (optional)
+        
+    Returns:
+        The table text, ending with a newline
     """
     if not tasks:
-        print("\nNo tasks found. Add some tasks to get started!")
+        return NO_TASKS_MESSAGE
+    return _format_table_page(tasks, row_cache)
+
+
+def iter_task_table(tasks: Iterable[Task], page_size: int = TABLE_PAGE_SIZE,
+                    row_cache: Optional[RowCache] = None) -> Iterator[str]:
+    """
+    Lazily format tasks as a sequence of tables of at most page_size rows.
+    
+    Only one page of tasks is held at a time, and each page is returned as a
+    single string so it can be written out in one call.
+    
+    Args:
+        tasks: Any iterable of Task objects, consumed lazily
+        page_size: The maximum number of rows per table
+        row_cache: Reuses rows formatted by earlier tables (optional)
+        
+    Returns:
+        An iterator of table texts, one per page
+    """
+    iterator = iter(tasks)
+    page = list(islice(iterator, page_size))
+    if not page:
+        yield NO_TASKS_MESSAGE
         return
+    
+    while page:
+        yield _format_table_page(page, row_cache)
+        page = list(islice(iterator, page_size))
+
 
-    # Define column widths based on minimums and content
-    id_width = max(TABLE_MIN_WIDTHS['id'], len('ID'))
+def _format_table_page(tasks: List[Task], row_cache: Optional[RowCache] = None) -> str:
+    """
+    Format one non-empty page of tasks as a complete table.
+    
+    Args:
+        tasks: The tasks on the page
+        row_cache: Reuses rows formatted by earlier tables (optional)
+        
+    Returns:
+        The table text, ending with a newline
+    """
+    # Titles and descriptions are truncated to their column width, so only the
+    # ID column can grow beyond its minimum
+    id_width = max(TABLE_MIN_WIDTHS['id'], len('ID'), len(str(max(task.id for task in tasks))))
     status_width = max(TABLE_MIN_WIDTHS['status'], len('Status'))
     title_width = max(TABLE_MIN_WIDTHS['title'], len('Title'))
     desc_width = max(TABLE_MIN_WIDTHS['description'], len('Description'))
     
-    # Calculate actual widths based on content if needed
-    for task in tasks:
-        id_width = max(id_width, len(str(task.id)))
-        title_width = max(title_width, len(truncate_string(task.title, title_width)))
-        desc_width = max(desc_width, len(truncate_string(task.description, desc_width)))
-    
-    # Ensure minimum widths
-    id_width = max(id_width, TABLE_MIN_WIDTHS['id'])
-    status_width = max(status_width, TABLE_MIN_WIDTHS['status'])
-    title_width = max(title_width, TABLE_MIN_WIDTHS['title'])
-    desc_width = max(desc_width, TABLE_MIN_WIDTHS['description'])
-    
-    # Calculate total width
-    total_width = id_width + status_width + title_width + desc_width + 9  # 9 for separators and padding
-    
-    # Print table header
-    print(f"\n{BOX_CHARS['top_left']}{BOX_CHARS['horizontal'] * (id_width + 2)}{BOX_CHARS['top_cross']}"
-          f"{BOX_CHARS['horizontal'] * (status_width + 2)}{BOX_CHARS['top_cross']}"
-          f"{BOX_CHARS['horizontal'] * (title_width + 2)}{BOX_CHARS['top_cross']}"
-          f"{BOX_CHARS['horizontal'] * (desc_width + 2)}{BOX_CHARS['top_right']}")
-    
-    print(f"{BOX_CHARS['vertical']} {'ID':>{id_width}} {BOX_CHARS['vertical']} {'Status':^{status_width}} "
-          f"{BOX_CHARS['vertical']} {'Title':<{title_width}} {BOX_CHARS['vertical']} {'Description':<{desc_width}} "
-          f"{BOX_CHARS['vertical']}")
-    
-    print(f"{BOX_CHARS['left_cross']}{BOX_CHARS['horizontal'] * (id_width + 2)}{BOX_CHARS['cross']}"
-          f"{BOX_CHARS['horizontal'] * (status_width + 2)}{BOX_CHARS['cross']}"
-          f"{BOX_CHARS['horizontal'] * (title_width + 2)}{BOX_CHARS['cross']}"
-          f"{BOX_CHARS['horizontal'] * (desc_width + 2)}{BOX_CHARS['right_cross']}")
-    
-    # Print task rows
-    for task in tasks:
-        status = STATUS_SYMBOLS['complete'] if task.completed else STATUS_SYMBOLS['incomplete']
-        title = truncate_string(task.title, title_width)
-        description = truncate_string(task.description, desc_width)
-        
-        print(f"{BOX_CHARS['vertical']} {task.id:>{id_width}} {BOX_CHARS['vertical']} {status:^{status_width}} "
-              f"{BOX_CHARS['vertical']} {title:<{title_width}} {BOX_CHARS['vertical']} {description:<{desc_width}} "
-              f"{BOX_CHARS['vertical']}")
-    
-    # Print table footer
-    print(f"{BOX_CHARS['bottom_left']}{BOX_CHARS['horizontal'] * (id_width + 2)}{BOX_CHARS['bottom_cross']}"
-          f"{BOX_CHARS['horizontal'] * (status_width + 2)}{BOX_CHARS['bottom_cross']}"
-          f"{BOX_CHARS['horizontal'] * (title_width + 2)}{BOX_CHARS['bottom_cross']}"
-          f"{BOX_CHARS['horizontal'] * (desc_width + 2)}{BOX_CHARS['bottom_right']}")
\ No newline at end of file
+    horizontal = BOX_CHARS['horizontal']
+    vertical = BOX_CHARS['vertical']
+    segments = [horizontal * (width + 2) for width in (id_width, status_width, title_width, desc_width)]
+    row = (f"{vertical} {{:>{id_width}}} {vertical} {{:^{status_width}}} "
+           f"{vertical} {{:<{title_width}}} {vertical} {{:<{desc_width}}} {vertical}").format
+    complete = STATUS_SYMBOLS['complete']
+    incomplete = STATUS_SYMBOLS['incomplete']
+    
+    # Table header
+    lines = [
+        f"\n{BOX_CHARS['top_left']}{BOX_CHARS['top_cross'].join(segments)}{BOX_CHARS['top_right']}",
+        row('ID', 'Status', 'Title', 'Description'),
+        f"{BOX_CHARS['left_cross']}{BOX_CHARS['cross'].join(segments)}{BOX_CHARS['right_cross']}",
+    ]
+    
+    # Task rows
+    def build(task: Task) -> str:
+        return row(task.id, complete if task.completed else incomplete,
+                   truncate_string(task.title, title_width),
+                   truncate_string(task.description, desc_width))
+    
+    if row_cache is not None:
+        lines.extend(row_cache.rows(tasks, id_width, (status_width, title_width, desc_width), build))
+    else:
+        lines.extend(map(build, tasks))
+    
+    # Table footer
+    lines.append(f"{BOX_CHARS['bottom_left']}{BOX_CHARS['bottom_cross'].join(segments)}{BOX_CHARS['bottom_right']}")
+    
+    return "\n".join(lines) + "\n"
+
+
+def format_events(events: Iterable[ChangeEvent]) -> str:
+    """
+    Format change events as one line each, e.g. "#12 updated task 5: title='Buy milk'".
+    
+    Args:
+        events: The events to format
+    
+    Returns:
+        The event lines, each ending with a newline
+    """
+    lines = []
+    for event in events:
+        fields = ", ".join(f"{name}={value!r}" for name, value in event.fields().items())
+        lines.append(f"#{event.seq} {event.kind} task {event.task_id}" + (f": {fields}" if fields else ""))
+    return "".join(line + "\n" for line in lines)
+
+
+def print_task_table(tasks: List[Task], row_cache: Optional[RowCache] = None):
+    """
+    Print all tasks in a formatted table with Unicode box characters.
+    
+    Args:
+        tasks: List of Task objects to display
+        row_cache: Reuses rows formatted by earlier tables (optional)
+    """
+    print(format_task_table(tasks, row_cache), end="")
\ No newline at end of file
@@ -1,6 +1,12 @@
 """
 Utility functions for the Todo In-Memory Python Console App.
 """
+import re
+from typing import Set
+
+
+# Words are runs of letters, digits and underscores; matching is case-insensitive
+_WORD_PATTERN = re.compile(r"\w+")
 
 
 def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
@@ -37,4 +43,30 @@ def safe_string(text: str) -> str:
     """
     if text is None:
         return ""
-    return str(text)
\ No newline at end of file
+    return str(text)
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into the set of lowercase words used for search indexing.
+    
+    Args:
+        text: The text to tokenize
+        
+    Returns:
+        The distinct lowercase words found in the text
+    """
+    return set(_WORD_PATTERN.findall(text.lower()))
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split text into the set of its three-character substrings, used for fuzzy title lookup.
+    
+    Args:
+        text: The text to split, already case-folded by the caller
+        
+    Returns:
+        The distinct three-character substrings (empty for text shorter than three characters)
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
\ No newline at end of file
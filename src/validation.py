@@ -0,0 +1,141 @@
+"""
+Task field validation for the Todo In-Memory Python Console App.
+
+The same rules apply everywhere a title or description enters the store: a
+title must not be blank, and neither field may exceed its configured maximum
+length. validate_fields checks one task; validate_columns checks whole columns
+of titles and descriptions at once and reports every invalid row.
+
+Column validation runs C-level map() passes over each column, so no Python
+bytecode runs per row. Clean columns are confirmed with short-circuiting
+max/all/any passes; only when one of them fails are the invalid rows located,
+using NumPy boolean masks when NumPy is installed. NumPy is only imported
+the first time it is needed, so it never slows down startup. Error messages
+are only built for the rows that fail.
+"""
+from itertools import compress, count
+from operator import not_
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .config import MAX_DESCRIPTION_LENGTH, MAX_TITLE_LENGTH
+
+
+TITLE_EMPTY = "Task title cannot be empty"
+TITLE_TOO_LONG = f"Task title cannot exceed {MAX_TITLE_LENGTH} characters"
+DESCRIPTION_TOO_LONG = f"Task description cannot exceed {MAX_DESCRIPTION_LENGTH} characters"
+
+# Columns shorter than this are checked without NumPy, whose setup costs more than it saves
+_NUMPY_MIN_ROWS = 256
+
+# The numpy module once imported, False if it is not installed, None before the first attempt
+_numpy = None
+
+
+def load_numpy():
+    """
+    Import NumPy on first use.
+    
+    NumPy is optional; without it the pure-Python path gives the same results.
+    
+    Returns:
+        The numpy module, or None if it is not installed
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def validate_fields(title: Optional[str], description: Optional[str]) -> Optional[str]:
+    """
+    Check the fields of a single task.
+    
+    Args:
+        title: The title to check, or None to skip it
+        description: The description to check, or None to skip it
+    
+    Returns:
+        The error message for the first rule broken, or None if the fields are valid
+    """
+    if title is not None:
+        if not title or title.isspace():
+            return TITLE_EMPTY
+        if len(title) > MAX_TITLE_LENGTH:
+            return TITLE_TOO_LONG
+    if description is not None and len(description) > MAX_DESCRIPTION_LENGTH:
+        return DESCRIPTION_TOO_LONG
+    return None
+
+
+def validate_columns(titles: Sequence[str], descriptions: Sequence[str]) -> List[Tuple[int, str]]:
+    """
+    Check whole columns of titles and descriptions without stopping at the first error.
+    
+    Args:
+        titles: One title per row
+        descriptions: One description per row, aligned with titles
+    
+    Returns:
+        (row index, error message) pairs for every invalid row, in row order;
+        each row reports the same error validate_fields would
+    
+    Raises:
+        ValueError: If the columns have different lengths
+    """
+    if len(titles) != len(descriptions):
+        raise ValueError("Title and description columns must have the same length")
+    
+    if not titles:
+        return []
+    if (max(map(len, titles)) <= MAX_TITLE_LENGTH and max(map(len, descriptions), default=0) <= MAX_DESCRIPTION_LENGTH
+            and all(titles) and not any(map(str.isspace, titles))):
+        return []
+    
+    numpy = load_numpy() if len(titles) >= _NUMPY_MIN_ROWS else None
+    if numpy is not None:
+        errors = _column_errors_numpy(numpy, titles, descriptions)
+    else:
+        errors = _column_errors(titles, descriptions)
+    return sorted(errors.items())
+
+
+def _column_errors(titles: Sequence[str], descriptions: Sequence[str]) -> Dict[int, str]:
+    """
+    Find invalid rows with C-level passes over each column.
+    
+    Later passes overwrite earlier ones, so a row reports the rule that
+    validate_fields checks first.
+    """
+    errors = dict.fromkeys(compress(count(), map(MAX_DESCRIPTION_LENGTH.__lt__, map(len, descriptions))),
+                           DESCRIPTION_TOO_LONG)
+    errors.update(dict.fromkeys(compress(count(), map(MAX_TITLE_LENGTH.__lt__, map(len, titles))),
+                                TITLE_TOO_LONG))
+    errors.update(dict.fromkeys(compress(count(), map(str.isspace, titles)), TITLE_EMPTY))
+    errors.update(dict.fromkeys(compress(count(), map(not_, titles)), TITLE_EMPTY))
+    return errors
+
+
+def _column_errors_numpy(numpy, titles: Sequence[str], descriptions: Sequence[str]) -> Dict[int, str]:
+    """
+    Find invalid rows by combining per-column length and blank arrays as NumPy masks.
+    """
+    rows = len(titles)
+    title_lengths = numpy.fromiter(map(len, titles), dtype=numpy.int64, count=rows)
+    description_lengths = numpy.fromiter(map(len, descriptions), dtype=numpy.int64, count=rows)
+    blank = numpy.fromiter(map(str.isspace, titles), dtype=bool, count=rows) | (title_lengths == 0)
+    title_long = title_lengths > MAX_TITLE_LENGTH
+    description_long = description_lengths > MAX_DESCRIPTION_LENGTH
+    
+    errors = {}
+    for row in numpy.flatnonzero(blank | title_long | description_long).tolist():
+        if blank[row]:
+            errors[row] = TITLE_EMPTY
+        elif title_long[row]:
+            errors[row] = TITLE_TOO_LONG
+        else:
+            errors[row] = DESCRIPTION_TOO_LONG
+    return errors
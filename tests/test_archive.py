@@ -0,0 +1,137 @@
+"""
+Tests for the compressed task archive and the memory budget that fills it.
+"""
+import os
+
+import pytest
+
+from src.archive import TaskArchive
+from src.models import Task
+from src.persistence import Journal
+from src.todo_manager import TodoManager
+
+
+def _task(task_id: int) -> Task:
+    """
+    Build a distinct task for an ID.
+    """
+    return Task(task_id, f"Task {task_id}", "x" * (task_id % 7), task_id % 2 == 0)
+
+
+def test_archive_reads_and_takes_tasks():
+    archive = TaskArchive(segment_tasks=100)
+    archive.add([_task(task_id) for task_id in range(300, 0, -2)])
+    archive.add([_task(task_id) for task_id in range(1, 300, 2)])
+    assert len(archive) == 300
+    assert archive.get(157) == _task(157)
+    assert archive.get(301) is None
+    assert [task.id for task in archive] == list(range(1, 301))
+    assert archive.slice(10, 15) == [_task(task_id) for task_id in range(11, 16)]
+    assert archive.ids_between(98, 103) == [98, 99, 100, 101, 102, 103]
+    
+    assert archive.take([5, 6, 7, 999]) == [_task(5), _task(6), _task(7)]
+    assert 6 not in archive and 8 in archive
+    assert archive.get(6) is None
+    assert archive.ids_between(4, 9) == [4, 8, 9]
+    assert archive.select(lambda task: task.id % 50 == 0) == [50, 100, 150, 200, 250, 300]
+    
+    directory = archive.directory
+    archive.close()
+    assert not os.path.exists(directory)
+
+
+def test_archive_drops_emptied_segments():
+    archive = TaskArchive(segment_tasks=10)
+    archive.add([_task(task_id) for task_id in range(1, 31)])
+    files = len(os.listdir(archive.directory))
+    archive.take(range(1, 11))
+    assert len(os.listdir(archive.directory)) == files - 1
+    assert [task.id for task in archive] == list(range(11, 31))
+    archive.close()
+
+
+@pytest.fixture
+def manager():
+    """
+    A store of 1000 tasks, 900 of them completed in ID order, over a budget of 300 tasks.
+    """
+    manager = TodoManager()
+    manager.add_many([(f"Task {i}", f"Description {i}") for i in range(1, 1001)])
+    manager.toggle_many(range(1, 901))
+    assert manager.set_budget(max_tasks=300) == 730
+    yield manager
+    manager.set_budget()
+
+
+def test_budget_archives_least_recently_completed(manager):
+    assert len(manager) == 270
+    assert manager.archived_count() == 730
+    assert [task.id for task in manager.get_archived()] == list(range(1, 731))
+    assert [task.id for task in manager.get_archived(5, 3)] == [6, 7, 8]
+    assert [task.id for task in manager.get_all_tasks()] == list(range(731, 1001))
+
+
+def test_recompleted_task_is_archived_last():
+    manager = TodoManager(max_tasks=1000)  # Completion order is only tracked under a budget
+    manager.add_many([(f"Task {i}", "") for i in range(1, 601)])
+    manager.toggle_many(range(1, 601))
+    manager.toggle_task_status(1)
+    manager.toggle_task_status(1)
+    manager.set_budget(max_tasks=300)
+    assert manager.get_task(1) is not None
+    assert 1 not in {task.id for task in manager.get_archived()}
+
+
+def test_get_task_reads_archived_task_in_place(manager):
+    task = manager.get_task(42)
+    assert (task.id, task.title, task.completed) == (42, "Task 42", True)
+    assert manager.archived_count() == 730
+
+
+def test_changes_fault_archived_tasks_in(manager):
+    assert manager.update_task(42, title="Changed")
+    assert manager.toggle_task_status(43)
+    assert manager.archived_count() == 728
+    assert manager.get_task(42).title == "Changed"
+    assert manager.get_task(43).completed is False
+    assert 43 in {task.id for task in manager.get_tasks_by_status(False)}
+
+
+def test_bulk_changes_cover_archived_tasks(manager):
+    assert manager.delete_many(lambda task: task.completed) == 900
+    assert manager.archived_count() == 0
+    assert len(manager) == 100
+    
+    manager.undo()
+    assert manager.get_task(1).title == "Task 1"
+    assert len(manager) + manager.archived_count() == 1000
+    
+    assert manager.delete_many([range(1, 11), range(725, 735)]) == 20
+    assert manager.get_task(5) is None and manager.get_task(733) is None
+
+
+def test_listeners_hear_about_archived_tasks():
+    manager = TodoManager()
+    heard = []
+    manager.add_change_listener(heard.extend)
+    manager.add_many([(f"Task {i}", "") for i in range(1, 401)])
+    manager.toggle_many(range(1, 401))
+    heard.clear()
+    manager.set_budget(max_tasks=100)
+    assert sorted(heard) == list(range(1, manager.archived_count() + 1))
+
+
+def test_journal_snapshot_includes_archived_tasks(tmp_path):
+    directory = str(tmp_path)
+    journal = Journal(directory, snapshot_every=10)
+    manager = TodoManager(journal=journal, max_tasks=300)
+    manager.add_many([(f"Task {i}", "") for i in range(1, 1001)])
+    manager.toggle_many(range(1, 901))
+    assert manager.archived_count() > 0
+    journal.snapshot()
+    journal.close()
+    
+    restored = TodoManager(journal=Journal(directory))
+    assert restored.archived_count() == 0
+    assert len(restored) == 1000
+    assert len(restored.get_tasks_by_status(True)) == 900
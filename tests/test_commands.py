@@ -0,0 +1,96 @@
+"""
+Tests for command parsing and dispatch in CommandHandler.
+"""
+import time
+
+import pytest
+
+from src.commands import CommandHandler
+from src.todo_manager import TodoManager
+
+
+@pytest.fixture
+def handler() -> CommandHandler:
+    """
+    A command handler over an empty in-memory store.
+    """
+    return CommandHandler(TodoManager())
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("7", range(7, 8)),
+    ("3-900", range(3, 901)),
+    ("1,4,9-12", [range(1, 2), range(4, 5), range(9, 13)]),
+    ("5-5,2", [range(5, 6), range(2, 3)]),
+])
+def test_parse_selector_ranges(handler, text, expected):
+    assert handler._parse_selector([text]) == expected
+
+
+@pytest.mark.parametrize("args", [
+    [""], ["a"], ["5-3"], ["1,,2"], ["-4"], ["4-"], ["1-2-3"], ["٣"], ["1", "2"], [],
+    ["--where"], ["--where", "maybe"], ["--where", "done", "open"],
+])
+def test_parse_selector_rejects_invalid_selections(handler, args):
+    assert handler._parse_selector(args) is None
+
+
+def test_parse_selector_where_matches_status(handler):
+    done = handler._parse_selector(["--where", "done"])
+    open_ = handler._parse_selector(["--where", "open"])
+    manager = handler.todo_manager
+    manager.add_many([("First", ""), ("Second", "")])
+    manager.toggle_task_status(2)
+    assert [done(task) for task in manager.get_all_tasks()] == [False, True]
+    assert [open_(task) for task in manager.get_all_tasks()] == [True, False]
+
+
+def test_bulk_commands_apply_to_selection(handler):
+    handler.todo_manager.add_many([(f"Task {i}", "") for i in range(10)])
+    assert handler.run_command("toggle", ["2-4,8"]).success
+    assert [task.id for task in handler.todo_manager.get_tasks_by_status(True)] == [2, 3, 4, 8]
+    assert handler.run_command("delete", ["--where", "done"]).success
+    assert [task.id for task in handler.todo_manager.get_all_tasks()] == [1, 5, 6, 7, 9, 10]
+
+
+def test_huge_range_costs_only_the_stored_ids(handler):
+    handler.todo_manager.add_task("Only")
+    started = time.perf_counter()
+    result = handler.run_command("delete", ["1,2-20000000000"])
+    assert time.perf_counter() - started < 1
+    assert result.success
+    assert len(handler.todo_manager) == 0
+
+
+def test_filtered_pages_report_status_totals(handler):
+    handler.todo_manager.add_many([(f"Task {i}", "") for i in range(25)])
+    handler.todo_manager.toggle_many(range(1, 26, 2))
+    result = handler.run_command("list", ["--done", "--page", "2", "--page-size", "5"])
+    assert result.message == "Page 2 of 3 (13 tasks)"
+    assert [task.id for task in result.tasks] == [11, 13, 15, 17, 19]
+    assert not handler.run_command("list", ["--open", "--page", "4", "--page-size", "4"]).success
+
+
+def test_transfer_usage_lists_every_format(handler):
+    for command in ("import", "export"):
+        result = handler.run_command(command, [])
+        assert not result.success
+        assert "csv|jsonl|bin|tmap" in result.message
+
+
+def test_disabled_commands_are_refused(tmp_path):
+    handler = CommandHandler(TodoManager(), disabled_commands=("import", "export"))
+    result = handler.run_command("export", [str(tmp_path / "out.csv")])
+    assert not result.success
+    assert result.message == "The export command is not available in this session"
+    assert not (tmp_path / "out.csv").exists()
+    assert handler.run_command("add", ["Still works"]).success
+
+
+def test_import_reports_oversized_csv_field(handler, tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text("title,description\nBefore,\nHuge,\"" + "x" * 200000 + "\"\nAfter,\n", encoding="utf-8")
+    result = handler.run_command("import", [str(source)])
+    assert result.success
+    assert "Malformed CSV row" in result.message
+    assert [task.title for task in handler.todo_manager.get_all_tasks()] == ["Before", "After"]
@@ -0,0 +1,106 @@
+"""
+Tests for MappedTodoManager: its overlay must read exactly like an in-memory store.
+"""
+import pytest
+
+from src.mapped_store import MappedTodoManager
+from src.todo_manager import SORT_KEYS, TodoManager
+
+
+def _assert_same(mapped: MappedTodoManager, reference: TodoManager) -> None:
+    """
+    Check that every read of the mapped store matches the reference store.
+    """
+    assert len(mapped) == len(reference)
+    assert mapped.get_all_tasks() == reference.get_all_tasks()
+    assert list(mapped.iter_tasks(5, 40)) == list(reference.iter_tasks(5, 40))
+    assert mapped.get_tasks_in_range(10, 30) == reference.get_tasks_in_range(10, 30)
+    for task_id in range(0, 70):
+        assert mapped.get_task(task_id) == reference.get_task(task_id)
+    for page in range(1, 6):
+        assert mapped.get_page(page, 7) == reference.get_page(page, 7)
+    for completed in (True, False):
+        assert mapped.get_tasks_by_status(completed) == reference.get_tasks_by_status(completed)
+        assert mapped.count_by_status(completed) == reference.count_by_status(completed)
+    for sort in SORT_KEYS:
+        for descending in (False, True):
+            for completed in (None, True, False):
+                assert (mapped.get_sorted(sort, descending, 3, 10, completed)
+                        == reference.get_sorted(sort, descending, 3, 10, completed))
+    assert mapped.search_tasks("even") == reference.search_tasks("even")
+    assert mapped.find_by_prefix("task 1") == reference.find_by_prefix("task 1")
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """
+    A mapped store and an in-memory store holding the same tasks.
+    """
+    reference = TodoManager()
+    reference.add_many([(f"Task {i}", "even" if i % 2 == 0 else "odd") for i in range(50)])
+    reference.toggle_many(range(1, 51, 3))
+    reference.delete_many([range(7, 9), range(30, 31)])  # Gaps in the mapped IDs
+    path = str(tmp_path / "tasks.tmap")
+    reference.export_tasks(path)
+    
+    mapped = MappedTodoManager(path)
+    reference.clear_history()
+    yield mapped, reference
+    mapped.close()
+
+
+def test_file_reads_like_the_store(stores):
+    mapped, reference = stores
+    _assert_same(mapped, reference)
+    assert mapped.add_task("New").id == reference.add_task("New").id == 51
+
+
+def test_mutations_overlay_the_file(stores):
+    mapped, reference = stores
+    for store in stores:
+        store.update_task(3, title="Renamed", description="even now")
+        store.toggle_task_status(10)
+        store.delete_task(12)
+        store.add_task("Added later", "even")
+        store.toggle_many([range(20, 23), range(48, 60)])
+        store.delete_many(lambda task: task.title.endswith("5"))
+        store.delete_many([1, 2, 99])
+    _assert_same(mapped, reference)
+    assert mapped.get_task(12) is None
+    assert mapped.update_task(12, title="Gone") is False
+
+
+def test_undo_restores_file_tasks(stores):
+    mapped, reference = stores
+    for store in stores:
+        store.delete_many(range(1, 30))
+        store.update_task(40, title="Changed")
+        store.undo()
+        store.undo()
+    _assert_same(mapped, reference)
+
+
+def test_huge_range_over_the_file(stores):
+    mapped, reference = stores
+    for store in stores:
+        assert store.delete_many([range(1, 2), range(40, 20000000000)]) == 12
+    _assert_same(mapped, reference)
+
+
+def test_export_writes_the_merged_view(stores, tmp_path):
+    mapped, reference = stores
+    for store in stores:
+        store.update_task(5, title="Changed")
+        store.add_task("Added")
+    path = str(tmp_path / "merged.jsonl")
+    mapped.export_tasks(path)
+    copy = TodoManager()
+    copy.import_tasks(path)
+    assert [(task.title, task.description, task.completed) for task in copy.get_all_tasks()] == [
+        (task.title, task.description, task.completed) for task in reference.get_all_tasks()]
+
+
+def test_budget_is_refused(stores):
+    mapped, _ = stores
+    with pytest.raises(ValueError):
+        mapped.set_budget(max_tasks=10)
@@ -0,0 +1,146 @@
+"""
+Tests for restoring a TodoManager from its journal.
+"""
+import os
+
+import pytest
+
+from src.journal_records import OP_ADD
+from src.persistence import LOG_SUFFIX, Journal
+from src.todo_manager import TodoManager
+
+
+def _reopen(directory: str, **kwargs) -> TodoManager:
+    """
+    Restore a fresh manager from the journal in the given directory.
+    """
+    return TodoManager(journal=Journal(directory, **kwargs))
+
+
+def _log_path(directory: str) -> str:
+    """
+    Return the path of the newest log file in a journal directory.
+    """
+    logs = [name for name in os.listdir(directory) if name.endswith(LOG_SUFFIX)]
+    return os.path.join(directory, max(logs, key=lambda name: int(name.split(".")[1])))
+
+
+def test_restore_replays_snapshot_and_log(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory, snapshot_every=10)
+    manager.add_many([(f"Task {i}", f"Description {i}") for i in range(25)])
+    manager.toggle_many(range(1, 26, 3))
+    manager.delete_many([range(4, 8), range(20, 23)])
+    manager.update_task(2, title="Renamed")
+    expected = manager.get_all_tasks()
+    manager._journal.close()
+    
+    restored = _reopen(directory, snapshot_every=10)
+    assert restored.get_all_tasks() == expected
+    assert restored.add_task("Next").id == 26
+
+
+def test_restore_after_crash_keeps_flushed_records(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory, fsync_every=1)
+    for i in range(5):
+        manager.add_task(f"Task {i}")
+    manager.toggle_task_status(3)
+    expected = manager.get_all_tasks()
+    # No close: the process dies with the log still open
+    
+    restored = _reopen(directory)
+    assert restored.get_all_tasks() == expected
+
+
+def test_restore_ignores_torn_final_line(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory)
+    for i in range(3):
+        manager.add_task(f"Task {i}")
+    manager._journal.close()
+    with open(_log_path(directory), "a", encoding="utf-8") as log:
+        log.write(f'["{OP_ADD}", 4, "Half writ')
+    
+    restored = _reopen(directory)
+    assert [task.id for task in restored.get_all_tasks()] == [1, 2, 3]
+    assert restored.add_task("After the crash").id == 4
+
+
+def test_duplicate_add_in_log_is_rejected(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory)
+    manager.add_task("Only once")
+    manager._journal.close()
+    with open(_log_path(directory), encoding="utf-8") as log:
+        first = log.readline()
+    with open(_log_path(directory), "a", encoding="utf-8") as log:
+        log.write(first)
+    
+    with pytest.raises(ValueError):
+        _reopen(directory)
+
+
+def test_committed_transaction_is_restored(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory)
+    with manager.transaction():
+        manager.add_task("First")
+        manager.add_task("Second")
+        manager.toggle_task_status(1)
+    expected = manager.get_all_tasks()
+    manager._journal.close()
+    
+    assert _reopen(directory).get_all_tasks() == expected
+
+
+def test_rolled_back_transaction_leaves_no_records(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory)
+    manager.add_task("Kept")
+    manager.begin()
+    manager.add_task("Discarded")
+    manager.delete_task(1)
+    manager.rollback()
+    manager._journal.close()
+    
+    restored = _reopen(directory)
+    assert [task.title for task in restored.get_all_tasks()] == ["Kept"]
+
+
+def test_uncommitted_transaction_is_lost_in_a_crash(tmp_path):
+    directory = str(tmp_path)
+    journal = Journal(directory, fsync_every=1)
+    manager = TodoManager(journal=journal)
+    manager.add_task("Kept")
+    manager.begin()
+    manager.add_task("Pending")
+    journal.flush()
+    
+    restored = _reopen(directory)
+    assert [task.title for task in restored.get_all_tasks()] == ["Kept"]
+
+
+def test_undo_is_journaled(tmp_path):
+    directory = str(tmp_path)
+    manager = _reopen(directory)
+    manager.add_many([("One", ""), ("Two", "")])
+    manager.delete_task(1)
+    manager.undo()
+    expected = manager.get_all_tasks()
+    manager._journal.close()
+    
+    assert _reopen(directory).get_all_tasks() == expected
+
+
+def test_import_is_restored(tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text("title,completed\nFirst,true\nSecond,false\n,false\n", encoding="utf-8")
+    directory = str(tmp_path / "journal")
+    manager = _reopen(directory, snapshot_every=1)
+    report = manager.import_tasks(str(source), chunk_size=1)
+    assert (report.imported, report.rejected) == (2, 1)
+    expected = manager.get_all_tasks()
+    manager._journal.close()
+    
+    assert _reopen(directory).get_all_tasks() == expected
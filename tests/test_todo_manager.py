@@ -0,0 +1,150 @@
+"""
+Tests for TodoManager: its indexes, undo history and transactions.
+"""
+import random
+
+import pytest
+
+from src.todo_manager import SORT_KEYS, TodoManager
+
+
+def _state(manager: TodoManager) -> list:
+    """
+    Return the stored tasks as comparable tuples.
+    """
+    return [(task.id, task.title, task.description, task.completed) for task in manager.get_all_tasks()]
+
+
+def _assert_indexes_match_tasks(manager: TodoManager) -> None:
+    """
+    Check every indexed read against a scan of the stored tasks.
+    """
+    tasks = manager.get_all_tasks()
+    for completed in (True, False):
+        expected = [task for task in tasks if task.completed == completed]
+        assert manager.get_tasks_by_status(completed) == expected
+        assert manager.count_by_status(completed) == len(expected)
+    for sort, key in SORT_KEYS.items():
+        for descending in (False, True):
+            expected = sorted(tasks, key=lambda task: (key(task), task.id), reverse=descending)
+            assert manager.get_sorted(sort, descending) == expected
+            assert manager.get_sorted(sort, descending, 2, 5, True) == [
+                task for task in expected if task.completed][2:7]
+    for word in ("alpha", "beta", "gamma"):
+        assert manager.search_tasks(word) == [
+            task for task in tasks if word in f"{task.title} {task.description}".lower().split()]
+    assert manager.find_by_prefix("beta", 1000) == sorted(
+        (task for task in tasks if task.title.lower().startswith("beta")), key=lambda task: (task.title.lower(), task.id))
+
+
+def test_indexes_follow_random_mutations():
+    rng = random.Random(7)
+    words = ["Alpha", "beta", "Gamma", "delta"]
+    manager = TodoManager()
+    for _ in range(400):
+        ids = [task.id for task in manager.get_all_tasks()]
+        action = rng.random()
+        if action < 0.4 or not ids:
+            manager.add_task(" ".join(rng.sample(words, 2)), rng.choice(words))
+        elif action < 0.6:
+            manager.toggle_task_status(rng.choice(ids))
+        elif action < 0.8:
+            manager.update_task(rng.choice(ids), title=" ".join(rng.sample(words, 2)))
+        elif action < 0.9:
+            manager.delete_task(rng.choice(ids))
+        else:
+            manager.undo()
+    _assert_indexes_match_tasks(manager)
+
+
+def test_ranges_select_only_stored_ids():
+    manager = TodoManager()
+    manager.add_many([(f"Task {i}", "") for i in range(1, 21)])
+    manager.delete_task(5)
+    assert manager.toggle_many(range(2, 20000000000, 3)) == 6
+    assert [task.id for task in manager.get_tasks_by_status(True)] == [2, 8, 11, 14, 17, 20]
+    assert manager.delete_many([range(1, 4), range(3, 7), range(19, 10 ** 12)]) == 7
+    assert [task.id for task in manager.get_all_tasks()] == list(range(7, 19))
+
+
+def test_undo_and_redo_walk_the_history():
+    manager = TodoManager()
+    manager.add_many([("First", "one"), ("Second", "two")])
+    states = [_state(manager)]
+    manager.update_task(1, title="Renamed")
+    states.append(_state(manager))
+    manager.toggle_many([1, 2])
+    states.append(_state(manager))
+    manager.delete_task(2)
+    states.append(_state(manager))
+    
+    for expected in reversed(states[:-1]):
+        assert manager.undo() is not None
+        assert _state(manager) == expected
+    for expected in states[1:]:
+        assert manager.redo() is not None
+        assert _state(manager) == expected
+    assert manager.redo() is None
+    
+    manager.undo()
+    manager.add_task("Third")
+    assert manager.redo() is None  # A new change discards the redo history
+
+
+def test_history_limit_drops_oldest_entries():
+    manager = TodoManager()
+    manager.set_history_limits(max_entries=2, max_items=100)
+    for title in ("One", "Two", "Three"):
+        manager.add_task(title)
+    assert manager.undo() is not None
+    assert manager.undo() is not None
+    assert manager.undo() is None
+    assert [task.title for task in manager.get_all_tasks()] == ["One"]
+
+
+def test_rollback_restores_the_store():
+    manager = TodoManager()
+    manager.add_many([("Alpha", ""), ("Beta", "")])
+    before = _state(manager)
+    manager.begin()
+    manager.add_task("Gamma")
+    manager.update_task(1, description="Changed")
+    manager.toggle_task_status(2)
+    manager.delete_task(1)
+    assert manager.rollback() == 4
+    assert not manager.in_transaction
+    assert _state(manager) == before
+    assert manager.add_task("Next").id == 3  # IDs are never reused
+    _assert_indexes_match_tasks(manager)
+
+
+def test_commit_is_undone_as_one_step():
+    manager = TodoManager()
+    manager.add_task("Alpha")
+    before = _state(manager)
+    with manager.transaction():
+        manager.add_task("Beta")
+        manager.toggle_task_status(1)
+    assert manager.undo() is not None
+    assert _state(manager) == before
+
+
+def test_failed_transaction_block_rolls_back():
+    manager = TodoManager()
+    manager.add_task("Alpha")
+    with pytest.raises(KeyError):
+        with manager.transaction():
+            manager.add_task("Beta")
+            raise KeyError("boom")
+    assert [task.title for task in manager.get_all_tasks()] == ["Alpha"]
+    assert not manager.in_transaction
+
+
+def test_transactions_do_not_nest():
+    manager = TodoManager()
+    manager.begin()
+    with pytest.raises(RuntimeError):
+        manager.begin()
+    manager.commit()
+    with pytest.raises(RuntimeError):
+        manager.rollback()
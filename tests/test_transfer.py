@@ -0,0 +1,118 @@
+"""
+Tests for reading, validating and writing task files.
+"""
+from typing import List, Tuple
+
+import pytest
+
+from src.models import Task
+from src.transfer import FORMAT_BINARY, FORMATS, ImportReport, build_tasks, read_tasks, write_tasks
+
+
+def _load(path: str, fmt: str = None, chunk_size: int = 2) -> Tuple[List[Task], ImportReport]:
+    """
+    Read and validate a file the way an import does, in small chunks.
+    """
+    report = ImportReport()
+    tasks: List[Task] = []
+    for rows in read_tasks(str(path), report, fmt, chunk_size):
+        tasks.extend(build_tasks(rows, len(tasks) + 1, report))
+    return tasks, report
+
+
+def test_report_keeps_lowest_rows_in_order():
+    report = ImportReport(max_errors=3)
+    for row in (9, 4, 7, 2, 8, 3):
+        report.reject(row, f"row {row}")
+    assert report.rejected == 6
+    assert [row for row, _ in report.errors] == [2, 3, 4]
+
+
+def test_report_without_room_only_counts():
+    report = ImportReport(max_errors=0)
+    report.reject(1, "bad")
+    assert (report.rejected, report.errors) == (1, [])
+
+
+def test_csv_rows_are_validated(tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text(
+        "id,title,description,completed\n"
+        "1,Good,Fine,yes\n"
+        "2," + "t" * 201 + ",,no\n"
+        "3,Bad flag,,maybe\n"
+        "4,Too,many,fields,here\n"
+        "5,,Empty title,\n"
+        "6,Also good,,\n",
+        encoding="utf-8")
+    tasks, report = _load(source)
+    assert [(task.title, task.completed) for task in tasks] == [("Good", True), ("Also good", False)]
+    assert report.rejected == 4
+    assert [row for row, _ in report.errors] == [3, 4, 5, 6]
+    assert "maybe" in report.errors[1][1]
+    assert report.errors[2][1] == "Expected 4 fields, found 5"
+
+
+def test_csv_field_over_the_parser_limit_is_rejected(tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text("title,description\nBefore,\nHuge,\"" + "x" * 200000 + "\"\nAfter,\n", encoding="utf-8")
+    tasks, report = _load(source)
+    assert [task.title for task in tasks] == ["Before", "After"]
+    assert report.rejected == 1
+    assert report.errors[0][1].startswith("Malformed CSV row")
+
+
+def test_csv_without_title_column_is_refused(tmp_path):
+    source = tmp_path / "tasks.csv"
+    source.write_text("name,description\nA,B\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        _load(source)
+
+
+def test_jsonl_rows_are_validated(tmp_path):
+    source = tmp_path / "tasks.jsonl"
+    source.write_text(
+        '{"title": "Good", "completed": true}\n'
+        '{"title": "Broken"\n'
+        '["not", "an", "object"]\n'
+        '{"title": "Flag", "completed": "yes"}\n'
+        '\n'
+        '{"title": "Also good", "description": "Fine"}\n',
+        encoding="utf-8")
+    tasks, report = _load(source)
+    assert [(task.title, task.description, task.completed) for task in tasks] == [
+        ("Good", "", True), ("Also good", "Fine", False)]
+    assert [row for row, _ in report.errors] == [2, 3, 4]
+    assert report.errors[0][1].startswith("Invalid JSON")
+
+
+def test_binary_file_needs_magic_bytes(tmp_path):
+    source = tmp_path / "tasks.bin"
+    source.write_bytes(b"nonsense")
+    with pytest.raises(ValueError):
+        _load(source)
+
+
+def test_truncated_binary_record_is_rejected(tmp_path):
+    path = tmp_path / "tasks.bin"
+    write_tasks(str(path), [Task(1, "First"), Task(2, "Second", "Cut short")])
+    path.write_bytes(path.read_bytes()[:-3])
+    tasks, report = _load(path, FORMAT_BINARY)
+    assert [task.title for task in tasks] == ["First"]
+    assert report.errors == [(2, "Truncated record at end of file")]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_every_format_round_trips(tmp_path, fmt):
+    original = [Task(1, "Plain"), Task(2, "Comma, \"quotes\"", "Line\nbreak", True), Task(3, "Ünïcödé ✓", "€")]
+    path = tmp_path / f"tasks.{fmt}"
+    assert write_tasks(str(path), original) == 3
+    tasks, report = _load(path)
+    assert report.rejected == 0
+    assert tasks == original
+    assert not (tmp_path / f"tasks.{fmt}.tmp").exists()
+
+
+def test_unknown_format_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        write_tasks(str(tmp_path / "tasks.txt"), [Task(1, "Task")])